@@ -0,0 +1,85 @@
+"""
+Compare the BeautifulSoup tree builder backends on the same filings.
+
+For every backend that is installed, report the time it takes to get the
+hierarchy of each input and whether the hierarchy is equivalent to the one
+built with the default backend.
+
+Usage:
+    ```sh
+    $ python -m benchmarks.backends /path/to/10k/form.html --repeat 3
+    ```
+"""
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import click
+from bs4.builder import builder_registry
+
+from sec_html_parser.parser import BACKENDS, DEFAULT_BACKEND, Parser
+from sec_html_parser.serialize import node_text
+from sec_html_parser.source import iter_decoded_chunks, open_source
+
+
+def hierarchy_signature(parser: Parser, hierarchy: dict) -> List[Tuple[bool, int, str]]:
+    """
+    Reduce a hierarchy to the leaf flag, depth and text of each node, which
+    doesn't depend on how a backend repairs or wraps the markup.
+    """
+
+    return [
+        (leaf, depth, node_text(node))
+        for leaf, depth, node in parser._walk_hierarchy_nodes(hierarchy)
+    ]
+
+
+def read_markup(target: Path) -> str:
+    """
+    Read a (possibly compressed) filing the way the parser does, in the
+    encoding declared by its byte order mark or meta charset
+    """
+
+    with open_source(target) as stream:
+        return "".join(iter_decoded_chunks(stream))
+
+
+def time_backend(backend: str, markup: str, repeat: int) -> Tuple[float, dict]:
+    """Get the best time of `repeat` hierarchy builds of markup, and the hierarchy"""
+
+    parser = Parser(backend=backend)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hierarchy = parser.get_string_hierarchy(markup)
+        best = min(best, time.perf_counter() - start)
+
+    return best, hierarchy
+
+
+@click.command()
+@click.argument("targets", type=Path, nargs=-1, required=True)
+@click.option("--repeat", type=int, default=3, show_default=True)
+def main(targets: Tuple[Path], repeat: int):
+    backends = [b for b in BACKENDS if builder_registry.lookup(b) is not None]
+    missing = [b for b in BACKENDS if b not in backends]
+    if missing:
+        click.echo(f"skipping backends that aren't installed: {', '.join(missing)}")
+
+    click.echo(f"{'target':40} {'backend':12} {'seconds':>10} {'equivalent':>10}")
+    for target in targets:
+        markup = read_markup(target)
+        parser = Parser()
+        _, expected = time_backend(DEFAULT_BACKEND, markup, 1)
+        expected = hierarchy_signature(parser, expected)
+
+        for backend in backends:
+            seconds, hierarchy = time_backend(backend, markup, repeat)
+            equivalent = hierarchy_signature(parser, hierarchy) == expected
+            click.echo(
+                f"{target.name:40} {backend:12} {seconds:10.3f} {equivalent!s:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
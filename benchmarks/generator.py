@@ -0,0 +1,174 @@
+"""
+Generate synthetic 10-K filings for benchmarks.
+
+Filings are built the way EDGAR filings usually are: every paragraph is a
+styled span in a div with a top margin, headings are bold spans with larger
+fonts and margins, and tables of spans are spread between paragraphs. The
+output only depends on the spec, so the same spec always gives the same
+filing.
+
+Usage:
+    ```sh
+    $ python -m benchmarks.generator --spans 20000 --heading-levels 4 -o form.html
+    ```
+"""
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import click
+
+_WORDS = (
+    "the company revenue net income fiscal year operating results risk factors"
+    " market share products services customers suppliers competition growth"
+    " liquidity capital resources segment international regulation tax cash"
+    " flow debt equity securities management discussion analysis financial"
+    " statements consolidated quarterly annual report period increase decrease"
+).split()
+
+
+@dataclass(frozen=True)
+class FilingSpec:
+    """Shape of a synthetic filing"""
+
+    # number of text spans (headings and paragraphs, not counting tables)
+    spans: int = 1000
+
+    # number of heading levels (e.g. 2 for "PART I" > "Item 1.")
+    heading_levels: int = 3
+
+    # number of distinct paragraph styles
+    style_variety: int = 4
+
+    # chance of a table after each paragraph
+    table_density: float = 0.05
+
+    # number of divs each paragraph is nested in
+    nesting_depth: int = 1
+
+    seed: int = 0
+
+
+def generate_filing(spec: FilingSpec) -> str:
+    """Generate the HTML of a filing with the given shape"""
+
+    rng = random.Random(spec.seed)
+    parts: List[str] = ["<html><head><title>10-K</title></head><body>\n"]
+
+    level = 0
+    headings = [0] * spec.heading_levels
+    for _ in range(spec.spans):
+        # a heading can open a section one level below the current one,
+        # or close sections and open one at a higher level
+        if spec.heading_levels and rng.random() < 0.1:
+            level = rng.randint(1, min(level + 1, spec.heading_levels))
+            headings[level - 1] += 1
+            headings[level:] = [0] * (spec.heading_levels - level)
+            text = f"Item {'.'.join(map(str, headings[:level]))}. {_words(rng, 4)}"
+            parts.append(
+                _paragraph(
+                    _heading_style(level, spec.heading_levels),
+                    _heading_margin(level, spec.heading_levels),
+                    text,
+                    spec.nesting_depth,
+                )
+            )
+            continue
+
+        style = _paragraph_style(rng.randrange(max(spec.style_variety, 1)))
+        parts.append(_paragraph(style, 6, _words(rng, 40), spec.nesting_depth))
+
+        if rng.random() < spec.table_density:
+            parts.append(_table(rng))
+
+    parts.append("</body></html>\n")
+
+    return "".join(parts)
+
+
+def _words(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(1, count)))
+
+
+def _heading_style(level: int, levels: int) -> str:
+    size = 9 + levels - level + 1
+    return f"font-family:Times New Roman;font-size:{size}pt;font-weight:700"
+
+
+def _heading_margin(level: int, levels: int) -> int:
+    return 6 + 6 * (levels - level + 1)
+
+
+def _paragraph_style(variant: int) -> str:
+    # variants differ in color, and every third one is a smaller footnote
+    size = 9 - (variant % 3 == 2) * 1.5
+    return (
+        f"color:#{variant:06x};font-family:Times New Roman;"
+        f"font-size:{size}pt;font-weight:400"
+    )
+
+
+def _paragraph(style: str, margin: int, text: str, nesting_depth: int) -> str:
+    outer = "<div>" * max(nesting_depth - 1, 0)
+    close = "</div>" * max(nesting_depth - 1, 0)
+    return (
+        f'{outer}<div style="margin-top:{margin}pt">'
+        f'<span style="{style}">{text}</span></div>{close}\n'
+    )
+
+
+def _table(rng: random.Random) -> str:
+    rows = []
+    for _ in range(rng.randint(2, 12)):
+        cells = "".join(
+            '<td><span style="font-size:8pt">'
+            f"{rng.choice(['$', ''])}{rng.randint(0, 99999):,}</span></td>"
+            for _ in range(rng.randint(2, 6))
+        )
+        rows.append(f"<tr>{cells}</tr>")
+
+    return f'<div style="margin-top:6pt"><table>{"".join(rows)}</table></div>\n'
+
+
+@click.command()
+@click.option("--spans", type=int, default=FilingSpec.spans, show_default=True)
+@click.option(
+    "--heading-levels", type=int, default=FilingSpec.heading_levels, show_default=True
+)
+@click.option(
+    "--style-variety", type=int, default=FilingSpec.style_variety, show_default=True
+)
+@click.option(
+    "--table-density",
+    type=float,
+    default=FilingSpec.table_density,
+    show_default=True,
+)
+@click.option(
+    "--nesting-depth", type=int, default=FilingSpec.nesting_depth, show_default=True
+)
+@click.option("--seed", type=int, default=FilingSpec.seed, show_default=True)
+@click.option("-o", "--output", type=Path, default=None)
+def main(
+    spans: int,
+    heading_levels: int,
+    style_variety: int,
+    table_density: float,
+    nesting_depth: int,
+    seed: int,
+    output: Optional[Path],
+):
+    html = generate_filing(
+        FilingSpec(
+            spans, heading_levels, style_variety, table_density, nesting_depth, seed
+        )
+    )
+    if output is None:
+        click.echo(html, nl=False)
+    else:
+        output.write_text(html)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Check the time it takes to import the package and its command line.
+
+Each module is imported in a fresh interpreter with `-X importtime`, and its
+best cumulative import time over `--repeat` runs is compared to its budget.
+Modules must also not import the dependencies listed as forbidden for them,
+e.g. the command line must not import bs4 until a command parses something.
+
+The exit code is 1 if a module is over its budget, or imports a forbidden
+dependency.
+
+Usage:
+    ```sh
+    $ python -m benchmarks.import_time --repeat 5
+    ```
+"""
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Set
+
+import click
+
+# seconds each module may take to import
+BUDGETS = {
+    "sec_html_parser": 0.01,
+    "sec_html_parser.client": 0.05,
+    "sec_html_parser.__main__": 0.15,
+}
+
+# top level packages each module must not import
+FORBIDDEN = {
+    "sec_html_parser": ("bs4", "click"),
+    "sec_html_parser.client": ("bs4", "click"),
+    "sec_html_parser.__main__": ("bs4",),
+}
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class ImportTime:
+    seconds: float
+
+    # every module imported along with the measured one
+    modules: Set[str]
+
+
+def measure_import(module: str, repeat: int = 5) -> ImportTime:
+    """Get the best cumulative import time of module in a fresh interpreter"""
+
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(_ROOT), *sys.path])}
+
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        seconds = None
+        modules = set()
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+
+            _, cumulative, name = line[len("import time:") :].split("|")
+            if not cumulative.strip().isdigit():
+                # the header line
+                continue
+
+            modules.add(name.strip())
+
+            # nested imports are indented further
+            if name == f" {module}":
+                seconds = int(cumulative) / 1e6
+
+        if seconds is None:
+            raise ValueError(f"{module} was already imported at startup")
+
+        if best is None or seconds < best.seconds:
+            best = ImportTime(seconds, modules)
+
+    return best
+
+
+def check_imports(repeat: int = 5, timing: bool = True) -> List[str]:
+    """
+    Get a description of each module over its budget (unless `timing` is
+    unset, since timings depend on the machine) or importing too much
+    """
+
+    problems = []
+    for module in BUDGETS:
+        problems += _problems(module, measure_import(module, repeat), timing)
+
+    return problems
+
+
+def _problems(module: str, measured: ImportTime, timing: bool = True) -> List[str]:
+    problems = []
+
+    budget = BUDGETS[module]
+    if timing and measured.seconds > budget:
+        problems.append(
+            f"{module} takes {measured.seconds * 1000:.1f}ms to import"
+            f" (budget {budget * 1000:.1f}ms)"
+        )
+
+    for package in FORBIDDEN.get(module, ()):
+        if any(
+            name == package or name.startswith(f"{package}.")
+            for name in measured.modules
+        ):
+            problems.append(f"{module} imports {package}")
+
+    return problems
+
+
+@click.command()
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+def main(repeat: int):
+    problems = []
+    for module, budget in BUDGETS.items():
+        measured = measure_import(module, repeat)
+        click.echo(
+            f"{module:<28} {measured.seconds * 1000:8.1f}ms"
+            f" (budget {budget * 1000:.1f}ms)"
+        )
+        problems += _problems(module, measured)
+
+    for problem in problems:
+        click.echo(problem, err=True)
+
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Measure how the public entry points of the parser scale with filing size.
+
+Every entry point is run on synthetic filings (see `benchmarks.generator`)
+of each size, recording its best time and its peak traced memory. The
+scaling exponent of each entry point (1 for linear, 2 for quadratic) is
+estimated from the smallest and largest sizes, and results can be saved as
+a baseline to compare later runs against. A baseline is only compared to
+runs on filings of the same shape (the same `FilingSpec` options).
+
+The exit code is 1 if an entry point regressed against the baseline, or
+scales worse than `--max-exponent`.
+
+Usage:
+    ```sh
+    $ python -m benchmarks.runner --sizes 1000 --sizes 16000 --save-baseline
+    $ python -m benchmarks.runner --sizes 1000 --sizes 16000
+    ```
+"""
+import io
+import json
+import math
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import click
+
+from benchmarks.generator import FilingSpec, generate_filing
+from sec_html_parser.parser import Parser
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+# how much slower (or larger) than the baseline a result can be
+DEFAULT_TOLERANCE = 0.25
+
+# entry points scaling worse than this are flagged, even without a baseline
+DEFAULT_MAX_EXPONENT = 1.4
+
+
+def _consume(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+ENTRY_POINTS: Dict[str, Callable[[str], object]] = {
+    "get_hierarchy": lambda markup: Parser().get_hierarchy(markup),
+    "get_hierarchy[stream]": (
+        lambda markup: Parser(engine="stream").get_hierarchy(markup)
+    ),
+    "iter_sections": lambda markup: _consume(Parser().iter_sections(markup)),
+    "get_compact_hierarchy": lambda markup: Parser().get_compact_hierarchy(markup),
+    "get_hierarchy_html": lambda markup: Parser().get_hierarchy_html(markup),
+    "write_hierarchy_json": (
+        lambda markup: Parser().write_hierarchy_json(markup, io.StringIO())
+    ),
+}
+
+
+@dataclass
+class Measurement:
+    """Best time and peak traced memory of an entry point on one filing"""
+
+    seconds: float
+    peak_bytes: int
+
+
+# entry point -> filing size (in spans) -> measurement
+Results = Dict[str, Dict[int, Measurement]]
+
+
+def measure(entry: Callable[[str], object], markup: str, repeat: int) -> Measurement:
+    """
+    Measure entry on markup. Memory is traced in a separate run, so that
+    tracing doesn't slow down the timed runs.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        entry(markup)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        entry(markup)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(best, peak)
+
+
+def run_suite(
+    sizes: Sequence[int],
+    spec: FilingSpec = FilingSpec(),
+    entries: Optional[Sequence[str]] = None,
+    repeat: int = 3,
+    progress: Callable[[str, int, Measurement], None] = lambda *_: None,
+) -> Results:
+    """Measure each entry point (all by default) on filings of each size"""
+
+    entries = entries or list(ENTRY_POINTS)
+    results: Results = {entry: {} for entry in entries}
+    for size in sizes:
+        markup = generate_filing(replace(spec, spans=size))
+        for entry in entries:
+            measurement = measure(ENTRY_POINTS[entry], markup, repeat)
+            results[entry][size] = measurement
+            progress(entry, size, measurement)
+
+    return results
+
+
+def scaling_exponent(measurements: Dict[int, Measurement]) -> Optional[float]:
+    """
+    Estimate the exponent k of time ~ size^k between the smallest and
+    largest sizes, or None if there is only one size
+    """
+
+    if len(measurements) < 2:
+        return None
+
+    small, large = min(measurements), max(measurements)
+    ratio = measurements[large].seconds / max(measurements[small].seconds, 1e-9)
+    return math.log(ratio) / math.log(large / small)
+
+
+def find_regressions(
+    results: Results,
+    baseline: Results,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[str]:
+    """Describe every result slower or larger than its baseline beyond tolerance"""
+
+    regressions = []
+    for entry, measurements in results.items():
+        for size, measurement in measurements.items():
+            base = baseline.get(entry, {}).get(size)
+            if base is None:
+                continue
+
+            for field, unit in (("seconds", "s"), ("peak_bytes", "B")):
+                value, base_value = getattr(measurement, field), getattr(base, field)
+                if value > base_value * (1 + tolerance):
+                    regressions.append(
+                        f"{entry} on {size} spans: {field} {value:.4g}{unit}"
+                        f" vs {base_value:.4g}{unit} in baseline"
+                    )
+
+    return regressions
+
+
+def save_results(results: Results, path: Path, spec: FilingSpec = FilingSpec()) -> None:
+    """Save results, along with the spec of the filings they were measured on"""
+
+    data = {
+        "spec": asdict(spec),
+        "results": {
+            entry: {str(size): asdict(m) for size, m in measurements.items()}
+            for entry, measurements in results.items()
+        },
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: Path) -> Results:
+    return {
+        entry: {int(size): Measurement(**m) for size, m in measurements.items()}
+        for entry, measurements in json.loads(path.read_text())["results"].items()
+    }
+
+
+def load_spec(path: Path) -> Optional[FilingSpec]:
+    """Get the spec of the filings the results saved to path were measured on"""
+
+    spec = json.loads(path.read_text()).get("spec")
+    return None if spec is None else FilingSpec(**spec)
+
+
+@click.command()
+@click.option(
+    "--sizes",
+    type=int,
+    multiple=True,
+    default=(1000, 4000, 16000),
+    show_default=True,
+    help="Number of spans of each synthetic filing (can be given several times)",
+)
+@click.option(
+    "--entry",
+    "entries",
+    type=click.Choice(list(ENTRY_POINTS)),
+    multiple=True,
+    help="Entry points to measure, defaults to all of them",
+)
+@click.option("--heading-levels", type=int, default=FilingSpec.heading_levels)
+@click.option("--style-variety", type=int, default=FilingSpec.style_variety)
+@click.option("--table-density", type=float, default=FilingSpec.table_density)
+@click.option("--nesting-depth", type=int, default=FilingSpec.nesting_depth)
+@click.option("--seed", type=int, default=FilingSpec.seed)
+@click.option("--repeat", type=int, default=3, show_default=True)
+@click.option("--baseline", type=Path, default=DEFAULT_BASELINE, show_default=True)
+@click.option(
+    "--save-baseline", is_flag=True, help="Save the results as the new baseline"
+)
+@click.option("--tolerance", type=float, default=DEFAULT_TOLERANCE, show_default=True)
+@click.option(
+    "--max-exponent", type=float, default=DEFAULT_MAX_EXPONENT, show_default=True
+)
+@click.option("-o", "--output", type=Path, default=None, help="Write results as JSON")
+def main(
+    sizes: Tuple[int],
+    entries: Tuple[str],
+    heading_levels: int,
+    style_variety: int,
+    table_density: float,
+    nesting_depth: int,
+    seed: int,
+    repeat: int,
+    baseline: Path,
+    save_baseline: bool,
+    tolerance: float,
+    max_exponent: float,
+    output: Optional[Path],
+):
+    spec = FilingSpec(
+        heading_levels=heading_levels,
+        style_variety=style_variety,
+        table_density=table_density,
+        nesting_depth=nesting_depth,
+        seed=seed,
+    )
+
+    # timings of filings of another shape can't be compared
+    compare = not save_baseline and baseline.exists()
+    if compare:
+        baseline_spec = load_spec(baseline)
+        if baseline_spec != spec:
+            raise click.UsageError(
+                f"{baseline} was measured on filings of another shape"
+                f" ({baseline_spec}), run with the same options or"
+                " --save-baseline"
+            )
+
+    click.echo(f"{'entry':24} {'spans':>8} {'seconds':>10} {'peak MB':>10}")
+    results = run_suite(
+        sorted(sizes),
+        spec,
+        entries,
+        repeat,
+        lambda entry, size, m: click.echo(
+            f"{entry:24} {size:8} {m.seconds:10.3f} {m.peak_bytes / 2**20:10.1f}"
+        ),
+    )
+
+    problems = []
+    for entry, measurements in results.items():
+        exponent = scaling_exponent(measurements)
+        if exponent is not None:
+            click.echo(f"{entry:24} scales as n^{exponent:.2f}")
+            if exponent > max_exponent:
+                problems.append(f"{entry} scales as n^{exponent:.2f}")
+
+    if output is not None:
+        save_results(results, output, spec)
+
+    if save_baseline:
+        save_results(results, baseline, spec)
+        click.echo(f"saved baseline to {baseline}")
+    elif compare:
+        problems += find_regressions(results, load_results(baseline), tolerance)
+
+    for problem in problems:
+        click.echo(f"REGRESSION: {problem}", err=True)
+
+    if problems:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,396 @@
-import click
+import json
+import sys
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+
+from sec_html_parser.client import DEFAULT_ADDRESS
+from sec_html_parser.options import (
+    BACKENDS,
+    DEFAULT_BACKEND,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    ENGINES,
+    LAYOUTS,
+    OUTPUT_FORMATS,
+)
+from sec_html_parser.result_cache import DEFAULT_MAX_BYTES, ResultCache
+from sec_html_parser.stats import ParseStats
+
+# the parser and the modules running it import bs4, which takes most of the
+# startup time, so commands only import them when they run
+
+
+class _DefaultGroup(click.Group):
+    """Group that runs its default command when not given a command name"""
+
+    def __init__(self, *args, default: str, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.default = default
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if not args or (args[0] not in self.commands and args[0] != "--help"):
+            args = [self.default, *args]
+
+        return super().parse_args(ctx, args)
+
+
+def _parser_options(command: Callable) -> Callable:
+    """Add the options of the parser to command"""
+
+    options = [
+        click.option(
+            "--engine",
+            type=click.Choice(ENGINES),
+            help="Parse a soup of the whole document, or stream parser events",
+            default="soup",
+            show_default=True,
+        ),
+        click.option(
+            "--backend",
+            type=click.Choice(BACKENDS),
+            help="BeautifulSoup tree builder used by the soup engine",
+            default=DEFAULT_BACKEND,
+            show_default=True,
+        ),
+        click.option(
+            "--encoding",
+            help=(
+                "Encoding of the input files, detected from their byte order mark"
+                " or meta charset if not specified (falling back to cp1252)"
+            ),
+            required=False,
+            default=None,
+        ),
+        click.option(
+            "--style-rules",
+            type=click.Path(exists=True, dir_okay=False, path_type=Path),
+            help=(
+                "JSON file of the CSS properties ranking spans and divs, defaults"
+                " to font size, weight and style for spans and top margin for divs"
+            ),
+            required=False,
+            default=None,
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+
+    return command
+
+
+def _make_parser_options(
+    engine: str, backend: str, encoding: Optional[str], style_rules: Optional[Path]
+) -> Dict:
+    """Get the keyword arguments of `Parser` from the parser options"""
+
+    parser_options = {"engine": engine, "backend": backend, "encoding": encoding}
+    if style_rules is not None:
+        from sec_html_parser.style_rules import StyleRules
+
+        try:
+            parser_options["style_rules"] = StyleRules.load(style_rules)
+        except (TypeError, ValueError) as e:
+            raise click.BadParameter(str(e), param_hint="'--style-rules'")
+
+    return parser_options
 
-from sec_html_parser.parser import Parser
 
+_jobs_option = click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Number of worker processes used when parsing several files",
+    default=1,
+    show_default=True,
+)
+
+
+@click.group(cls=_DefaultGroup, default="parse")
+def main():
+    """
+    Parse SEC filings to their text hierarchy, or load them into a database.
+    Runs the parse command if no command is given.
+    """
 
-@click.command()
-@click.argument("target", type=Path)
+
+@main.command()
+@click.argument("targets", nargs=-1, required=True)
 @click.option(
     "-o",
     "--output",
     type=Path,
-    help="Path to output file, will print to stdout if not specified",
+    help=(
+        "Path to output file, will print to stdout if not specified."
+        " When parsing several files, path to the output directory"
+    ),
+    required=False,
+    default=None,
+)
+@click.option(
+    "-f",
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    help="Write the hierarchy as formatted HTML, or as JSON",
+    default="html",
+    show_default=True,
+)
+@click.option(
+    "--json-html",
+    is_flag=True,
+    help="Write the HTML of each node in JSON output, instead of its text",
+    default=False,
+)
+@click.option(
+    "--html-layout",
+    type=click.Choice(LAYOUTS),
+    help=(
+        "Layout of HTML output: every tag on its own line, one line per"
+        " section or paragraph, or no added whitespace"
+    ),
+    default="pretty",
+    show_default=True,
+)
+@_parser_options
+@_jobs_option
+@click.option(
+    "--manifest",
+    type=Path,
+    help=(
+        "Path to the JSONL manifest of timings and errors written when parsing"
+        " several files, defaults to manifest.jsonl in the output directory"
+    ),
+    required=False,
+    default=None,
+)
+@click.option(
+    "--cache-dir",
+    type=Path,
+    help="Directory of a cache of parse results, keyed by the content of the inputs",
     required=False,
     default=None,
 )
-def main(target: Path, output: Path):
-    p = Parser()
-    h = p.get_hierarchy_html(target)
-    if output is not None:
-        output.write_text(h)
-    else:
-        print(h)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=1),
+    help="Maximum size of the cache in megabytes",
+    default=DEFAULT_MAX_BYTES // (1024 * 1024),
+    show_default=True,
+)
+@click.option(
+    "--stats",
+    is_flag=True,
+    help="Print the time spent in each phase of parsing and element counts as JSON",
+    default=False,
+)
+def parse(
+    targets: Tuple[str],
+    output: Optional[Path],
+    output_format: str,
+    json_html: bool,
+    html_layout: str,
+    engine: str,
+    backend: str,
+    encoding: Optional[str],
+    style_rules: Optional[Path],
+    jobs: int,
+    manifest: Optional[Path],
+    cache_dir: Optional[Path],
+    cache_size: int,
+    stats: bool,
+):
+    """
+    Parse the SEC filings in TARGETS, which can be files (optionally gzip or
+    zstd compressed), directories or glob patterns.
+    """
+
+    from sec_html_parser.batch import (
+        make_tasks,
+        run_batch,
+        write_manifest_line,
+        write_output,
+    )
+    from sec_html_parser.parser import Parser
+
+    parser_options = _make_parser_options(engine, backend, encoding, style_rules)
+    if cache_dir is not None:
+        parser_options["cache"] = ResultCache(cache_dir, cache_size * 1024 * 1024)
+    if stats:
+        parser_options["stats"] = ParseStats()
+
+    output_options = {
+        "output_format": output_format,
+        "json_text": not json_html,
+        "html_layout": html_layout,
+    }
+
+    if len(targets) == 1 and Path(targets[0]).is_file():
+        p = Parser(**parser_options)
+        if output is not None:
+            with output.open("w") as fp:
+                write_output(p, Path(targets[0]), fp, **output_options)
+        else:
+            write_output(p, Path(targets[0]), sys.stdout, **output_options)
+            print()
+
+        if stats:
+            _echo_stats(p.stats)
+        return
+
+    if output is None:
+        raise click.UsageError("--output directory is required for several targets")
+
+    try:
+        tasks = make_tasks(targets, output, output_format)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    if not tasks:
+        raise click.UsageError("No files matched the given targets")
+
+    output.mkdir(parents=True, exist_ok=True)
+    manifest = manifest or output / "manifest.jsonl"
+
+    failures = 0
+    total_stats = ParseStats()
+    with manifest.open("w") as manifest_file:
+        for result in run_batch(tasks, parser_options, output_options, jobs=jobs):
+            write_manifest_line(manifest_file, result)
+            if result.stats is not None:
+                total_stats.update(result.stats)
+            if result.error is not None:
+                failures += 1
+                click.echo(f"{result.target}: {result.error}", err=True)
+
+    click.echo(f"parsed {len(tasks) - failures}/{len(tasks)} files", err=True)
+    if stats:
+        _echo_stats(total_stats)
+    if failures:
+        sys.exit(1)
+
+
+@main.command()
+@click.argument("database", type=Path)
+@click.argument("targets", nargs=-1, required=True)
+@_parser_options
+@_jobs_option
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    help="Number of filings inserted in each transaction",
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+)
+def load(
+    database: Path,
+    targets: Tuple[str],
+    engine: str,
+    backend: str,
+    encoding: Optional[str],
+    style_rules: Optional[Path],
+    jobs: int,
+    batch_size: int,
+):
+    """
+    Load the sections of the SEC filings in TARGETS into the SQLite DATABASE,
+    with a full text index of their text.
+    """
+
+    from sec_html_parser.sqlite_loader import load_files
+
+    parser_options = _make_parser_options(engine, backend, encoding, style_rules)
+
+    total = failures = 0
+    try:
+        for result in load_files(database, targets, parser_options, jobs, batch_size):
+            total += 1
+            if result.error is not None:
+                failures += 1
+                click.echo(f"{result.target}: {result.error}", err=True)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    if not total:
+        raise click.UsageError("No files matched the given targets")
+
+    click.echo(f"loaded {total - failures}/{total} files", err=True)
+    if failures:
+        sys.exit(1)
+
+
+@main.command()
+@click.option(
+    "--address",
+    help="Path of the Unix socket to listen on, or host:port",
+    default=DEFAULT_ADDRESS,
+    show_default=True,
+)
+@_parser_options
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Number of worker processes",
+    default=DEFAULT_WORKERS,
+    show_default=True,
+)
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    help="Number of requests accepted at a time, running or waiting for a worker",
+    default=DEFAULT_QUEUE_SIZE,
+    show_default=True,
+)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds a request may run before it is interrupted",
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+)
+@click.option(
+    "--allow-remote",
+    is_flag=True,
+    help=(
+        "Listen on a host:port address that isn't a loopback address. Anyone"
+        " who can connect can read and write any file this user can"
+    ),
+    default=False,
+)
+def serve(
+    address: str,
+    engine: str,
+    backend: str,
+    encoding: Optional[str],
+    style_rules: Optional[Path],
+    workers: int,
+    queue_size: int,
+    timeout: float,
+    allow_remote: bool,
+):
+    """
+    Parse filings sent by `python -m sec_html_parser.client` on warm worker
+    processes, until interrupted.
+    """
+
+    from sec_html_parser.daemon import ParseDaemon
+
+    parser_options = _make_parser_options(engine, backend, encoding, style_rules)
+    try:
+        daemon = ParseDaemon(
+            address, parser_options, workers, queue_size, timeout, allow_remote
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--address'")
+
+    click.echo(f"listening on {address}", err=True)
+    daemon.run()
+
+
+def _echo_stats(stats: ParseStats) -> None:
+    click.echo(json.dumps(stats.to_dict(), indent=2), err=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+import asyncio
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Tuple, Union
+
+from sec_html_parser.parser import Parser, Target
+from sec_html_parser.serialize import data_to_hierarchy, hierarchy_to_data
+
+# results amap can get for each target
+KINDS = ("hierarchy", "html")
+
+DEFAULT_LIMIT = 4
+
+
+class AsyncParser:
+    """
+    Asyncio front end of a `Parser`, which never blocks the event loop.
+
+    Files are read on the loop's default executor, and parsing runs on
+    `executor` (a thread or process pool, defaulting to the loop's default
+    executor). Parsing is CPU-bound, so use a `ProcessPoolExecutor` to
+    parse several filings in parallel. At most `limit` targets are read or
+    parsed at a time, across all calls on the same event loop.
+
+    Example:
+        ```python
+        with ProcessPoolExecutor() as executor:
+            parser = AsyncParser(Parser(engine="stream"), executor, limit=8)
+            async for path, hierarchy in parser.amap(paths):
+                ...
+        ```
+    """
+
+    def __init__(
+        self,
+        parser: Optional[Parser] = None,
+        executor: Optional[Executor] = None,
+        limit: int = DEFAULT_LIMIT,
+    ) -> None:
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+
+        self.parser = parser or Parser()
+        self.executor = executor
+        self.limit = limit
+
+        # semaphores are bound to the event loop they are first used on, so
+        # each running loop gets its own, created on first use
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    async def aget_hierarchy(self, target: Target) -> dict:
+        """Async counterpart of `Parser.get_hierarchy`"""
+
+        result = await self._run("hierarchy", target)
+
+        # tags are sent back from worker processes as HTML, see `_parse`, and
+        # are rebuilt on the default executor so they don't block the loop
+        if isinstance(self.executor, ProcessPoolExecutor):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, data_to_hierarchy, result)
+
+        return result
+
+    async def aget_hierarchy_html(self, target: Target) -> str:
+        """Async counterpart of `Parser.get_hierarchy_html`"""
+
+        return await self._run("html", target)
+
+    async def amap(
+        self,
+        targets: Iterable[Target],
+        kind: str = "hierarchy",
+        return_exceptions: bool = False,
+    ) -> AsyncIterator[Tuple[Target, Union[dict, str, Exception]]]:
+        """
+        Get the hierarchy (or the hierarchy HTML, if `kind` is "html") of each
+        of targets, yielding (target, result) pairs as soon as each of them
+        is done.
+
+        Targets are taken from the iterable only as there is room under the
+        limit. If a target fails, the error is raised and the remaining targets
+        are cancelled, unless `return_exceptions` is set, in which case the
+        error is yielded as its result. Closing the iterator early (or
+        cancelling the task iterating it) cancels the targets in flight;
+        parsing that already started in an executor runs to completion, but
+        its result is discarded.
+        """
+
+        if kind not in KINDS:
+            raise ValueError(
+                f"Unknown kind '{kind}' (supported kinds are: {', '.join(KINDS)})"
+            )
+
+        get = self.aget_hierarchy if kind == "hierarchy" else self.aget_hierarchy_html
+
+        targets = iter(targets)
+        pending = {}
+        try:
+            while True:
+                for target in targets:
+                    pending[asyncio.ensure_future(get(target))] = target
+                    if len(pending) >= self.limit:
+                        break
+
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    target = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        result = e
+
+                    yield target, result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self, kind: str, target: Target) -> Union[dict, str]:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+
+        async with semaphore:
+
+            # the file is read here, so executors are only busy parsing
+            if isinstance(target, Path):
+                target = await loop.run_in_executor(None, target.read_bytes)
+
+            return await loop.run_in_executor(
+                self.executor,
+                _parse,
+                self.parser,
+                kind,
+                target,
+                isinstance(self.executor, ProcessPoolExecutor),
+            )
+
+
+def _parse(
+    parser: Parser, kind: str, target: Target, serialize: bool
+) -> Union[dict, str]:
+    if kind == "html":
+        return parser.get_hierarchy_html(target)
+
+    hierarchy = parser.get_hierarchy(target)
+
+    # tags can't be pickled efficiently, so they are sent as HTML instead
+    return hierarchy_to_data(hierarchy) if serialize else hierarchy
@@ -0,0 +1,228 @@
+import glob
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from sec_html_parser.options import OUTPUT_FORMATS  # noqa: F401
+from sec_html_parser.parser import Parser
+
+# suffixes of the files parsed when a directory is given as a target
+HTML_SUFFIXES = (".htm", ".html")
+
+# suffixes of compressed files, which are parsed if they are compressed HTML
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+
+
+@dataclass
+class BatchTask:
+    """A single file to parse in a batch, and where to write its output"""
+
+    target: Path
+    output: Path
+
+
+@dataclass
+class BatchResult:
+    """Outcome of a single BatchTask, as written to the batch manifest"""
+
+    target: str
+    output: str
+    seconds: float
+    error: Optional[str] = None
+
+    # stats of parsing the target, if the parser records stats
+    stats: Optional[Dict] = None
+
+
+def expand_targets(targets: Iterable[str]) -> List[Tuple[Path, Path]]:
+    """
+    Expand files, directories and glob patterns to the files they match.
+
+    Directories are searched recursively for (possibly compressed) HTML
+    files. Each file is returned
+    with the path it should be written to relative to an output directory,
+    which keeps the layout of searched directories (and of the directories
+    matched by a glob pattern, below the part of it without wildcards).
+    """
+
+    files = []
+    for target in targets:
+        path = Path(target)
+        if path.is_dir():
+            for file in sorted(path.rglob("*")):
+                if file.is_file() and _is_html(file):
+                    files.append((file, file.relative_to(path)))
+        elif path.is_file():
+            files.append((path, Path(path.name)))
+        else:
+            base = _glob_base(target)
+            for match in sorted(glob.glob(target, recursive=True)):
+                match = Path(match)
+                if match.is_file():
+                    files.append((match, match.relative_to(base)))
+
+    return files
+
+
+def _glob_base(pattern: str) -> Path:
+    """Get the leading directories of a glob pattern, up to its first wildcard"""
+
+    parts = Path(pattern).parts
+    for i, part in enumerate(parts):
+        if glob.has_magic(part):
+            return Path(*parts[:i])
+
+    # a pattern without wildcards matches at most itself
+    return Path(pattern).parent
+
+
+def make_tasks(
+    targets: Iterable[str], output_dir: Path, output_format: str = "html"
+) -> List[BatchTask]:
+    """
+    Create a task for each file matched by targets, writing to output_dir.
+    A file matched by several targets (e.g. a directory and a glob pattern
+    inside it) is parsed once, as the first of them matches it.
+
+    Raise ValueError if two different files would be written to the same
+    output (e.g. two file targets of the same name in different directories).
+    """
+
+    tasks = []
+    seen = set()
+    targets_by_output: Dict[Path, Path] = {}
+    for target, relative in expand_targets(targets):
+        resolved = target.resolve()
+        if resolved in seen:
+            continue
+        seen.add(resolved)
+
+        output = (output_dir / _uncompressed(relative)).with_suffix(f".{output_format}")
+        if output in targets_by_output:
+            raise ValueError(
+                f"'{target}' and '{targets_by_output[output]}'"
+                f" would both be written to '{output}'"
+            )
+
+        targets_by_output[output] = target
+        tasks.append(BatchTask(target, output))
+
+    return tasks
+
+
+def _uncompressed(path: Path) -> Path:
+    """Remove the compression suffix of path, if it has one"""
+
+    if path.suffix.lower() in COMPRESSED_SUFFIXES:
+        return path.with_suffix("")
+
+    return path
+
+
+def _is_html(path: Path) -> bool:
+    return _uncompressed(path).suffix.lower() in HTML_SUFFIXES
+
+
+def write_output(
+    parser: Parser,
+    target: Path,
+    fp: TextIO,
+    output_format: str = "html",
+    json_text: bool = True,
+    html_layout: str = "pretty",
+) -> None:
+    """
+    Write the hierarchy of target to fp as HTML in `html_layout`, or as JSON
+    with the text (or HTML if `json_text` is false) of each node
+    """
+
+    if output_format == "json":
+        parser.write_hierarchy_json(target, fp, text=json_text)
+    else:
+        parser.write_hierarchy_html(target, fp, layout=html_layout)
+
+
+# parser and output options of the current worker process,
+# created once by `_init_worker`
+_worker_parser: Optional[Parser] = None
+_worker_output_options: Dict = {}
+
+
+def _init_worker(parser_options: Dict, output_options: Dict) -> None:
+    global _worker_parser, _worker_output_options
+    _worker_parser = Parser(**parser_options)
+    _worker_output_options = output_options
+
+
+def _run_task(task: BatchTask) -> BatchResult:
+    """Parse a single file, recording (and not raising) any error"""
+
+    if _worker_parser.stats is not None:
+        _worker_parser.stats.reset()
+
+    start = time.perf_counter()
+    error = None
+    try:
+        task.output.parent.mkdir(parents=True, exist_ok=True)
+        with task.output.open("w") as fp:
+            write_output(_worker_parser, task.target, fp, **_worker_output_options)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+        # don't leave a partial output behind
+        task.output.unlink(missing_ok=True)
+
+    return BatchResult(
+        target=str(task.target),
+        output=str(task.output),
+        seconds=time.perf_counter() - start,
+        error=error,
+        stats=None if _worker_parser.stats is None else _worker_parser.stats.to_dict(),
+    )
+
+
+def run_batch(
+    tasks: List[BatchTask],
+    parser_options: Optional[Dict] = None,
+    output_options: Optional[Dict] = None,
+    jobs: int = 1,
+    chunksize: Optional[int] = None,
+) -> Iterator[BatchResult]:
+    """
+    Parse all tasks, yielding their results in order.
+
+    With more than one job the tasks are spread over a process pool in chunks
+    of `chunksize` tasks (by default, about 4 chunks per worker), so each
+    worker pays for interpreter startup and imports once. A task that fails
+    doesn't stop the batch, its error is recorded in its result instead.
+
+    `output_options` are passed on to `write_output`.
+    """
+
+    parser_options = parser_options or {}
+    output_options = output_options or {}
+
+    if jobs <= 1:
+        _init_worker(parser_options, output_options)
+        yield from map(_run_task, tasks)
+        return
+
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (jobs * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(parser_options, output_options),
+    ) as executor:
+        yield from executor.map(_run_task, tasks, chunksize=chunksize)
+
+
+def write_manifest_line(manifest: IO[str], result: BatchResult) -> None:
+    """Write a result as a single JSON line"""
+
+    manifest.write(json.dumps(asdict(result)) + "\n")
+    manifest.flush()
@@ -0,0 +1,208 @@
+"""
+Thin client of the parse daemon (see `sec_html_parser.daemon`).
+
+It only imports the standard library (and the choices of its options), so
+that sending a filing to a running daemon doesn't pay for importing the
+parser:
+
+    $ python -m sec_html_parser.client /path/to/10k/form.html -o form.html
+"""
+
+import json
+import os
+import socket
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from sec_html_parser.options import LAYOUTS, OUTPUT_FORMATS
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), "sec_html_parser.sock")
+
+# requests sent ahead of the responses received on a connection
+DEFAULT_WINDOW = 16
+
+
+class DaemonError(Exception):
+    """A request the daemon couldn't fulfil"""
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """
+    Get the (host, port) of a "host:port" address, or the path of a Unix
+    socket address.
+    """
+
+    host, separator, port = address.rpartition(":")
+    if separator and host and port.isdigit():
+        return host, int(port)
+
+    return address
+
+
+def connect(address: str, timeout: Optional[float] = None) -> socket.socket:
+    """Connect to the daemon listening on address"""
+
+    parsed = parse_address(address)
+    if isinstance(parsed, tuple):
+        return socket.create_connection(parsed, timeout=timeout)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(parsed)
+    except BaseException:
+        sock.close()
+        raise
+
+    return sock
+
+
+class ParseClient:
+    """
+    Client of a parse daemon.
+
+    Each request is a dict with the path of the file to parse ("target"),
+    and optionally the path to write the output to instead of sending it
+    back ("output"), the output "format" ("html" or "json"), "json_text" and
+    "html_layout" (see `batch.write_output`).
+
+    Example:
+        ```python
+        client = ParseClient("/tmp/sec_html_parser.sock")
+        html = client.parse(Path("form.html"))
+        ```
+    """
+
+    def __init__(
+        self, address: str = DEFAULT_ADDRESS, timeout: Optional[float] = None
+    ) -> None:
+        self.address = address
+        self.timeout = timeout
+
+    def parse(self, target: Path, output: Optional[Path] = None, **options) -> str:
+        """
+        Parse target, and get its output (or an empty string, if it was
+        written to output). Raise `DaemonError` if the daemon fails to
+        parse it.
+        """
+
+        request = _request(target, output, options)
+        (response,) = self.request([request])
+        if "error" in response:
+            raise DaemonError(response["error"])
+
+        return response.get("output", "")
+
+    def request(self, requests: List[Dict], window: int = DEFAULT_WINDOW) -> List[Dict]:
+        """
+        Send requests over a single connection and get their responses, in
+        order. Up to `window` requests are sent ahead of their responses.
+        """
+
+        responses: List[Optional[Dict]] = [None] * len(requests)
+        with connect(self.address, self.timeout) as sock, sock.makefile("rwb") as f:
+            sent = received = 0
+            while received < len(requests):
+                while sent < len(requests) and sent - received < window:
+                    f.write(json.dumps({**requests[sent], "id": sent}).encode() + b"\n")
+                    sent += 1
+                f.flush()
+
+                line = f.readline()
+                if not line:
+                    raise ConnectionError("Connection closed by the daemon")
+
+                response = json.loads(line)
+                responses[response["id"]] = response
+                received += 1
+
+        return responses
+
+
+def _request(target: Path, output: Optional[Path], options: Dict) -> Dict:
+    # paths are resolved here, the daemon may run in another directory
+    request = {"target": str(Path(target).resolve()), **options}
+    if output is not None:
+        request["output"] = str(Path(output).resolve())
+
+    return request
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    # only the command line needs argparse, which is slow to import
+    import argparse
+
+    arg_parser = argparse.ArgumentParser(
+        prog="python -m sec_html_parser.client",
+        description="Parse SEC filings with a running parse daemon.",
+    )
+    arg_parser.add_argument("targets", nargs="+", type=Path)
+    arg_parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        help=(
+            "Path to output file, will print to stdout if not specified."
+            " When parsing several files, path to the output directory"
+        ),
+    )
+    arg_parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, default="html")
+    arg_parser.add_argument("--json-html", action="store_true")
+    arg_parser.add_argument("--html-layout", choices=LAYOUTS, default="pretty")
+    arg_parser.add_argument("--address", default=DEFAULT_ADDRESS)
+    arg_parser.add_argument("--timeout", type=float, default=None)
+    parsed = arg_parser.parse_args(args)
+
+    options = {
+        "format": parsed.format,
+        "json_text": not parsed.json_html,
+        "html_layout": parsed.html_layout,
+    }
+
+    # a file given several times is parsed once
+    targets = list({target.resolve(): target for target in parsed.targets}.values())
+
+    if len(targets) == 1:
+        outputs: List[Optional[Path]] = [parsed.output]
+    elif parsed.output is None:
+        arg_parser.error("--output directory is required for several targets")
+    else:
+        outputs = []
+        targets_by_output: Dict[Path, Path] = {}
+        for target in targets:
+            name = _uncompressed(target.name).with_suffix(f".{parsed.format}")
+            output = parsed.output / name
+            if output in targets_by_output:
+                arg_parser.error(
+                    f"'{target}' and '{targets_by_output[output]}'"
+                    f" would both be written to '{output}'"
+                )
+
+            targets_by_output[output] = target
+            outputs.append(output)
+
+    client = ParseClient(parsed.address, parsed.timeout)
+    responses = client.request(
+        [_request(target, output, options) for target, output in zip(targets, outputs)]
+    )
+
+    failures = 0
+    for target, response in zip(targets, responses):
+        if "error" in response:
+            failures += 1
+            print(f"{target}: {response['error']}", file=sys.stderr)
+        elif "output" in response:
+            print(response["output"])
+
+    return 1 if failures else 0
+
+
+def _uncompressed(name: str) -> Path:
+    path = Path(name)
+    return path.with_suffix("") if path.suffix.lower() in (".gz", ".zst") else path
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+from array import array
+from typing import Iterator, List, Optional
+
+from sec_html_parser.serialize import node_text, parse_fragments
+
+# kinds of nodes in a compact hierarchy
+KIND_SPAN = 0
+KIND_TABLE = 1
+
+
+class CompactHierarchy:
+    """
+    A hierarchy stored as flat arrays instead of nested dicts of bs4 `Tag`s.
+
+    Nodes are stored in document (pre-order) order. For each node, the arrays
+    hold the index of its parent (-1 for nodes under the root), its depth
+    (1 for nodes under the root), its kind (`KIND_SPAN` or `KIND_TABLE`), the
+    index after the last node of its subtree, and offsets of its HTML and
+    text in a single shared string.
+
+    Since no `Tag` is referenced, the soup a hierarchy was built from can be
+    freed, and each node costs a few dozen bytes besides its text.
+    """
+
+    __slots__ = ("parents", "depths", "kinds", "ends", "offsets", "buffer")
+
+    def __init__(
+        self,
+        parents: array,
+        depths: array,
+        kinds: array,
+        ends: array,
+        offsets: array,
+        buffer: str,
+    ) -> None:
+        self.parents = parents
+        self.depths = depths
+        self.kinds = kinds
+        self.ends = ends
+
+        # node i's HTML is buffer[offsets[2i]:offsets[2i + 1]],
+        # and its text is buffer[offsets[2i + 1]:offsets[2i + 2]]
+        self.offsets = offsets
+        self.buffer = buffer
+
+    @classmethod
+    def from_hierarchy(cls, hierarchy: dict) -> "CompactHierarchy":
+        """Build a compact hierarchy from a hierarchy made by `Parser`"""
+
+        parents = array("l")
+        depths = array("l")
+        kinds = array("b")
+        ends = array("l")
+        offsets = array("q", [0])
+        parts: List[str] = []
+        position = 0
+
+        # (children iterator, parent index, depth of the children) of each level
+        stack = [(iter(hierarchy["root"]), -1, 1)]
+        while stack:
+            children, parent, depth = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                if parent != -1:
+                    ends[parent] = len(parents)
+                continue
+
+            if isinstance(child, dict):
+                ((node, node_children),) = child.items()
+            else:
+                node, node_children = child, None
+
+            index = len(parents)
+            parents.append(parent)
+            depths.append(depth)
+            kinds.append(KIND_TABLE if node.name == "table" else KIND_SPAN)
+            ends.append(index + 1)
+
+            for part in (str(node), node_text(node)):
+                parts.append(part)
+                position += len(part)
+                offsets.append(position)
+
+            if node_children is not None:
+                stack.append((iter(node_children), index, depth + 1))
+
+        return cls(parents, depths, kinds, ends, offsets, "".join(parts))
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def __getitem__(self, index: int) -> "CompactNode":
+        if not -len(self) <= index < len(self):
+            raise IndexError("node index out of range")
+
+        return CompactNode(self, index % len(self))
+
+    def __iter__(self) -> Iterator["CompactNode"]:
+        return (CompactNode(self, index) for index in range(len(self)))
+
+    def roots(self) -> Iterator["CompactNode"]:
+        """Iterate the nodes directly under the root"""
+
+        return self._children_of(0, len(self))
+
+    def _children_of(self, start: int, end: int) -> Iterator["CompactNode"]:
+        index = start
+        while index < end:
+            yield CompactNode(self, index)
+            index = self.ends[index]
+
+    def to_dict(self) -> dict:
+        """Convert back to the nested dict form made by `Parser.get_hierarchy`"""
+
+        nodes = parse_fragments([node.html for node in self])
+
+        root: List = []
+        children_of: List[Optional[List]] = []
+        for index, node in enumerate(nodes):
+            parent = self.parents[index]
+            siblings = root if parent == -1 else children_of[parent]
+
+            if self.ends[index] == index + 1:
+                siblings.append(node)
+                children_of.append(None)
+            else:
+                node_children = []
+                siblings.append({node: node_children})
+                children_of.append(node_children)
+
+        return {"root": root}
+
+
+class CompactNode:
+    """View of a single node of a CompactHierarchy"""
+
+    __slots__ = ("hierarchy", "index")
+
+    def __init__(self, hierarchy: CompactHierarchy, index: int) -> None:
+        self.hierarchy = hierarchy
+        self.index = index
+
+    @property
+    def parent(self) -> Optional["CompactNode"]:
+        parent = self.hierarchy.parents[self.index]
+        return None if parent == -1 else CompactNode(self.hierarchy, parent)
+
+    @property
+    def depth(self) -> int:
+        return self.hierarchy.depths[self.index]
+
+    @property
+    def kind(self) -> int:
+        return self.hierarchy.kinds[self.index]
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.hierarchy.ends[self.index] == self.index + 1
+
+    @property
+    def html(self) -> str:
+        offsets = self.hierarchy.offsets
+        return self.hierarchy.buffer[
+            offsets[2 * self.index] : offsets[2 * self.index + 1]
+        ]
+
+    @property
+    def text(self) -> str:
+        offsets = self.hierarchy.offsets
+        return self.hierarchy.buffer[
+            offsets[2 * self.index + 1] : offsets[2 * self.index + 2]
+        ]
+
+    @property
+    def children(self) -> Iterator["CompactNode"]:
+        return self.hierarchy._children_of(
+            self.index + 1, self.hierarchy.ends[self.index]
+        )
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, CompactNode)
+            and self.hierarchy is other.hierarchy
+            and self.index == other.index
+        )
+
+    def __hash__(self) -> int:
+        return hash((id(self.hierarchy), self.index))
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactNode(index={self.index}, depth={self.depth}, text={self.text!r})"
+        )
@@ -0,0 +1,325 @@
+import asyncio
+import io
+import ipaddress
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Dict, Optional
+
+from sec_html_parser.batch import write_output
+from sec_html_parser.client import DEFAULT_ADDRESS, connect, parse_address
+from sec_html_parser.options import (
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_TIMEOUT,
+    DEFAULT_WORKERS,
+    LAYOUTS,
+    OUTPUT_FORMATS,
+)
+from sec_html_parser.parser import Parser
+
+# parsed by each worker when it starts, to import everything parsing needs
+# and fill the style caches with the most common styles
+_PRIMER = """<body>
+<div style="margin-top:18pt;text-align:center"><span style="color:#000000;font-family:'Times New Roman',sans-serif;font-size:10pt;font-weight:700;line-height:120%">PART I</span></div>
+<div style="margin-top:12pt"><span style="color:#000000;font-family:'Times New Roman',sans-serif;font-size:10pt;font-weight:700;line-height:120%">Item 1.</span></div>
+<div style="margin-top:6pt;text-indent:24.75pt"><span style="color:#000000;font-family:'Times New Roman',sans-serif;font-size:10pt;font-weight:400;line-height:120%">text</span></div>
+</body>"""
+
+
+class ParseDaemon:
+    """
+    Local server parsing filings on warm worker processes, so that parsing a
+    filing doesn't pay for starting an interpreter and importing the parser.
+
+    The daemon listens on a Unix socket (or on "host:port"), and reads one
+    JSON request per line, as sent by `client.ParseClient`, answering each
+    with a JSON line with its "id" and either its "output" or an "error".
+    Requests of a connection are handled concurrently and answered as they
+    complete.
+
+    At most `queue_size` requests are accepted at a time (running or waiting
+    for one of the `workers`), more are answered with an error right away.
+    A request running longer than `timeout` seconds is interrupted.
+
+    Requests read and write any path the daemon's user can, without any
+    authentication, so a "host:port" address must be a loopback address
+    (e.g. "localhost" or "127.0.0.1") unless `allow_remote` is set.
+
+    Example:
+        ```python
+        ParseDaemon("/tmp/sec_html_parser.sock", {"engine": "stream"}).run()
+        ```
+    """
+
+    def __init__(
+        self,
+        address: str = DEFAULT_ADDRESS,
+        parser_options: Optional[Dict] = None,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        allow_remote: bool = False,
+    ) -> None:
+        address_host = parse_address(address)
+        if isinstance(address_host, tuple) and not allow_remote:
+            host, _ = address_host
+            if not _is_loopback(host):
+                raise ValueError(
+                    f"'{host}' is not a loopback address,"
+                    " remote addresses must be allowed explicitly"
+                )
+
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1, got {workers}")
+        if queue_size < 1:
+            raise ValueError(f"queue_size must be at least 1, got {queue_size}")
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {timeout}")
+
+        self.address = address
+        self.parser_options = parser_options or {}
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.allow_remote = allow_remote
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stopped: Optional[asyncio.Event] = None
+        self._pending = 0
+
+    def run(self) -> None:
+        """Serve until stopped by `stop`, SIGINT or SIGTERM"""
+
+        asyncio.run(self.serve())
+
+    async def serve(self) -> None:
+        await self.start()
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    async def start(self) -> None:
+        """Start the workers, and start listening once they are warm"""
+
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(signum, self._stopped.set)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # not in the main thread, or not supported by the platform
+                pass
+
+        self._start_workers()
+        await asyncio.gather(
+            *(
+                self._loop.run_in_executor(self._executor, _ping)
+                for _ in range(self.workers)
+            )
+        )
+
+        address = parse_address(self.address)
+        if isinstance(address, tuple):
+            host, port = address
+            self._server = await asyncio.start_server(
+                self._handle_connection, host, port
+            )
+        else:
+            _remove_stale_socket(address)
+            self._server = await asyncio.start_unix_server(
+                self._handle_connection, address
+            )
+
+    def stop(self) -> None:
+        """Stop serving, can be called from any thread"""
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if not isinstance(parse_address(self.address), tuple):
+                Path(self.address).unlink(missing_ok=True)
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _start_workers(self) -> None:
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.parser_options, self.timeout),
+        )
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            # answer everything asked before the client stopped sending
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            for task in tasks:
+                task.cancel()
+        finally:
+            writer.close()
+
+    async def _respond(
+        self, line: bytes, writer: asyncio.StreamWriter, lock: asyncio.Lock
+    ) -> None:
+        try:
+            request = json.loads(line)
+        except ValueError:
+            request = None
+
+        if isinstance(request, dict):
+            response = {"id": request.get("id"), **await self._process(request)}
+        else:
+            response = {"id": None, "error": "Invalid request: not a JSON object"}
+
+        async with lock:
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+    async def _process(self, request: Dict) -> Dict:
+        error = _check_request(request)
+        if error is not None:
+            return {"error": f"Invalid request: {error}"}
+
+        if self._pending >= self.queue_size:
+            return {"error": f"Daemon busy, {self._pending} requests queued"}
+
+        self._pending += 1
+        executor = self._executor
+        try:
+            output = await self._loop.run_in_executor(executor, _handle, request)
+        except BrokenProcessPool:
+            # a worker died, which breaks the whole pool
+            if executor is self._executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._start_workers()
+            return {"error": "Worker process died"}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self._pending -= 1
+
+        return {} if output is None else {"output": output}
+
+
+def _check_request(request: Dict) -> Optional[str]:
+    if not isinstance(request.get("target"), str):
+        return "target must be a path"
+    if request.get("format", "html") not in OUTPUT_FORMATS:
+        return f"format must be one of {OUTPUT_FORMATS}"
+    if request.get("html_layout", "pretty") not in LAYOUTS:
+        return f"html_layout must be one of {LAYOUTS}"
+
+    return None
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove the socket file a dead daemon left behind at path"""
+
+    if not os.path.exists(path):
+        return
+
+    try:
+        connect(path).close()
+    except OSError:
+        os.unlink(path)
+    else:
+        raise RuntimeError(f"A daemon is already listening on {path}")
+
+
+# parser and timeout of the current worker process,
+# created once by `_init_worker`
+_worker_parser: Optional[Parser] = None
+_worker_timeout: Optional[float] = None
+
+
+def _init_worker(parser_options: Dict, timeout: Optional[float]) -> None:
+    global _worker_parser, _worker_timeout
+    _worker_parser = Parser(**parser_options)
+    _worker_timeout = timeout
+
+    # the daemon handles these, not its workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if timeout is not None and hasattr(signal, "setitimer"):
+        signal.signal(signal.SIGALRM, _raise_timeout)
+
+    write_output(_worker_parser, _PRIMER, io.StringIO())
+
+
+def _ping() -> None:
+    pass
+
+
+def _raise_timeout(signum, frame) -> None:
+    raise TimeoutError(f"Parsing took longer than {_worker_timeout} seconds")
+
+
+def _handle(request: Dict) -> Optional[str]:
+    """Parse the target of request, and get its output unless it is written"""
+
+    options = {
+        "output_format": request.get("format", "html"),
+        "json_text": request.get("json_text", True),
+        "html_layout": request.get("html_layout", "pretty"),
+    }
+    target = Path(request["target"])
+    output = request.get("output")
+
+    timed = _worker_timeout is not None and hasattr(signal, "setitimer")
+    if timed:
+        signal.setitimer(signal.ITIMER_REAL, _worker_timeout)
+    try:
+        if output is None:
+            fp = io.StringIO()
+            write_output(_worker_parser, target, fp, **options)
+            return fp.getvalue()
+
+        output = Path(output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            with output.open("w") as fp:
+                write_output(_worker_parser, target, fp, **options)
+        except BaseException:
+            # don't leave a partial output behind
+            output.unlink(missing_ok=True)
+            raise
+
+        return None
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        # any other host name may resolve to a public address
+        return False
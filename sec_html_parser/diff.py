@@ -0,0 +1,179 @@
+import hashlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Set, Union
+
+from bs4.element import PageElement
+
+from sec_html_parser.serialize import node_text
+
+# kinds of section changes
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+class HashedNode:
+    """
+    A node of a hierarchy with a Merkle hash of its subtree: the hash of its
+    own (whitespace normalized) text and of the hashes of its children.
+
+    Two subtrees with the same digest have the same text and structure, so
+    a diff never needs to look inside them.
+    """
+
+    __slots__ = ("node", "text", "children", "digest")
+
+    def __init__(self, node: Optional[PageElement], text: str) -> None:
+        self.node = node
+        self.text = text
+        self.children: List["HashedNode"] = []
+        self.digest = b""
+
+    def __repr__(self) -> str:
+        return f"HashedNode(text={self.text!r}, digest={self.digest.hex()})"
+
+
+@dataclass
+class SectionChange:
+    """
+    A section added, removed or changed between two hierarchies.
+
+    A section is changed if paragraphs or tables directly under it were added,
+    removed or edited. Changes deeper down are reported on the subsections
+    they are in instead.
+    """
+
+    kind: str
+
+    # text of the headings from the root down to the section (empty for
+    # changes directly under the root)
+    path: List[str]
+
+    old: Optional[HashedNode]
+    new: Optional[HashedNode]
+
+
+def hash_hierarchy(hierarchy: dict) -> HashedNode:
+    """
+    Hash every subtree of a hierarchy made by `Parser`, in a single
+    post-order pass. The returned node is the hierarchy's root.
+    """
+
+    root = HashedNode(None, "")
+
+    # (hashed node, iterator of its children still to hash) of each level
+    stack = [(root, iter(hierarchy["root"]))]
+    while stack:
+        parent, children = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            parent.digest = _digest(parent)
+            continue
+
+        if isinstance(child, dict):
+            ((node, node_children),) = child.items()
+        else:
+            node, node_children = child, ()
+
+        hashed = HashedNode(node, node_text(node))
+        parent.children.append(hashed)
+        stack.append((hashed, iter(node_children)))
+
+    return root
+
+
+def diff_hierarchies(
+    old: Union[dict, HashedNode], new: Union[dict, HashedNode]
+) -> List[SectionChange]:
+    """
+    Get the sections added, removed or changed from the old hierarchy to the
+    new one, parents first.
+
+    Identical subtrees are skipped by their hash, and the children of a
+    section are matched by hash first and by heading text second, so the
+    time a diff takes depends on how much changed and not on the size of
+    the hierarchies. Hierarchies that are diffed often can be hashed once
+    with `hash_hierarchy` and passed in hashed.
+
+    Example:
+        ```python
+        p = Parser()
+        old = hash_hierarchy(p.get_hierarchy(Path("10-K-2020.html")))
+        new = hash_hierarchy(p.get_hierarchy(Path("10-K-2021.html")))
+        for change in diff_hierarchies(old, new):
+            print(change.kind, " > ".join(change.path))
+        ```
+    """
+
+    old_root = old if isinstance(old, HashedNode) else hash_hierarchy(old)
+    new_root = new if isinstance(new, HashedNode) else hash_hierarchy(new)
+
+    changes: List[SectionChange] = []
+    stack = [([], old_root, new_root)]
+    while stack:
+        path, old_node, new_node = stack.pop()
+        if old_node.digest == new_node.digest:
+            continue
+
+        # children that are identical in both are matched first, in order
+        # (filings repeat identical children, e.g. empty spacer paragraphs)
+        old_by_digest: Dict[bytes, Deque[HashedNode]] = {}
+        for child in old_node.children:
+            old_by_digest.setdefault(child.digest, deque()).append(child)
+
+        unchanged: Set[int] = set()
+        new_rest = []
+        for child in new_node.children:
+            same = old_by_digest.get(child.digest)
+            if same:
+                unchanged.add(id(same.popleft()))
+            else:
+                new_rest.append(child)
+
+        old_rest = [child for child in old_node.children if id(child) not in unchanged]
+
+        # then children with the same heading, which changed inside
+        old_by_text: Dict[str, Deque[HashedNode]] = {}
+        for child in old_rest:
+            old_by_text.setdefault(child.text, deque()).append(child)
+
+        changed = False
+        matched = []
+        added = []
+        for child in new_rest:
+            same = old_by_text.get(child.text)
+            if same:
+                matched.append((path + [child.text], same.popleft(), child))
+            elif child.children:
+                added.append(SectionChange(ADDED, path + [child.text], None, child))
+            else:
+                changed = True
+
+        removed = []
+        for children in old_by_text.values():
+            for child in children:
+                if child.children:
+                    removed.append(
+                        SectionChange(REMOVED, path + [child.text], child, None)
+                    )
+                else:
+                    changed = True
+
+        if changed:
+            changes.append(SectionChange(CHANGED, path, old_node, new_node))
+        changes += removed + added
+
+        # diff matched sections in document order
+        stack.extend(reversed(matched))
+
+    return changes
+
+
+def _digest(node: HashedNode) -> bytes:
+    digest = hashlib.blake2b(node.text.encode(), digest_size=16)
+    for child in node.children:
+        digest.update(child.digest)
+
+    return digest.digest()
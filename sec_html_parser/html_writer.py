@@ -0,0 +1,46 @@
+from typing import Iterable, TextIO, Tuple
+
+from bs4.element import PageElement
+
+from sec_html_parser.options import LAYOUTS
+
+
+def write_hierarchy_html(
+    nodes: Iterable[Tuple[bool, int, PageElement]],
+    fp: TextIO,
+    layout: str = "pretty",
+) -> None:
+    """
+    Write hierarchy nodes to fp as HTML in a single pass, with each leaf in a
+    `<p>` and each other node in an `<hN>` of its depth.
+
+    `nodes` are (leaf, depth, node) tuples as yielded by
+    `Parser._walk_hierarchy_nodes`. The layout of the output is one of:
+
+    - "pretty": the same text as BeautifulSoup's `prettify()` of the output,
+        with every tag and string on its own indented line
+    - "indent": one indented line per `<p>` or `<hN>`, with the HTML of
+        the node as is
+    - "compact": no whitespace is added at all
+    """
+
+    if layout not in LAYOUTS:
+        raise ValueError(
+            f"Unknown layout '{layout}' (supported layouts are: {', '.join(LAYOUTS)})"
+        )
+
+    pretty = layout == "pretty"
+    newline = "" if layout == "compact" else "\n"
+    indent = "" if layout == "compact" else " "
+
+    fp.write(f"<html>{newline}")
+    for leaf, depth, node in nodes:
+        name = "p" if leaf else f"h{depth}"
+        if pretty:
+            # nodes are at indent level 2, inside <html> and their <p> or <hN>
+            fp.write(f" <{name}>\n")
+            fp.write(node.decode(indent_level=2))
+            fp.write(f" </{name}>\n")
+        else:
+            fp.write(f"{indent}<{name}>{node}</{name}>{newline}")
+    fp.write(f"</html>{newline}")
@@ -0,0 +1,50 @@
+import json
+from typing import Callable, Iterator, List, TextIO, Tuple
+
+from bs4.element import PageElement
+
+from sec_html_parser.serialize import node_text
+
+
+def write_hierarchy_json(hierarchy: dict, fp: TextIO, text: bool = True) -> None:
+    """
+    Write a hierarchy to fp as JSON, one node at a time.
+
+    The output is the same as `json.dump(hierarchy_to_data(hierarchy, text), fp)`,
+    but the document is never built in memory: each node is written as soon as
+    it is reached, so the extra memory needed doesn't depend on the size of
+    the hierarchy (only on its depth).
+
+    Each node is written as its text (whitespace collapsed) if `text` is set,
+    or as its HTML otherwise.
+    """
+
+    convert: Callable[[PageElement], str] = node_text if text else str
+
+    fp.write('{"root": [')
+
+    # each level is the iterator over the children of a node, and whether
+    # a child of that node was already written (and so needs a separator)
+    stack: List[Tuple[Iterator, List[bool]]] = [(iter(hierarchy["root"]), [False])]
+    while stack:
+        children, written = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            fp.write("]}" if stack else "]")
+            continue
+
+        if written[0]:
+            fp.write(", ")
+        written[0] = True
+
+        if isinstance(child, dict):
+            ((node, node_children),) = child.items()
+            fp.write("{")
+            fp.write(json.dumps(convert(node)))
+            fp.write(": [")
+            stack.append((iter(node_children), [False]))
+        else:
+            fp.write(json.dumps(convert(child)))
+
+    fp.write("}")
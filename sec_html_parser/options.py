@@ -0,0 +1,27 @@
+"""
+Choices and defaults of the options of the parser and its commands.
+
+They are kept apart from the modules using them, which import bs4, so that
+the command line can build its options (and show its help) without
+importing anything heavy. The modules using them re-export them.
+"""
+
+import os
+
+# parser
+ENGINES = ("soup", "stream")
+
+BACKENDS = ("html.parser", "lxml", "html5lib")
+DEFAULT_BACKEND = "html.parser"
+
+# output
+OUTPUT_FORMATS = ("html", "json")
+LAYOUTS = ("pretty", "indent", "compact")
+
+# sqlite loader, filings inserted in each transaction
+DEFAULT_BATCH_SIZE = 50
+
+# daemon
+DEFAULT_WORKERS = os.cpu_count() or 1
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_TIMEOUT = 300.0
@@ -1,54 +1,134 @@
+import contextlib
+import io
+import json
+import time
+import warnings
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Tuple, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
 
 from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
 from bs4.element import PageElement, Tag
 
-from sec_html_parser.div_style import DivStyle
-from sec_html_parser.span_style import SpanStyle
+from sec_html_parser import (
+    diff,
+    html_writer,
+    json_writer,
+    section_index,
+    submission,
+)
+from sec_html_parser.compact import CompactHierarchy
+from sec_html_parser.options import BACKENDS, DEFAULT_BACKEND, ENGINES
+from sec_html_parser.result_cache import ResultCache
+from sec_html_parser.serialize import data_to_hierarchy, hierarchy_to_data
+from sec_html_parser.source import (
+    BUFFER_TYPES,
+    Buffer,
+    iter_decoded_chunks,
+    open_source,
+)
+from sec_html_parser.stats import ParseStats
+from sec_html_parser.stream import StreamHierarchyBuilder
+from sec_html_parser.table import Table, has_text
+from sec_html_parser.style_rank import (
+    is_div_key_child,
+    is_span_key_child,
+    level_histogram,
+    rank_styles,
+)
+from sec_html_parser.style_rules import DEFAULT_STYLE_RULES, StyleRules
+
+# anything a hierarchy can be parsed from
+Target = Union[BeautifulSoup, Path, str, Buffer]
 
 
 class Parser:
-    def _is_span_child(self, node: Tag, other: Tag) -> bool:
-        """Check if node is a child of other with respect to font styles"""
+    def __init__(
+        self,
+        engine: str = "soup",
+        backend: str = DEFAULT_BACKEND,
+        cache: Optional[ResultCache] = None,
+        encoding: Optional[str] = None,
+        stats: Optional[ParseStats] = None,
+        style_rules: StyleRules = DEFAULT_STYLE_RULES,
+    ) -> None:
+        """
+        Create a parser.
 
-        # check that other has a style
-        try:
-            ostyle = SpanStyle(other)
-        except ValueError:
-            return False
+        The "soup" engine builds a BeautifulSoup tree of the whole document and
+        then walks it, the "stream" engine builds the hierarchy directly from
+        HTML parser events so that only the spans and tables in the hierarchy
+        are kept in memory. A BeautifulSoup target is always walked as is.
 
-        # a node with no style is always a child
-        try:
-            nstyle = SpanStyle(node)
-        except ValueError:
-            return True
+        `backend` is the BeautifulSoup tree builder used by the "soup" engine
+        (the "stream" engine is always based on "html.parser"). If the backend
+        isn't installed, a warning is issued and "html.parser" is used instead.
 
-        # text in relative position (top or bottom) is never a child
-        # and can never have children
-        if nstyle.relative or ostyle.relative:
-            return False
+        If a `cache` is given, the results of `get_hierarchy` and
+        `get_hierarchy_html` for file and string targets are cached by the
+        hash of their content, so unchanged inputs are never parsed twice.
 
-        # compare style tuples
-        return nstyle.to_tuple() < ostyle.to_tuple()
+        Files and bytes are decoded with `encoding` if given, otherwise with the
+        encoding declared by their byte order mark or meta charset, falling
+        back to "cp1252" (which is what EDGAR documents are mostly written in).
 
-    def _is_div_child(self, node: Tag, other: Tag) -> bool:
-        """Check if node is a child of other with respect to div styles"""
+        If `stats` are given, the time spent in each phase of parsing and the
+        number of elements seen are added to them (see `ParseStats`).
 
-        # check that other has a style
-        try:
-            ostyle = DivStyle(other)
-        except ValueError:
-            return False
+        `style_rules` are the CSS properties ranking spans and divs, and how
+        they rank (see `StyleRules`). By default spans rank by font size,
+        weight and style, and divs by their top margin.
+        """
 
-        # a div with no style is always a child
-        try:
-            nstyle = DivStyle(node)
-        except ValueError:
-            return True
+        if engine not in ENGINES:
+            raise ValueError(
+                f"Unknown engine '{engine}'"
+                f" (supported engines are: {', '.join(ENGINES)})"
+            )
+
+        if backend not in BACKENDS:
+            raise ValueError(
+                f"Unknown backend '{backend}'"
+                f" (supported backends are: {', '.join(BACKENDS)})"
+            )
+
+        if builder_registry.lookup(backend) is None:
+            warnings.warn(
+                f"Backend '{backend}' is not installed,"
+                f" falling back to '{DEFAULT_BACKEND}'"
+            )
+            backend = DEFAULT_BACKEND
+
+        self.engine = engine
+        self.backend = backend
+        self.cache = cache
+        self.encoding = encoding
+        self.stats = stats
+        self.style_rules = style_rules
+
+    def _make_soup(self, markup: str) -> BeautifulSoup:
+        """Build a soup of markup with the parser's backend"""
 
-        # check if div has a smaller margin than other
-        return nstyle.to_tuple() < ostyle.to_tuple()
+        with self._timer("soup"):
+            return BeautifulSoup(markup, features=self.backend)
+
+    def _timer(self, phase: str):
+        """Time a phase of parsing, if the parser records stats"""
+
+        if self.stats is None:
+            return contextlib.nullcontext()
+
+        return self.stats.timer(phase)
 
     def _walk_soup(
         self,
@@ -65,47 +145,256 @@ class Parser:
         (and recursed into if appropriate), not the `BeautifulSoup` object itself.
         """
 
-        element_is_not_soup = not isinstance(element, BeautifulSoup)
-        element_has_name = element.name is not None
-
-        if element_is_not_soup and element_has_name:
+        if not isinstance(element, BeautifulSoup) and element.name is not None:
             yield element
 
-        element_has_children = hasattr(element, "children")
-        if element_has_children:
-
-            should_recurse = not_into is None or element.name not in not_into
-            if should_recurse:
-                for child in element.children:
-                    yield from self._walk_soup(child, not_into)
-
-    def get_hierarchy(self, target: Union[BeautifulSoup, Path, str]) -> dict:
+        # iterators of the children of each element being walked, an explicit
+        # stack instead of recursion so that nesting depth isn't limited
+        stack = []
+        if hasattr(element, "children") and (
+            not_into is None or element.name not in not_into
+        ):
+            stack.append(iter(element.children))
+
+        while stack:
+            child = next(stack[-1], None)
+            if child is None:
+                stack.pop()
+                continue
+
+            if child.name is not None:
+                yield child
+
+            if hasattr(child, "children") and (
+                not_into is None or child.name not in not_into
+            ):
+                stack.append(iter(child.children))
+
+    def get_hierarchy(self, target: Target) -> dict:
         """
         Get text hierarchy of text in a file, with respect to the style attribute
         of the elements in the soup.
         """
 
+        return self._get_cached(
+            target,
+            "hierarchy",
+            lambda: self._get_uncached_hierarchy(target),
+            lambda hierarchy: json.dumps(hierarchy_to_data(hierarchy)),
+            lambda value: data_to_hierarchy(json.loads(value)),
+        )
+
+    def iter_tables(self, target: Target) -> Iterator[Table]:
+        """
+        Iterate the tables in target's hierarchy, in document order, as
+        `Table` handles that only extract their rows and cells when accessed.
+        """
+
+        for _, _, node in self._walk_hierarchy_nodes(self.get_hierarchy(target)):
+            if node.name == "table":
+                yield Table(node)
+
+    def get_heading_histogram(self, target: Target) -> Dict[int, int]:
+        """
+        Count the spans of each style level in target (see
+        `style_rank.level_histogram`), without building its hierarchy.
+
+        Target is always walked as a soup built with the parser's backend,
+        whatever its engine, since every span is needed before any of them
+        can be ranked.
+
+        Example:
+            ```python
+            # e.g. {1: 4, 2: 23, 3: 61, 4: 912}: 4 parts, 23 items, ...
+            histogram = Parser().get_heading_histogram(Path("form.html"))
+            ```
+        """
+
+        if isinstance(target, BeautifulSoup):
+            soup = target
+        elif isinstance(target, str):
+            soup = self._make_soup(target)
+        elif isinstance(target, (Path, *BUFFER_TYPES)):
+            soup = self._make_soup(self._read(target))
+        else:
+            raise TypeError(
+                f"Can't get heading histogram of type '{type(target)}'"
+                " (supported types are: BeautifulSoup, Path, str, bytes, mmap)"
+            )
+
+        with self._timer("walk"):
+            spans = [
+                element
+                for element in self._walk_soup(soup, not_into=["span", "table"])
+                if element.name == "span"
+            ]
+        with self._timer("styles"):
+            return level_histogram(rank_styles(spans, self.style_rules))
+
+    def get_hierarchy_diff(self, old: Target, new: Target) -> List[diff.SectionChange]:
+        """
+        Get the sections added, removed or changed from old's hierarchy to
+        new's (e.g. two years of the same form), see `diff.diff_hierarchies`.
+        """
+
+        return diff.diff_hierarchies(self.get_hierarchy(old), self.get_hierarchy(new))
+
+    def get_compact_hierarchy(self, target: Target) -> CompactHierarchy:
+        """
+        Get text hierarchy of target as a `CompactHierarchy`, which doesn't
+        keep the soup it was built from alive.
+        """
+
+        return CompactHierarchy.from_hierarchy(self.get_hierarchy(target))
+
+    def build_section_index(
+        self, path: Path, save: bool = True
+    ) -> section_index.SectionIndex:
+        """
+        Index the sections of a file by their heading path, so that single
+        sections can later be parsed without parsing the whole file
+        (see `get_section_hierarchy`). Unless `save` is false, the index is
+        also written to a sidecar file next to the source.
+        """
+
+        index = section_index.build_section_index(self, path)
+        if save:
+            index.save(section_index.sidecar_path(path))
+
+        return index
+
+    def get_section_hierarchy(
+        self,
+        path: Path,
+        heading_path: List[str],
+        index: Optional[section_index.SectionIndex] = None,
+        save: bool = True,
+    ) -> dict:
+        """
+        Get text hierarchy of a single section of a file, given the text of
+        its headings from the root down (e.g. ["PART I", "Item 1A. Risk Factors"]).
+
+        Only the bytes of the section are parsed. If no index is given, the
+        sidecar index of the file is used, and it is built first if it is
+        missing, out of date or unreadable. Unless `save` is false, the built
+        index is written to the sidecar, if its directory is writable.
+        """
+
+        if index is None:
+            sidecar = section_index.sidecar_path(path)
+            try:
+                index = section_index.SectionIndex.load(sidecar)
+            except (OSError, ValueError, TypeError, KeyError):
+                # missing or corrupt, it is rebuilt below
+                pass
+
+            if index is None or not index.is_fresh(path):
+                index = self.build_section_index(path, save=False)
+                if save:
+                    # e.g. in a read-only archive, the index is only kept
+                    # in memory
+                    with contextlib.suppress(OSError):
+                        index.save(sidecar)
+
+        entry = index.find(heading_path)
+
+        return section_index.read_section(self, path, index, entry)
+
+    def _get_uncached_hierarchy(self, target: Target) -> dict:
         if isinstance(target, BeautifulSoup):
             return self.get_soup_hierarchy(target)
         elif isinstance(target, Path):
             return self.get_file_hierarchy(target)
         elif isinstance(target, str):
             return self.get_string_hierarchy(target)
+        elif isinstance(target, BUFFER_TYPES):
+            return self.get_bytes_hierarchy(target)
         else:
             raise TypeError(
                 f"Can't get hierarchy of type '{type(target)}'"
-                " (supported types are: BeautifulSoup, Path, str)"
+                " (supported types are: BeautifulSoup, Path, str, bytes, mmap)"
             )
 
+    def _get_cached(
+        self,
+        target: Target,
+        kind: str,
+        compute: Callable[[], object],
+        dump: Callable[[object], str],
+        load: Callable[[str], object],
+    ):
+        """
+        Get a result of `kind` for target from the cache, or compute it and
+        cache it if it isn't there. Soups can't be hashed so they aren't cached.
+        """
+
+        if self.cache is None or isinstance(target, BeautifulSoup):
+            return compute()
+
+        if isinstance(target, Path):
+            data = target.read_bytes()
+        elif isinstance(target, str):
+            data = target.encode()
+        else:
+            data = target
+
+        options = {
+            "engine": self.engine,
+            "backend": self.backend,
+            "encoding": self.encoding,
+            "style_rules": self.style_rules.to_dict(),
+        }
+        key = self.cache.key(data, kind, options)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return load(cached)
+
+        result = compute()
+        self.cache.put(key, dump(result))
+
+        return result
+
     def get_file_hierarchy(self, path: Path) -> dict:
         """
         Get text hierarchy of text in a file, with respect to the style attribute
         of the elements in the soup.
         """
 
-        soup = BeautifulSoup(path.read_text(), features="html.parser")
+        return {"root": list(self._iter_source_sections(path))}
+
+    def get_bytes_hierarchy(self, data: Buffer) -> dict:
+        """
+        Get text hierarchy of an HTML document in a bytes-like object (e.g. an
+        mmap of a file), which may be gzip or zstd compressed.
+        """
+
+        return {"root": list(self._iter_source_sections(data))}
 
-        return self.get_soup_hierarchy(soup)
+    def get_submission_hierarchy(
+        self,
+        source: Union[Path, Buffer],
+        types: Optional[Iterable[str]] = None,
+    ) -> dict:
+        """
+        Get text hierarchy of the primary document of an EDGAR full submission
+        (.txt) file: its first HTML document, of one of `types` if given
+        (e.g. ["10-K", "10-K405"]).
+
+        The submission is scanned without keeping the other documents in
+        memory, and scanning stops once the document is found. To parse
+        other documents, see `submission.iter_documents`.
+        """
+
+        documents = submission.iter_documents(source, types)
+        try:
+            for document in documents:
+                if document.is_html:
+                    return self.get_bytes_hierarchy(document.text)
+        finally:
+            documents.close()
+
+        raise ValueError("No HTML document of the given types in submission")
 
     def get_string_hierarchy(self, string: str) -> dict:
         """
@@ -113,9 +402,7 @@ class Parser:
         of the HTML elements.
         """
 
-        soup = BeautifulSoup(string, features="html.parser")
-
-        return self.get_soup_hierarchy(soup)
+        return {"root": list(self._iter_string_sections(string))}
 
     def get_soup_hierarchy(self, soup: BeautifulSoup) -> dict:
         """
@@ -123,36 +410,143 @@ class Parser:
         of the elements in the soup.
         """
 
+        return {"root": list(self._iter_soup_sections(soup))}
+
+    def iter_sections(self, target: Target) -> Iterator[Union[dict, PageElement]]:
+        """
+        Iterate the sections at the root of target's hierarchy, as soon as
+        each of them is closed.
+
+        A section is closed once the next root level element is found, so
+        it can be used (in the same form as in `get_hierarchy`) before the rest
+        of the document is parsed. With the "stream" engine the rest of the
+        document isn't even read until the next section is requested.
+        """
+
+        if isinstance(target, BeautifulSoup):
+            return self._iter_soup_sections(target)
+        elif isinstance(target, Path):
+            return self._iter_source_sections(target)
+        elif isinstance(target, str):
+            return self._iter_string_sections(target)
+        elif isinstance(target, BUFFER_TYPES):
+            return self._iter_source_sections(target)
+        else:
+            raise TypeError(
+                f"Can't get sections of type '{type(target)}'"
+                " (supported types are: BeautifulSoup, Path, str, bytes, mmap)"
+            )
+
+    def _iter_source_sections(
+        self, source: Union[Path, Buffer]
+    ) -> Iterator[Union[dict, PageElement]]:
+        if self.engine == "stream":
+            with open_source(source) as stream:
+                yield from self._iter_stream_sections(
+                    iter_decoded_chunks(stream, self.encoding)
+                )
+        else:
+            yield from self._iter_soup_sections(self._make_soup(self._read(source)))
+
+    def _read(self, source: Union[Path, Buffer]) -> str:
+        with self._timer("read"), open_source(source) as stream:
+            return "".join(iter_decoded_chunks(stream, self.encoding))
+
+    def _iter_string_sections(self, string: str) -> Iterator[Union[dict, PageElement]]:
+        if self.engine == "stream":
+            return self._iter_stream_sections([string])
+        else:
+            return self._iter_soup_sections(self._make_soup(string))
+
+    def _iter_stream_sections(
+        self, chunks: Iterable[str]
+    ) -> Iterator[Union[dict, PageElement]]:
+        """
+        Iterate the sections of HTML fed in chunks, without building a soup
+        of the whole document.
+        """
+
+        builder = StreamHierarchyBuilder(self)
+        root = builder.hierarchy["root"]
+        for chunk in chunks:
+            with self._timer("stream"):
+                builder.feed(chunk)
+            yield from self._pop_closed_sections(root)
+        with self._timer("stream"):
+            builder.close()
+
+        yield from self._pop_closed_sections(root, document_closed=True)
+
+    def _iter_soup_sections(
+        self, soup: BeautifulSoup
+    ) -> Iterator[Union[dict, PageElement]]:
+        """Iterate the sections of a soup's hierarchy as soon as they are closed"""
+
         hierarchy = {"root": []}
 
         # this stack is used to check at what depth the next
         # element in the soup should go in the new hierarchy
         parents_metadata_stack = []
 
-        # keep track of the current div the elements are in
-        element_div = None
+        # give every span and div a rank key once, so that finding a parent
+        # in the stack only compares integers
+        with self._timer("walk"):
+            elements = list(self._walk_soup(soup, not_into=["span", "table"]))
+        with self._timer("styles"):
+            element_keys = rank_styles(elements, self.style_rules)
+
+        # keep track of the key of the current div the elements are in
+        element_div_key = None
 
-        for element_node in self._walk_soup(soup, not_into=["span", "table"]):
+        for element_node, element_key in zip(elements, element_keys):
             if element_node.name == "div":
-                element_div = element_node
+                element_div_key = element_key
+                if self.stats is not None:
+                    self.stats.counts["divs"] += 1
             elif element_node.name == "span":
                 self._add_span_to_hierarchy(
-                    element_node, element_div, parents_metadata_stack, hierarchy
+                    element_node,
+                    element_div_key,
+                    element_key,
+                    parents_metadata_stack,
+                    hierarchy,
                 )
+                yield from self._pop_closed_sections(hierarchy["root"])
             elif element_node.name == "table":
-                if element_node.text != "":
-                    _, _, parent_children = parents_metadata_stack[-1]
-                    parent_children.append(element_node)
+                if self.stats is not None:
+                    self.stats.counts["tables"] += 1
+                if has_text(element_node):
+                    self._append_child(parents_metadata_stack, element_node)
+
+        yield from self._pop_closed_sections(hierarchy["root"], document_closed=True)
+
+    def _pop_closed_sections(
+        self, root: List, document_closed: bool = False
+    ) -> List[Union[dict, PageElement]]:
+        """
+        Remove the closed sections from the root of a hierarchy being built,
+        and return them.
+
+        All sections but the last are closed, since elements are only ever
+        added under the last one, and once the document is closed so is the
+        last section.
+        """
 
-        hierarchy = self._clean_leaves(hierarchy)
+        end = len(root) if document_closed else len(root) - 1
+        if end <= 0:
+            return []
 
-        return hierarchy
+        closed = root[:end]
+        del root[:end]
+
+        return closed
 
     def _add_span_to_hierarchy(
         self,
         element_node: Tag,
-        element_div: Tag,
-        parents_metadata_stack: List[Tuple[Tag, Tag, List]],
+        element_div_key: Optional[int],
+        element_span_key: int,
+        parents_metadata_stack: List[Tuple[Optional[int], int, List, List]],
         hierarchy: Dict,
     ) -> None:
         """
@@ -163,55 +557,96 @@ class Parser:
         If no parent is found then the element is added as a child of the 'root'
         node of the hierarchy.
 
+        The stack holds the div and span rank keys (see `rank_styles`) of each
+        element instead of the elements themselves, along with the list of its
+        children and the list it is in. An element is added as a leaf, and is
+        only turned into a `{element: children}` node once it gets its first
+        child (see `_append_child`), so the hierarchy never needs cleaning.
+
         This modifies both the parent_stack and the hierarchy objects.
         """
 
-        # create element tuple for the stack
-        element_children = []
-        element_metadata = (element_div, element_node, element_children)
-
-        # create element hierarchy node
-        element_hierarchy_node = {element_node: element_children}
+        if self.stats is not None:
+            start = time.perf_counter()
+            stack_depth = len(parents_metadata_stack)
 
         # pop elements from the stack until a parent is found
-        for p_div, p_style, p_children in reversed(parents_metadata_stack):
+        while parents_metadata_stack:
+            p_div_key, p_span_key, _, _ = parents_metadata_stack[-1]
 
             # check if the current top of the element_stack is a parent of
             # the current node
-            if self._is_parent(p_div, p_style, element_div, element_node):
-
-                # add the element hierarchy node as a child of the parent
-                p_children.append(element_hierarchy_node)
-
-                # update the stack so that this element's metadata is at the top
-                parents_metadata_stack.append(element_metadata)
+            if self._is_parent(
+                p_div_key, p_span_key, element_div_key, element_span_key
+            ):
 
-                # the element has been added to the hierarchy, we are done
-                return
+                # add the element as a child of the parent
+                element_siblings = self._append_child(
+                    parents_metadata_stack, element_node
+                )
+                break
             else:
                 parents_metadata_stack.pop()
-
-        # if no parent was found add the element as a child
-        # of the root node
-        hierarchy["root"].append(element_hierarchy_node)
+        else:
+            # if no parent was found add the element as a child
+            # of the root node
+            element_siblings = hierarchy["root"]
+            element_siblings.append(element_node)
 
         # update the stack so that this element's metadata is at the top
-        parents_metadata_stack.append(element_metadata)
+        parents_metadata_stack.append(
+            (element_div_key, element_span_key, [], element_siblings)
+        )
+
+        if self.stats is not None:
+            counts = self.stats.counts
+            counts["spans"] += 1
+            counts["stack_pops"] += stack_depth + 1 - len(parents_metadata_stack)
+            counts["max_stack_depth"] = max(
+                counts["max_stack_depth"], len(parents_metadata_stack)
+            )
+            self.stats.seconds["stack"] += time.perf_counter() - start
+
+    @staticmethod
+    def _append_child(
+        parents_metadata_stack: List[Tuple[Optional[int], int, List, List]],
+        child: Union[dict, PageElement],
+    ) -> List:
+        """
+        Add child to the children of the element at the top of the stack, and
+        return the list it was added to.
+
+        An element on the stack is always the last of its siblings, since
+        adding a later sibling pops it. So if the element is still a leaf, it
+        is replaced in place by a node with its children.
+        """
+
+        _, _, children, siblings = parents_metadata_stack[-1]
+        if not children:
+            siblings[-1] = {siblings[-1]: children}
+        children.append(child)
+
+        return children
 
     def _is_parent(
         self,
-        parent_div: Optional[Tag],
-        parent_style: Tag,
-        child_div: Optional[Tag],
-        child_style: Tag,
+        parent_div_key: Optional[int],
+        parent_span_key: int,
+        child_div_key: Optional[int],
+        child_span_key: int,
     ) -> bool:
-        """Check if parent is a parent of element based on its div and span"""
+        """
+        Check if parent is a parent of element based on the rank keys
+        of its div and span
+        """
 
         # check if parent by div or span
         parent_by_div = (
-            True if parent_div is None else self._is_div_child(child_div, parent_div)
+            True
+            if parent_div_key is None
+            else is_div_key_child(child_div_key, parent_div_key)
         )
-        parent_by_span = self._is_span_child(child_style, parent_style)
+        parent_by_span = is_span_key_child(child_span_key, parent_span_key)
 
         # if parent by span then it is always a parent
         # but if parent by div then it is a parent only if it isn't
@@ -221,67 +656,90 @@ class Parser:
 
         return is_parent
 
-    def _clean_leaves(
-        self, hierarchy: Union[dict, PageElement]
-    ) -> Union[dict, PageElement]:
-        """Convert leaf nodes to strings instead of dictionaries with an empty list"""
-
-        # if hierarchy is a leaf we have nothing to do
-        if isinstance(hierarchy, PageElement):
-            return hierarchy
-
-        # first we get the node we are at
-        node = list(hierarchy)[0]
-
-        # then we check if it is a leaf
-        if len(hierarchy[node]) == 0:
-
-            # if so then we return the node
-            return node
-        else:
-
-            # if not then we clean all the child nodes of the current node
-            return {node: [self._clean_leaves(child) for child in hierarchy[node]]}
-
     def _walk_hierarchy_nodes(
         self,
         hierarchy: Union[dict, PageElement],
         depth: Optional[int] = 0,
-    ) -> Iterator[Tuple[int, PageElement]]:
+    ) -> Iterator[Tuple[bool, int, PageElement]]:
         """
         Iterate given hierarchy and all its children in a depth-first manner.
 
-        Return the element and its depth from the root at each iteration
+        Return whether the element is a leaf, its depth from the root and the
+        element itself at each iteration
         """
 
-        # return hierarchy if it is a leaf
-        if isinstance(hierarchy, PageElement):
-            yield True, depth, hierarchy
+        # iterators of the siblings at each depth below the given hierarchy
+        stack = [iter((hierarchy,))]
+        while stack:
+            node = next(stack[-1], None)
+            if node is None:
+                stack.pop()
+                continue
 
-        else:
-            key = list(hierarchy)[0]
+            node_depth = depth + len(stack) - 1
+
+            # return node if it is a leaf
+            if isinstance(node, PageElement):
+                yield True, node_depth, node
+                continue
+
+            ((key, children),) = node.items()
             if isinstance(key, PageElement):
-                yield False, depth, key
+                yield False, node_depth, key
 
-            if isinstance(hierarchy[key], list):
-                children: List[PageElement] = hierarchy[key]
-                for child in children:
-                    yield from self._walk_hierarchy_nodes(child, depth + 1)
+            if isinstance(children, list):
+                stack.append(iter(children))
             else:
-                child: PageElement = hierarchy[key]
-                yield True, depth + 1, child
+                yield True, node_depth + 1, children
 
-    def get_hierarchy_html(self, target: Union[BeautifulSoup, Path, str]) -> str:
+    def get_hierarchy_html(self, target: Target) -> str:
         """Get content of target with properly formatted HTML"""
 
-        hierarchy = self.get_hierarchy(target)
-        html = "<html>"
-        for leaf, depth, node in self._walk_hierarchy_nodes(hierarchy):
-            if leaf:
-                html += f"<p>{str(node)}</p>"
-            else:
-                html += f"<h{depth}>{str(node)}</h{depth}>"
+        return self._get_cached_hierarchy_html(target, "pretty")
 
-        html += "</html>"
+    def write_hierarchy_html(
+        self,
+        target: Target,
+        fp: TextIO,
+        layout: str = "pretty",
+    ) -> None:
+        """
+        Write content of target to fp as HTML, in one of the layouts of
+        `html_writer.write_hierarchy_html`
+        """
 
-        return BeautifulSoup(html, features="html.parser").prettify()
+        if self.cache is not None:
+            fp.write(self._get_cached_hierarchy_html(target, layout))
+        else:
+            hierarchy = self._get_uncached_hierarchy(target)
+            with self._timer("render"):
+                html_writer.write_hierarchy_html(
+                    self._walk_hierarchy_nodes(hierarchy), fp, layout
+                )
+
+    def write_hierarchy_json(
+        self, target: Target, fp: TextIO, text: bool = True
+    ) -> None:
+        """
+        Write the hierarchy of target to fp as JSON, node by node, with
+        either the text or the HTML of each node
+        (see `json_writer.write_hierarchy_json`)
+        """
+
+        hierarchy = self.get_hierarchy(target)
+        with self._timer("render"):
+            json_writer.write_hierarchy_json(hierarchy, fp, text)
+
+    def _get_cached_hierarchy_html(self, target: Target, layout: str) -> str:
+        def render() -> str:
+            html = io.StringIO()
+            hierarchy = self._get_uncached_hierarchy(target)
+            with self._timer("render"):
+                html_writer.write_hierarchy_html(
+                    self._walk_hierarchy_nodes(hierarchy), html, layout
+                )
+            return html.getvalue()
+
+        return self._get_cached(
+            target, f"html-{layout}", render, lambda html: html, lambda html: html
+        )
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from sec_html_parser import __version__
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_ENTRY_SUFFIX = ".entry"
+
+
+class ResultCache:
+    """
+    On-disk cache of parse results, keyed by a hash of the input bytes.
+
+    Keys also cover the parser version and options, so results are never
+    served across versions or configurations. Entries are written atomically
+    (to a temporary file that is then renamed), so several processes can
+    share a cache directory. When the total size of the entries goes above
+    `max_bytes`, the least recently used entries are deleted.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+        # estimated total size of the entries, scanned on first write
+        self._size: Optional[int] = None
+
+    def key(self, data: bytes, kind: str, options: Dict) -> str:
+        """Get the cache key of a result of `kind` for input data and options"""
+
+        digest = hashlib.sha256()
+        digest.update(
+            json.dumps(
+                {"version": __version__, "kind": kind, "options": options},
+                sort_keys=True,
+            ).encode()
+        )
+        digest.update(data)
+
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get the cached result of key, or None if it isn't cached"""
+
+        path = self._path(key)
+        try:
+            value = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+        # mark the entry as recently used, it may have just been evicted
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return value
+
+    def put(self, key: str, value: str) -> None:
+        """Cache the result of key, evicting old entries if the cache is full"""
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        encoded = value.encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(encoded)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += len(encoded)
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used entries until the cache fits max_bytes"""
+
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        size = sum(entry_size for _, entry_size, _ in entries)
+
+        for path, entry_size, _ in entries:
+            if size <= self.max_bytes:
+                break
+
+            # another process may have evicted this entry already
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+        self._size = size
+
+    def clear(self) -> None:
+        """Delete all cache entries"""
+
+        for path, _, _ in self._entries():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+        self._size = 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{_ENTRY_SUFFIX}"
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """Get the path, size and last use time of every cache entry"""
+
+        entries = []
+        for path in self.directory.glob(f"*/*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
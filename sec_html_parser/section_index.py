@@ -0,0 +1,221 @@
+import codecs
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from sec_html_parser.serialize import node_text
+from sec_html_parser.source import detect_encoding, open_source
+from sec_html_parser.stream import StreamHierarchyBuilder
+
+if TYPE_CHECKING:
+    from sec_html_parser.parser import Parser
+
+# suffix added to a source file's name to get the path of its index
+SIDECAR_SUFFIX = ".sections.json"
+
+
+@dataclass
+class SectionIndexEntry:
+    """Location of a single section in a source file"""
+
+    # text of the headings from the root down to the section's own heading
+    path: List[str]
+
+    # byte offsets of the section's heading and of the end of its subtree
+    start: int
+    end: int
+
+    # number of nodes in the section's subtree, including its heading
+    size: int
+
+    # byte offsets of the start tag of the div the heading is in, if any
+    div: Optional[List[int]] = None
+
+
+@dataclass
+class SectionIndex:
+    """
+    Index of the sections of a source file by their heading path.
+
+    The index is only valid for the exact source it was built from,
+    see `is_fresh`.
+    """
+
+    encoding: str
+    source_size: int
+    source_mtime_ns: int
+    entries: List[SectionIndexEntry]
+
+    def find(self, heading_path: Sequence[str]) -> SectionIndexEntry:
+        """
+        Find the first section with the given heading path (whitespace in the
+        headings doesn't need to match exactly), raising a KeyError if there
+        is none.
+        """
+
+        heading_path = [" ".join(heading.split()) for heading in heading_path]
+        for entry in self.entries:
+            if entry.path == heading_path:
+                return entry
+
+        raise KeyError(f"No section with heading path {heading_path}")
+
+    def is_fresh(self, source: Path) -> bool:
+        """Check that source didn't change since the index was built"""
+
+        stat = source.stat()
+        return (
+            stat.st_size == self.source_size
+            and stat.st_mtime_ns == self.source_mtime_ns
+        )
+
+    def save(self, path: Path) -> None:
+        path.write_text(json.dumps(asdict(self)))
+
+    @classmethod
+    def load(cls, path: Path) -> "SectionIndex":
+        data = json.loads(path.read_text())
+        data["entries"] = [SectionIndexEntry(**entry) for entry in data["entries"]]
+        return cls(**data)
+
+
+def sidecar_path(source: Path) -> Path:
+    """Get the path of the index of source"""
+
+    return source.with_name(source.name + SIDECAR_SUFFIX)
+
+
+def build_section_index(
+    parser: "Parser", source: Path, encoding: Optional[str] = None
+) -> SectionIndex:
+    """
+    Parse source once and index every section (every node with children)
+    by its heading path.
+
+    `encoding` defaults to the parser's encoding, or to the one detected the
+    same way `Parser.get_file_hierarchy` does. Compressed sources are indexed
+    by offsets in their decompressed content.
+    """
+
+    stat = source.stat()
+    with open_source(source) as stream:
+        data = stream.read()
+
+    encoding = encoding or parser.encoding or detect_encoding(data)
+
+    # a utf-8 byte order mark isn't decoded into the text, so offsets in the
+    # text are of the bytes after it
+    bom_length = 0
+    if encoding == "utf-8-sig":
+        encoding = "utf-8"
+        if data.startswith(codecs.BOM_UTF8):
+            bom_length = len(codecs.BOM_UTF8)
+
+    # newlines are kept as is, and undecodable bytes are kept as lone
+    # surrogates, so that offsets in the text map exactly to the source
+    text = data[bom_length:].decode(encoding, "surrogateescape")
+    del data
+
+    builder = StreamHierarchyBuilder(parser, track_positions=True)
+    builder.feed(text)
+    builder.close()
+
+    # flatten the hierarchy in document order, with the path of each node
+    nodes = []
+    subtree_ends: List[int] = []
+    stack = [(iter(builder.hierarchy["root"]), None, [])]
+    while stack:
+        children, parent_index, path = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            if parent_index is not None:
+                subtree_ends[parent_index] = len(nodes)
+            continue
+
+        index = len(nodes)
+        subtree_ends.append(index + 1)
+        if isinstance(child, dict):
+            ((node, node_children),) = child.items()
+            node_path = path + [node_text(node)]
+            nodes.append((node, node_path, bool(node_children)))
+            stack.append((iter(node_children), index, node_path))
+        else:
+            nodes.append((child, path + [node_text(child)], False))
+
+    to_bytes = _byte_offsets(text, encoding, builder.positions.values(), bom_length)
+
+    entries = []
+    for index, (node, path, has_children) in enumerate(nodes):
+        if not has_children:
+            continue
+
+        div_range, start = builder.positions[id(node)]
+        end_index = subtree_ends[index]
+        end = (
+            builder.positions[id(nodes[end_index][0])][1]
+            if end_index < len(nodes)
+            else len(text)
+        )
+
+        entries.append(
+            SectionIndexEntry(
+                path=path,
+                start=to_bytes[start],
+                end=to_bytes[end],
+                size=end_index - index,
+                div=None if div_range is None else [to_bytes[o] for o in div_range],
+            )
+        )
+
+    return SectionIndex(
+        encoding=encoding,
+        source_size=stat.st_size,
+        source_mtime_ns=stat.st_mtime_ns,
+        entries=entries,
+    )
+
+
+def read_section(
+    parser: "Parser", source: Path, index: SectionIndex, entry: SectionIndexEntry
+) -> dict:
+    """Parse only the bytes of a single section of source"""
+
+    with open_source(source) as f:
+        parts = []
+        if entry.div is not None:
+            div_start, div_end = entry.div
+            f.seek(div_start)
+            parts.append(f.read(div_end - div_start))
+
+        f.seek(entry.start)
+        parts.append(f.read(entry.end - entry.start))
+
+    # same decoding and newline translation as parsing the whole file
+    text = b"".join(parts).decode(index.encoding, "replace")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    return parser.get_string_hierarchy(text)
+
+
+def _byte_offsets(text: str, encoding: str, positions, base: int = 0) -> Dict[int, int]:
+    """
+    Map the character offsets in positions (and the text's end) to byte
+    offsets, given the byte offset the text starts at
+    """
+
+    offsets = {len(text)}
+    for div_range, start in positions:
+        offsets.add(start)
+        if div_range is not None:
+            offsets.update(div_range)
+
+    to_bytes = {}
+    char_offset, byte_offset = 0, base
+    for offset in sorted(offsets):
+        byte_offset += len(text[char_offset:offset].encode(encoding, "surrogateescape"))
+        char_offset = offset
+        to_bytes[offset] = byte_offset
+
+    return to_bytes
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+from sec_html_parser.serialize import data_to_hierarchy
+
+_OBJECT_SUFFIX = ".json"
+_FILING_SUFFIX = ".json"
+
+# how recently (in seconds) an object must have been written or reused by
+# `put` for `gc` to keep it even if no filing uses it
+DEFAULT_GC_MIN_AGE = 15 * 60
+
+
+@dataclass
+class StoreStats:
+    filings: int
+    objects: int
+
+    # bytes of the stored objects, and bytes they would take if every filing
+    # stored all of its sections itself
+    stored_bytes: int
+    logical_bytes: int
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.logical_bytes / self.stored_bytes if self.stored_bytes else 1.0
+
+
+class SectionStore:
+    """
+    On-disk store of hierarchies that keeps each section once, however many
+    filings it is in.
+
+    Every section (a node with children) is stored as an object holding its
+    HTML, the HTML of its leaves and the keys of its subsections, keyed by a
+    hash of that content. Since a section's key covers the keys of its
+    subsections, sections repeated across filings (forward-looking
+    statements, exhibit lists, disclaimers) are written once and shared.
+    Objects are written atomically, so several processes can put filings
+    into the same store.
+
+    The store directory holds:
+    - `objects/<xx>/<key>.json`: a section as `{"node": html, "children":
+      [html of a leaf, or {"section": key}, ...]}`, where the key is the
+      SHA-256 of that JSON and `xx` its first two characters. The root of a
+      filing is an object with a `None` node.
+    - `filings/<name>.json`: `{"root": key, "bytes": size}`, the key of the
+      filing's root object and the bytes its sections would take without
+      deduplication.
+
+    An object `put` has just written, or found already stored, isn't used
+    by any filing until the filing itself is written. `put` sets the
+    modification time of every object it writes or reuses, and `gc` keeps
+    objects modified less than `min_age` seconds before it started, so it
+    can run while filings are being put, as long as no `put` takes longer
+    than `min_age`.
+
+    Example:
+        ```python
+        store = SectionStore(Path("store"))
+        store.put("aapl-2021", Parser().get_hierarchy(Path("aapl-2021.html")))
+        hierarchy = store.get("aapl-2021")
+        print(store.stats().dedup_ratio)
+        ```
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._objects = self.directory / "objects"
+        self._filings = self.directory / "filings"
+
+    def put(self, name: str, hierarchy: dict) -> str:
+        """
+        Store hierarchy as filing name, replacing any filing of that name,
+        and get the key of its root object.
+        """
+
+        filing_path = self._filing_path(name)
+
+        logical_bytes = 0
+        root: Dict = {"node": None, "children": []}
+
+        # objects are written children first, so that their keys are known
+        # when their parents are written
+        stack = [(root, iter(hierarchy["root"]))]
+        while True:
+            obj, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                key, size = self._put_object(obj)
+                logical_bytes += size
+                if not stack:
+                    break
+                stack[-1][0]["children"].append({"section": key})
+            elif isinstance(child, dict):
+                ((node, node_children),) = child.items()
+                stack.append(({"node": str(node), "children": []}, iter(node_children)))
+            else:
+                obj["children"].append(str(child))
+
+        _write_atomic(
+            filing_path, json.dumps({"root": key, "bytes": logical_bytes}).encode()
+        )
+
+        return key
+
+    def get(self, name: str) -> dict:
+        """Get the hierarchy of filing name as bs4 `Tag`s"""
+
+        return data_to_hierarchy(self.get_data(name))
+
+    def get_data(self, name: str) -> dict:
+        """
+        Get the hierarchy of filing name as HTML strings, in the format of
+        `hierarchy_to_data`.
+        """
+
+        root: List = []
+        stack = [(self._get_object(self._read_filing(name)["root"]), root)]
+        while stack:
+            obj, data_children = stack.pop()
+            for child in obj["children"]:
+                if isinstance(child, dict):
+                    section = self._get_object(child["section"])
+                    section_children: List = []
+                    data_children.append({section["node"]: section_children})
+                    stack.append((section, section_children))
+                else:
+                    data_children.append(child)
+
+        return {"root": root}
+
+    def delete(self, name: str) -> None:
+        """
+        Delete filing name. Its sections are kept until `gc` deletes those no
+        other filing uses.
+        """
+
+        try:
+            self._filing_path(name).unlink()
+        except FileNotFoundError:
+            raise KeyError(name) from None
+
+    def names(self) -> List[str]:
+        """Get the names of all filings in the store"""
+
+        return sorted(
+            path.name[: -len(_FILING_SUFFIX)]
+            for path in self._filings.glob(f"*{_FILING_SUFFIX}")
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return self._filing_path(name).exists()
+
+    def gc(self, min_age: float = DEFAULT_GC_MIN_AGE) -> int:
+        """
+        Delete the objects no filing uses, and get the number deleted.
+
+        Objects written or reused by `put` less than `min_age` seconds before
+        gc started are kept, as they may belong to a filing that is still
+        being put (see `SectionStore`). Pass 0 when no filings are being put.
+        """
+
+        cutoff = time.time() - min_age
+
+        used: Set[str] = set()
+        for name in self.names():
+            try:
+                stack = [self._read_filing(name)["root"]]
+            except KeyError:
+                # deleted since listed
+                continue
+
+            while stack:
+                key = stack.pop()
+                if key in used:
+                    continue
+                used.add(key)
+                stack += [
+                    child["section"]
+                    for child in self._get_object(key)["children"]
+                    if isinstance(child, dict)
+                ]
+
+        deleted = 0
+        for key, path, stat in self._iter_objects():
+            if key not in used and stat.st_mtime < cutoff:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    continue
+                deleted += 1
+
+        return deleted
+
+    def stats(self) -> StoreStats:
+        """Get the size of the store, and how much deduplication saves"""
+
+        names = self.names()
+        logical_bytes = sum(self._read_filing(name)["bytes"] for name in names)
+
+        objects = stored_bytes = 0
+        for _, _, stat in self._iter_objects():
+            objects += 1
+            stored_bytes += stat.st_size
+
+        return StoreStats(len(names), objects, stored_bytes, logical_bytes)
+
+    def _put_object(self, obj: Dict) -> Tuple[str, int]:
+        """Store obj unless it is stored already, and get its key and size"""
+
+        encoded = json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+        key = hashlib.sha256(encoded).hexdigest()
+
+        path = self._object_path(key)
+        try:
+            # mark the object as recently used, so that gc keeps it
+            os.utime(path)
+        except FileNotFoundError:
+            _write_atomic(path, encoded)
+
+        return key, len(encoded)
+
+    def _get_object(self, key: str) -> Dict:
+        return json.loads(self._object_path(key).read_bytes())
+
+    def _read_filing(self, name: str) -> Dict:
+        try:
+            return json.loads(self._filing_path(name).read_bytes())
+        except FileNotFoundError:
+            raise KeyError(name) from None
+
+    def _object_path(self, key: str) -> Path:
+        return self._objects / key[:2] / f"{key}{_OBJECT_SUFFIX}"
+
+    def _filing_path(self, name: str) -> Path:
+        if not name or "/" in name or "\\" in name or name.startswith("."):
+            raise ValueError(f"Invalid filing name: {name!r}")
+
+        return self._filings / f"{name}{_FILING_SUFFIX}"
+
+    def _iter_objects(self) -> Iterator[Tuple[str, Path, os.stat_result]]:
+        """Iterate the key, path and stat of every stored object"""
+
+        for path in self._objects.glob(f"*/*{_OBJECT_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield path.name[: -len(_OBJECT_SUFFIX)], path, stat
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,97 @@
+from typing import Callable, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from bs4.element import PageElement, Tag
+
+
+def hierarchy_to_data(hierarchy: dict, text: bool = False) -> dict:
+    """
+    Convert a hierarchy to JSON compatible data of the same shape.
+
+    Each node is converted to its HTML, or to its text if `text` is set, so
+    that a leaf becomes a string and a node with children becomes a dict
+    with a single key, the node's string, mapped to the list of its children.
+
+    Example:
+        ```python
+        {"root": [{"<span>PART I</span>": ["<span>Item 1.</span>"]}]}
+        ```
+    """
+
+    convert: Callable[[PageElement], str] = node_text if text else str
+
+    data_root: List = []
+    stack = [(hierarchy["root"], data_root)]
+    while stack:
+        children, data_children = stack.pop()
+        for child in children:
+            if isinstance(child, dict):
+                ((node, node_children),) = child.items()
+                data_node_children = []
+                data_children.append({convert(node): data_node_children})
+                stack.append((node_children, data_node_children))
+            else:
+                data_children.append(convert(child))
+
+    return {"root": data_root}
+
+
+def data_to_hierarchy(data: dict) -> dict:
+    """
+    Convert data made by `hierarchy_to_data` (with HTML nodes) back
+    to a hierarchy of bs4 `Tag`s.
+    """
+
+    # collect the HTML of all nodes so that they can be parsed at once, along
+    # with the list and index each parsed node should be placed at
+    fragments: List[str] = []
+    slots: List[Tuple[List, int, Optional[List]]] = []
+
+    root: List = []
+    stack = [(data["root"], root)]
+    while stack:
+        data_children, children = stack.pop()
+        for data_child in data_children:
+            if isinstance(data_child, dict):
+                ((fragment, data_node_children),) = data_child.items()
+                node_children = []
+                stack.append((data_node_children, node_children))
+            else:
+                fragment, node_children = data_child, None
+
+            fragments.append(fragment)
+            slots.append((children, len(children), node_children))
+            children.append(None)
+
+    for (children, index, node_children), node in zip(
+        slots, parse_fragments(fragments)
+    ):
+        children[index] = node if node_children is None else {node: node_children}
+
+    return {"root": root}
+
+
+def parse_fragments(fragments: List[str]) -> List[Tag]:
+    """
+    Parse the HTML of each element in fragments back to a bs4 `Tag`.
+
+    All fragments are parsed as a single document, falling back to parsing
+    them one by one if they don't map to one top level element each.
+    """
+
+    soup = BeautifulSoup("".join(fragments), features="html.parser")
+    nodes = list(soup.contents)
+
+    if len(nodes) != len(fragments) or not all(isinstance(n, Tag) for n in nodes):
+        nodes = [
+            next(iter(BeautifulSoup(f, features="html.parser").contents))
+            for f in fragments
+        ]
+
+    return nodes
+
+
+def node_text(node: PageElement) -> str:
+    """Get the text of a node with its whitespace collapsed"""
+
+    return " ".join(node.get_text().split())
@@ -0,0 +1,160 @@
+import codecs
+import gzip
+import io
+import mmap
+import re
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+# binary sources besides files
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+
+# encoding of documents that don't declare one
+DEFAULT_ENCODING = "cp1252"
+
+# size of the chunks sources are decoded (and fed to the parser) in
+CHUNK_SIZE = 64 * 1024
+
+# how far into a document its meta charset is looked for
+_SNIFF_SIZE = 4096
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+_meta_charset_re = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_:.-]+)""", re.IGNORECASE
+)
+
+
+class _BufferReader(io.RawIOBase):
+    """Read a buffer (e.g. an mmap) as a binary stream, without copying it"""
+
+    def __init__(self, buffer: Buffer) -> None:
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+
+        self._position = max(0, offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._position : self._position + len(b)]
+        b[: len(chunk)] = chunk
+        self._position += len(chunk)
+        return len(chunk)
+
+
+def open_source(source: Union[Path, Buffer]) -> BinaryIO:
+    """
+    Open a file or a buffer as a binary stream, transparently decompressing
+    gzip and zstd (if the `zstandard` package is installed) content.
+    """
+
+    if isinstance(source, Path):
+        stream = source.open("rb")
+    else:
+        stream = io.BufferedReader(_BufferReader(source))
+
+    magic = stream.read(4)
+    stream.seek(0)
+
+    if magic.startswith(_GZIP_MAGIC):
+        # a GzipFile doesn't close the stream it is given, only one it opened
+        if isinstance(source, Path):
+            stream.close()
+            return gzip.open(source, "rb")
+
+        return gzip.GzipFile(fileobj=stream)
+    elif magic == _ZSTD_MAGIC:
+        try:
+            import zstandard
+        except ImportError:
+            stream.close()
+            raise ImportError(
+                "The 'zstandard' package is needed to read zstd compressed sources"
+            ) from None
+
+        return zstandard.ZstdDecompressor().stream_reader(stream, closefd=True)
+
+    return stream
+
+
+def detect_encoding(head: bytes, default: str = DEFAULT_ENCODING) -> str:
+    """
+    Detect the encoding of a document from its first bytes: a byte order
+    mark, then a meta tag's charset, and finally `default`.
+    """
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    match = _meta_charset_re.search(head[:_SNIFF_SIZE])
+    if match is not None:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except LookupError:
+            pass
+
+    return default
+
+
+def iter_decoded_chunks(
+    stream: BinaryIO,
+    encoding: Optional[str] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Decode a binary stream in chunks, detecting its encoding from the first
+    chunk if none is given.
+
+    Undecodable bytes are replaced, and newlines are translated to "\\n" the
+    same way reading a file in text mode does.
+    """
+
+    if encoding is None:
+        chunk = stream.read(max(chunk_size, _SNIFF_SIZE))
+        encoding = detect_encoding(chunk)
+    else:
+        chunk = stream.read(chunk_size)
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+
+    # a "\r" at the end of a chunk may be the start of a "\r\n"
+    pending_cr = ""
+    while True:
+        final = not chunk
+        text = pending_cr + decoder.decode(chunk, final=final)
+        pending_cr = ""
+        if not final and text.endswith("\r"):
+            text, pending_cr = text[:-1], "\r"
+
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        if text:
+            yield text
+
+        if final:
+            return
+
+        chunk = stream.read(chunk_size)
@@ -0,0 +1,343 @@
+import json
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sec_html_parser.batch import _uncompressed, expand_targets
+from sec_html_parser.options import DEFAULT_BATCH_SIZE
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import node_text
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    loaded_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    id INTEGER PRIMARY KEY,
+    filing_id INTEGER NOT NULL REFERENCES filings (id),
+    parent_id INTEGER REFERENCES sections (id),
+    depth INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sections_filing_id ON sections (filing_id);
+CREATE INDEX IF NOT EXISTS sections_parent_id ON sections (parent_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS sections_fts USING fts5 (
+    path, text, content='sections', content_rowid='id'
+);
+"""
+
+# parent (index in the filing's rows, None for children of the root), depth,
+# path (JSON list of the headings above the node), tag name and text of a node
+SectionRow = Tuple[Optional[int], int, str, str, str]
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading a single file"""
+
+    target: str
+    name: str
+    sections: int
+    seconds: float
+    error: Optional[str] = None
+
+
+@dataclass
+class SearchHit:
+    filing: str
+    path: List[str]
+    text: str
+
+
+def section_rows(hierarchy: dict) -> List[SectionRow]:
+    """Get a row for every node of hierarchy, in document order"""
+
+    rows: List[SectionRow] = []
+
+    # (iterator of the children still to add, index of their parent row,
+    # path of headings down to them) of each level
+    stack = [(iter(hierarchy["root"]), None, [])]
+    while stack:
+        children, parent, path = stack[-1]
+        child = next(children, None)
+        if child is None:
+            stack.pop()
+            continue
+
+        if isinstance(child, dict):
+            ((node, node_children),) = child.items()
+        else:
+            node, node_children = child, None
+
+        text = node_text(node)
+        rows.append((parent, len(stack), json.dumps(path), node.name, text))
+        if node_children is not None:
+            stack.append((iter(node_children), len(rows) - 1, path + [text]))
+
+    return rows
+
+
+class SectionDatabase:
+    """
+    SQLite database of the sections of many filings, with a full text index.
+
+    Every node of a filing's hierarchy is a row of the `sections` table, with
+    its parent, depth and the path of headings above it, and the
+    `sections_fts` FTS5 table indexes their text and paths. Filings added are
+    buffered and inserted `batch_size` at a time in a single transaction, and
+    the database is in WAL mode so it can be searched while loading.
+
+    Example:
+        ```python
+        with SectionDatabase(Path("sections.db")) as db:
+            db.add("aapl-2021", Parser().get_hierarchy(Path("aapl-2021.html")))
+
+        for hit in SectionDatabase(Path("sections.db")).search("supply chain"):
+            print(hit.filing, hit.path, hit.text)
+        ```
+    """
+
+    def __init__(self, database: Path, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(database, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+        self._pending: List[Tuple[str, List[SectionRow]]] = []
+
+    def add(self, name: str, hierarchy: dict) -> int:
+        """
+        Add the hierarchy of filing name, replacing any filing of that name,
+        and get the number of sections it has.
+        """
+
+        rows = section_rows(hierarchy)
+        self.add_rows(name, rows)
+        return len(rows)
+
+    def add_rows(self, name: str, rows: List[SectionRow]) -> None:
+        """Add the rows (as given by `section_rows`) of filing name"""
+
+        self._pending.append((name, rows))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert all added filings, in a single transaction"""
+
+        if not self._pending:
+            return
+
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            next_id = cursor.execute(
+                "SELECT coalesce(max(id), 0) + 1 FROM sections"
+            ).fetchone()[0]
+
+            for name, rows in self._pending:
+                self._delete(cursor, name)
+                filing_id = cursor.execute(
+                    "INSERT INTO filings (name, loaded_at) VALUES (?, ?)",
+                    (name, time.time()),
+                ).lastrowid
+
+                # ids are given here so that parents and the full text index
+                # can refer to rows without reading them back
+                sections = [
+                    (
+                        next_id + i,
+                        filing_id,
+                        None if parent is None else next_id + parent,
+                        depth,
+                        path,
+                        tag,
+                        text,
+                    )
+                    for i, (parent, depth, path, tag, text) in enumerate(rows)
+                ]
+                next_id += len(rows)
+
+                cursor.executemany(
+                    "INSERT INTO sections VALUES (?, ?, ?, ?, ?, ?, ?)", sections
+                )
+                cursor.executemany(
+                    "INSERT INTO sections_fts (rowid, path, text) VALUES (?, ?, ?)",
+                    [(row[0], row[4], row[6]) for row in sections],
+                )
+
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+        self._pending = []
+
+    def delete(self, name: str) -> None:
+        """Delete filing name and its sections"""
+
+        self.flush()
+        cursor = self.connection.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            self._delete(cursor, name)
+            cursor.execute("COMMIT")
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+
+    def search(self, query: str, limit: int = 10) -> List[SearchHit]:
+        """Get the sections best matching an FTS5 query"""
+
+        self.flush()
+        return [
+            SearchHit(filing, json.loads(path), text)
+            for filing, path, text in self.connection.execute(
+                """
+                SELECT filings.name, sections.path, sections.text
+                FROM sections_fts
+                JOIN sections ON sections.id = sections_fts.rowid
+                JOIN filings ON filings.id = sections.filing_id
+                WHERE sections_fts MATCH ?
+                ORDER BY sections_fts.rank
+                LIMIT ?
+                """,
+                (query, limit),
+            )
+        ]
+
+    def close(self) -> None:
+        """Insert the filings still buffered, and close the database"""
+
+        try:
+            self.flush()
+        finally:
+            self.connection.close()
+
+    def __enter__(self) -> "SectionDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _delete(cursor: sqlite3.Cursor, name: str) -> None:
+        row = cursor.execute(
+            "SELECT id FROM filings WHERE name = ?", (name,)
+        ).fetchone()
+        if row is None:
+            return
+
+        cursor.execute(
+            """
+            INSERT INTO sections_fts (sections_fts, rowid, path, text)
+            SELECT 'delete', id, path, text FROM sections WHERE filing_id = ?
+            """,
+            row,
+        )
+        cursor.execute("DELETE FROM sections WHERE filing_id = ?", row)
+        cursor.execute("DELETE FROM filings WHERE id = ?", row)
+
+
+# parser of the current worker process, created once by `_init_worker`
+_worker_parser: Optional[Parser] = None
+
+
+def _init_worker(parser_options: Dict) -> None:
+    global _worker_parser
+    _worker_parser = Parser(**parser_options)
+
+
+def _parse_rows(
+    file: Tuple[Path, Path],
+) -> Tuple[LoadResult, Optional[List[SectionRow]]]:
+    """Parse a single file to its rows, recording (and not raising) any error"""
+
+    target, relative = file
+    name = _filing_name(relative)
+
+    start = time.perf_counter()
+    rows = error = None
+    try:
+        rows = section_rows(_worker_parser.get_hierarchy(target))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    result = LoadResult(
+        target=str(target),
+        name=name,
+        sections=0 if rows is None else len(rows),
+        seconds=time.perf_counter() - start,
+        error=error,
+    )
+    return result, rows
+
+
+def _filing_name(relative: Path) -> str:
+    return _uncompressed(relative).as_posix()
+
+
+def load_files(
+    database: Path,
+    targets: Iterable[str],
+    parser_options: Optional[Dict] = None,
+    jobs: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[LoadResult]:
+    """
+    Parse the files matched by targets (as in `batch.expand_targets`) into
+    database, yielding their results in order.
+
+    Files are parsed by `jobs` worker processes, which send back plain rows
+    that this process inserts in batches. Filings are named by their path
+    relative to the directory searched (or to the part of a glob pattern
+    without wildcards), so loading a file again replaces it. Raise
+    ValueError, before loading anything, if two files would get the same
+    name. A file that fails to parse doesn't stop the load, its error is
+    recorded in its result instead.
+    """
+
+    files = expand_targets(targets)
+    parser_options = parser_options or {}
+
+    targets_by_name: Dict[str, Path] = {}
+    for target, relative in files:
+        name = _filing_name(relative)
+        if name in targets_by_name:
+            raise ValueError(
+                f"'{target}' and '{targets_by_name[name]}'"
+                f" would both be loaded as '{name}'"
+            )
+        targets_by_name[name] = target
+
+    with SectionDatabase(database, batch_size) as db, ExitStack() as stack:
+        if jobs <= 1:
+            _init_worker(parser_options)
+            results = map(_parse_rows, files)
+        else:
+            executor = stack.enter_context(
+                ProcessPoolExecutor(
+                    max_workers=jobs,
+                    initializer=_init_worker,
+                    initargs=(parser_options,),
+                )
+            )
+            chunksize = max(1, len(files) // (jobs * 4))
+            results = executor.map(_parse_rows, files, chunksize=chunksize)
+
+        for result, rows in results:
+            if rows is not None:
+                db.add_rows(result.name, rows)
+            yield result
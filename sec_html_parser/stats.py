@@ -0,0 +1,59 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+# phases timed by a parser. "stream" is the whole event loop of the "stream"
+# engine, so it includes the "stack" time of the spans it adds
+PHASES = ("read", "soup", "walk", "styles", "stream", "stack", "render")
+
+COUNTERS = ("spans", "divs", "tables", "stack_pops", "max_stack_depth")
+
+
+class ParseStats:
+    """
+    Time spent in each phase of parsing, and counts of the elements seen,
+    accumulated over everything a parser parses.
+
+    A parser only records stats if it is given a ParseStats object, otherwise
+    it skips all timing and counting.
+
+    Example:
+        ```python
+        stats = ParseStats()
+        Parser(stats=stats).get_hierarchy(Path("form.html"))
+        print(stats.to_dict())
+        ```
+    """
+
+    def __init__(self) -> None:
+        self.seconds: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.counts: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+    @contextmanager
+    def timer(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the context to phase"""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[phase] += time.perf_counter() - start
+
+    def reset(self) -> None:
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {"seconds": dict(self.seconds), "counts": dict(self.counts)}
+
+    def update(self, data: Dict[str, Dict]) -> None:
+        """Add the stats in data (as given by `to_dict`) to these stats"""
+
+        for phase, seconds in data["seconds"].items():
+            self.seconds[phase] += seconds
+
+        for counter, count in data["counts"].items():
+            if counter == "max_stack_depth":
+                self.counts[counter] = max(self.counts[counter], count)
+            else:
+                self.counts[counter] += count
@@ -0,0 +1,223 @@
+from array import array
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.element import Comment, NavigableString, Tag
+
+from sec_html_parser.table import has_text
+
+if TYPE_CHECKING:
+    from sec_html_parser.parser import Parser
+
+# whitespace collapsed by BeautifulSoup in strings outside of <pre> and <textarea>
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+class StreamHierarchyBuilder(HTMLParser):
+    """
+    Build a text hierarchy from HTML parser events, without building a
+    BeautifulSoup tree of the whole document.
+
+    Only spans and tables (the elements that end up in the hierarchy) are
+    built into bs4 `Tag`s, everything else is reduced to the name of the
+    open tags and the style key of the current div. The resulting hierarchy
+    is the same as `Parser.get_soup_hierarchy` would give for an
+    "html.parser" soup of the same document.
+
+    Usage:
+        ```python
+        builder = StreamHierarchyBuilder(Parser())
+        for chunk in chunks:
+            builder.feed(chunk)
+        builder.close()
+        hierarchy = builder.hierarchy
+        ```
+
+    If `track_positions` is set, `positions` maps the `id` of each element in
+    the hierarchy to where it starts in the fed text: the (start, end) offsets
+    of the start tag of the div it is in (or None), and its own start offset.
+    """
+
+    def __init__(self, parser: "Parser", track_positions: bool = False) -> None:
+        super().__init__(convert_charrefs=True)
+
+        self._parser = parser
+        self._style_keys = parser.style_rules.compile()
+        self._tree_builder = HTMLParserTreeBuilder()
+
+        self.hierarchy = {"root": []}
+
+        # same stack and current div as in `Parser.get_soup_hierarchy`, but
+        # with the unranked style keys since the document isn't known ahead
+        self._parents_metadata_stack = []
+        self._element_div_key = None
+
+        # names of all currently open tags
+        self._open_tags: List[str] = []
+
+        # index in `_open_tags` of the span or table being built, if any,
+        # and the tags open inside it (starting with the span or table itself)
+        self._capture_index: Optional[int] = None
+        self._capture_tags: List[Tag] = []
+        self._capture_text: List[str] = []
+
+        # offsets of the start of each line in the fed text, and the positions
+        # of the current div and of the span or table being built
+        self.positions: Dict[int, Tuple[Optional[Tuple[int, int]], int]] = {}
+        self._line_starts: Optional[array] = (
+            array("q", [0]) if track_positions else None
+        )
+        self._fed_length = 0
+        self._div_range: Optional[Tuple[int, int]] = None
+        self._capture_position: Tuple[Optional[Tuple[int, int]], int] = (None, 0)
+
+    def feed(self, data: str) -> None:
+        if self._line_starts is not None:
+            index = data.find("\n")
+            while index != -1:
+                self._line_starts.append(self._fed_length + index + 1)
+                index = data.find("\n", index + 1)
+            self._fed_length += len(data)
+
+        super().feed(data)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._start_tag(tag, attrs)
+
+        # void elements (e.g. <br>) are closed immediately
+        if self._tree_builder.can_be_empty_element(tag):
+            self._close_open_tags(len(self._open_tags) - 1)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]):
+        self._start_tag(tag, attrs)
+        self._close_open_tags(len(self._open_tags) - 1)
+
+    def handle_endtag(self, tag: str) -> None:
+        # like BeautifulSoup, close the most recent open tag with this name
+        # (and everything opened after it), or ignore the end tag if there is none
+        for index in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[index] == tag:
+                self._close_open_tags(index)
+                return
+
+    def handle_data(self, data: str) -> None:
+        if self._capture_index is not None:
+            self._capture_text.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        if self._capture_index is not None:
+            self._flush_capture_text()
+            self._capture_tags[-1].append(Comment(data))
+
+    def close(self) -> None:
+        super().close()
+
+        # unclosed tags are closed at the end of the document
+        self._close_open_tags(0)
+
+    def _start_tag(self, name: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if self._capture_index is not None:
+            self._flush_capture_text()
+            tag = self._new_tag(name, attrs)
+            self._capture_tags[-1].append(tag)
+            self._capture_tags.append(tag)
+        elif name == "div":
+            self._element_div_key = self._style_keys.div_key(self._get_style(attrs))
+            if self._parser.stats is not None:
+                self._parser.stats.counts["divs"] += 1
+            if self._line_starts is not None:
+                start = self._position()
+                self._div_range = (start, start + len(self.get_starttag_text()))
+        elif name == "span" or name == "table":
+            self._capture_index = len(self._open_tags)
+            self._capture_tags = [self._new_tag(name, attrs)]
+            if self._line_starts is not None:
+                self._capture_position = (self._div_range, self._position())
+
+        self._open_tags.append(name)
+
+    def _close_open_tags(self, index: int) -> None:
+        """Close all open tags from `index` onwards"""
+
+        if index >= len(self._open_tags):
+            return
+
+        del self._open_tags[index:]
+
+        if self._capture_index is None:
+            return
+
+        self._flush_capture_text()
+        if index <= self._capture_index:
+            element_node = self._capture_tags[0]
+            self._capture_index = None
+            self._capture_tags = []
+            self._add_element(element_node)
+        else:
+            del self._capture_tags[index - self._capture_index :]
+
+    def _position(self) -> int:
+        """Get the offset in the fed text of the tag being handled"""
+
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def _add_element(self, element_node: Tag) -> None:
+        """Add a complete span or table to the hierarchy"""
+
+        if self._line_starts is not None:
+            self.positions[id(element_node)] = self._capture_position
+
+        if element_node.name == "span":
+            self._parser._add_span_to_hierarchy(
+                element_node,
+                self._element_div_key,
+                self._style_keys.span_key(element_node.get("style")),
+                self._parents_metadata_stack,
+                self.hierarchy,
+            )
+        else:
+            if self._parser.stats is not None:
+                self._parser.stats.counts["tables"] += 1
+            if has_text(element_node):
+                self._parser._append_child(self._parents_metadata_stack, element_node)
+
+    def _flush_capture_text(self) -> None:
+        """Add the text collected since the last tag to the open tag"""
+
+        if not self._capture_text:
+            return
+
+        text = "".join(self._capture_text)
+        self._capture_text = []
+
+        # same whitespace handling as `BeautifulSoup.endData`
+        preserve_whitespace = any(
+            tag.name in self._tree_builder.preserve_whitespace_tags
+            for tag in self._capture_tags
+        )
+        if not preserve_whitespace and all(c in _ASCII_SPACES for c in text):
+            text = "\n" if "\n" in text else " "
+
+        parent = self._capture_tags[-1]
+        container = self._tree_builder.string_containers.get(
+            parent.name, NavigableString
+        )
+        parent.append(container(text))
+
+    def _new_tag(self, name: str, attrs: List[Tuple[str, Optional[str]]]) -> Tag:
+        return Tag(builder=self._tree_builder, name=name, attrs=self._attrs(attrs))
+
+    @staticmethod
+    def _attrs(attrs: List[Tuple[str, Optional[str]]]) -> Dict[str, str]:
+        return {key: "" if value is None else value for key, value in attrs}
+
+    @staticmethod
+    def _get_style(attrs: List[Tuple[str, Optional[str]]]) -> Optional[str]:
+        style = None
+        for key, value in attrs:
+            if key == "style":
+                style = "" if value is None else value
+
+        return style
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a StyleCache's counters"""
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class StyleCache(Generic[T]):
+    """
+    Bounded LRU cache interning parsed styles by their raw style string.
+
+    Filings reuse a few dozen distinct style strings across hundreds of
+    thousands of elements, so each distinct string is parsed once by `factory`
+    and the parsed object is shared by every later lookup, across documents.
+
+    Cached objects are shared, callers must not mutate them.
+    """
+
+    def __init__(self, factory: Callable[[str], T], maxsize: int = 4096) -> None:
+        if maxsize <= 0:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+
+        self._factory = factory
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, T]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, style: str) -> T:
+        """Get the parsed style of `style`, parsing it only if it isn't cached"""
+
+        with self._lock:
+            try:
+                value = self._entries[style]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(style)
+                self._hits += 1
+                return value
+
+        # parse outside the lock, parsing the same string twice is harmless
+        value = self._factory(style)
+
+        with self._lock:
+            self._misses += 1
+            self._entries[style] = value
+            self._entries.move_to_end(style)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+        return value
+
+    def stats(self) -> CacheStats:
+        """Get the current hit/miss counters and size of the cache"""
+
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+            )
+
+    def clear(self) -> None:
+        """Drop all cached styles and reset the counters"""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
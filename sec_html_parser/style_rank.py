@@ -0,0 +1,192 @@
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+from bs4.element import Tag
+
+from sec_html_parser.style_rules import (
+    DEFAULT_STYLE_RULES,
+    NO_STYLE,
+    RELATIVE,
+    StyleRules,
+)
+
+# below this many span keys, converting them to a NumPy array costs more
+# than counting them in Python
+NUMPY_MIN_SIZE = 1024
+
+
+def rank_styles(
+    elements: List[Tag], rules: StyleRules = DEFAULT_STYLE_RULES
+) -> List[Optional[int]]:
+    """
+    Compute a compact integer rank key for every span and div in `elements`.
+
+    Span and div keys are dense ranks of their style tuples under `rules`
+    (see `StyleRules`), both starting at 1, so comparing two keys gives the
+    same result as comparing the style tuples they came from.
+    Elements without a style get `NO_STYLE`, relative spans get `RELATIVE`,
+    and any other element (e.g. a table) gets None.
+
+    Each distinct style string is parsed once, so the keys can be compared
+    while building the hierarchy without touching the elements again.
+    """
+
+    # style string of each element, and the style tuple of each distinct string
+    element_styles: List[Optional[str]] = []
+    span_tuples: Dict[str, Hashable] = {}
+    div_tuples: Dict[str, Hashable] = {}
+    compiled = rules.compile()
+
+    for node in elements:
+        name = node.name
+        style = node.get("style") if name in ("span", "div") else None
+        element_styles.append(style)
+
+        if style is None:
+            continue
+        elif name == "span":
+            if style not in span_tuples:
+                span_tuples[style] = compiled.span_key(style)
+        elif style not in div_tuples:
+            div_tuples[style] = compiled.div_key(style)
+
+    span_keys = _dense_rank_styles(span_tuples)
+    div_keys = _dense_rank_styles(div_tuples)
+
+    keys: List[Optional[int]] = []
+    for node, style in zip(elements, element_styles):
+        name = node.name
+        if name == "span":
+            keys.append(NO_STYLE if style is None else span_keys[style])
+        elif name == "div":
+            keys.append(NO_STYLE if style is None else div_keys[style])
+        else:
+            keys.append(None)
+
+    return keys
+
+
+def span_style_key(
+    style: Optional[str], rules: StyleRules = DEFAULT_STYLE_RULES
+) -> Hashable:
+    """
+    Get the unranked key of a span style string: its style tuple,
+    or one of the `NO_STYLE` / `RELATIVE` sentinels
+    """
+
+    return rules.compile().span_key(style)
+
+
+def div_style_key(
+    style: Optional[str], rules: StyleRules = DEFAULT_STYLE_RULES
+) -> Hashable:
+    """Get the unranked key of a div style string: its style tuple, or `NO_STYLE`"""
+
+    return rules.compile().div_key(style)
+
+
+def dense_ranks(style_tuples: Sequence[Tuple]) -> List[int]:
+    """
+    Get the dense rank (starting at 1) of each style tuple in a single sort,
+    so that comparing two ranks gives the same result as comparing the
+    tuples they came from.
+    """
+
+    # documents have a few dozen distinct styles, too few for NumPy to help
+    ranks = {
+        style_tuple: rank
+        for rank, style_tuple in enumerate(sorted(set(style_tuples)), start=1)
+    }
+    return [ranks[style_tuple] for style_tuple in style_tuples]
+
+
+def level_histogram(span_keys: Sequence[Optional[int]]) -> Dict[int, int]:
+    """
+    Count the spans of each style level in span keys made by `rank_styles`.
+
+    Level 1 is the most prominent style in the document (e.g. the "PART I"
+    headings) and the last level its least prominent one, usually footnotes.
+    Spans without a style or in relative position aren't counted.
+
+    Uses `numpy.bincount` on many keys if NumPy is installed (the `numpy`
+    extra).
+    """
+
+    np = _numpy() if len(span_keys) >= NUMPY_MIN_SIZE else None
+    if np is not None:
+        keys = np.asarray([NO_STYLE if k is None else k for k in span_keys])
+        counts = np.bincount(keys[keys > NO_STYLE])
+        key_counts = {k: c for k, c in enumerate(counts.tolist()) if c}
+    else:
+        key_counts = Counter(k for k in span_keys if k is not None and k > NO_STYLE)
+
+    levels = sorted(key_counts, reverse=True)
+    return {level: key_counts[key] for level, key in enumerate(levels, start=1)}
+
+
+def _dense_rank_styles(style_tuples: Dict[str, Hashable]) -> Dict[str, int]:
+    """Map each style string to the dense rank (starting at 1) of its tuple"""
+
+    ranked = [style for style, t in style_tuples.items() if t != RELATIVE]
+    ranks = dense_ranks([style_tuples[style] for style in ranked])
+
+    keys = dict.fromkeys(style_tuples, RELATIVE)
+    keys.update(zip(ranked, ranks))
+
+    return keys
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """Get the numpy module, or None if it isn't installed"""
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def is_span_key_child(node_key, other_key) -> bool:
+    """
+    Check if a span is a child of another span by their rank keys.
+
+    Keys can be made by `rank_styles` or `CompiledStyleRules.span_key`,
+    or be any mutually comparable keys.
+    """
+
+    # check that other has a style
+    if other_key == NO_STYLE:
+        return False
+
+    # a node with no style is always a child
+    if node_key == NO_STYLE:
+        return True
+
+    # text in relative position (top or bottom) is never a child
+    # and can never have children
+    if node_key == RELATIVE or other_key == RELATIVE:
+        return False
+
+    return node_key < other_key
+
+
+def is_div_key_child(node_key, other_key) -> bool:
+    """
+    Check if a div is a child of another div by their rank keys.
+
+    Keys can be made by `rank_styles` or `CompiledStyleRules.div_key`,
+    a missing div (None) is treated as a div with no style.
+    """
+
+    # check that other has a style
+    if other_key == NO_STYLE:
+        return False
+
+    # a div with no style is always a child
+    if node_key is None or node_key == NO_STYLE:
+        return True
+
+    return node_key < other_key
@@ -0,0 +1,262 @@
+import json
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from sec_html_parser.style_cache import CacheStats, StyleCache
+
+# rank key of an element without a style attribute
+NO_STYLE = 0
+
+# rank key of a span in relative position (top or bottom)
+RELATIVE = -1
+
+_number_re = re.compile(r"\d+\.?\d*")
+
+
+@dataclass(frozen=True)
+class StyleRule:
+    """
+    A CSS property that counts when ranking spans or divs.
+
+    Without `keywords` the property ranks by its number (e.g. 10 for
+    "font-size:10pt"), which must be followed by `unit` if one is given.
+    With `keywords` (listed from the lowest ranking to the highest) it ranks
+    by the position of the first word of its value that is one of them
+    (matched exactly, case included), starting at 1. A missing property, or
+    one without a keyword or a non-zero number, ranks as `default`.
+    """
+
+    property: str
+    keywords: Tuple[str, ...] = ()
+    unit: Optional[str] = None
+    default: float = -1
+
+
+DEFAULT_SPAN_RULES = (
+    StyleRule("font-size"),
+    StyleRule("font-weight"),
+    StyleRule("font-style", keywords=("italic",)),
+)
+
+DEFAULT_DIV_RULES = (StyleRule("margin-top", unit="pt"),)
+
+
+@dataclass(frozen=True)
+class StyleRules:
+    """
+    The CSS properties that rank spans and divs, and how they rank.
+
+    The key of a span or div is the tuple of the ranks of its rules, in the
+    order they are listed, so earlier rules take precedence and later ones
+    only break ties. A span with one of the `relative` declarations is in
+    relative position (e.g. a superscript), which is never a child and never
+    has children.
+
+    Rules are compiled once (see `compile`) into functions that read a style
+    string in a single pass over its declarations, so adding rules doesn't
+    add passes over it.
+
+    Example:
+        ```python
+        # uppercase text ranks above text of the same font
+        rules = StyleRules(
+            span=DEFAULT_SPAN_RULES
+            + (StyleRule("text-transform", keywords=("uppercase",)),)
+        )
+        hierarchy = Parser(style_rules=rules).get_hierarchy(Path("form.html"))
+        ```
+    """
+
+    span: Tuple[StyleRule, ...] = DEFAULT_SPAN_RULES
+    div: Tuple[StyleRule, ...] = DEFAULT_DIV_RULES
+    relative: Tuple[str, ...] = ("position:relative",)
+
+    def compile(self) -> "CompiledStyleRules":
+        """
+        Get the key functions of the rules, compiled the first time they are
+        asked for and shared by every parser using equal rules
+        """
+
+        return _compile(self)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "StyleRules":
+        """
+        Get rules from a dict of the same shape as `to_dict` gives, where
+        missing fields of the rules and of each rule take their defaults.
+        """
+
+        unknown = set(data) - {"span", "div", "relative"}
+        if unknown:
+            raise ValueError(
+                f"Unknown style rules fields: {', '.join(sorted(unknown))}"
+            )
+
+        rules = {}
+        for field in ("span", "div"):
+            if field in data:
+                rules[field] = tuple(
+                    StyleRule(**{**rule, "keywords": tuple(rule.get("keywords", ()))})
+                    for rule in data[field]
+                )
+        if "relative" in data:
+            rules["relative"] = tuple(data["relative"])
+
+        return cls(**rules)
+
+    @classmethod
+    def load(cls, path: Path) -> "StyleRules":
+        """Load rules from a JSON file (see `from_dict`)"""
+
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+DEFAULT_STYLE_RULES = StyleRules()
+
+
+def parse_declarations(style: str) -> Dict[str, str]:
+    """
+    Split a style string into its declarations, mapping each (lower case)
+    property to its value. A repeated property keeps its last value.
+    """
+
+    declarations = {}
+    for declaration in style.split(";"):
+        prop, colon, value = declaration.partition(":")
+        if colon:
+            declarations[prop.strip().lower()] = value.strip()
+
+    return declarations
+
+
+def parse_number(value: Optional[str], unit: Optional[str] = None) -> Optional[float]:
+    """
+    Get the number at the start of a CSS value, if it has one and it is
+    followed by unit (if given)
+    """
+
+    if value is None:
+        return None
+
+    match = _number_re.match(value)
+    if match is None or (unit is not None and not value.startswith(unit, match.end())):
+        return None
+
+    return float(match.group())
+
+
+class CompiledStyleRules:
+    """
+    Key functions of `StyleRules`.
+
+    Keys are computed once per distinct style string, and cached like parsed
+    styles are (see `StyleCache`).
+    """
+
+    def __init__(self, rules: StyleRules) -> None:
+        relative = set()
+        for declaration in rules.relative:
+            prop, _, value = declaration.partition(":")
+            relative.add((prop.strip().lower(), value.strip().lower()))
+
+        self.rules = rules
+        self._span_keys = StyleCache(_compile_key(rules.span, relative))
+        self._div_keys = StyleCache(_compile_key(rules.div, set()))
+
+    def span_key(self, style: Optional[str]) -> Hashable:
+        """
+        Get the unranked key of a span style string: the tuple of the ranks of
+        its rules, or one of the `NO_STYLE` / `RELATIVE` sentinels
+        """
+
+        return NO_STYLE if style is None else self._span_keys.get(style)
+
+    def div_key(self, style: Optional[str]) -> Hashable:
+        """
+        Get the unranked key of a div style string: the tuple of the ranks of
+        its rules, or `NO_STYLE`
+        """
+
+        return NO_STYLE if style is None else self._div_keys.get(style)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        """Get the stats of the span and div key caches, by element name"""
+
+        return {"span": self._span_keys.stats(), "div": self._div_keys.stats()}
+
+    def clear_caches(self) -> None:
+        """Drop the cached keys of every style string and reset the stats"""
+
+        self._span_keys.clear()
+        self._div_keys.clear()
+
+
+@lru_cache(maxsize=None)
+def _compile(rules: StyleRules) -> CompiledStyleRules:
+    return CompiledStyleRules(rules)
+
+
+def _compile_key(
+    rules: Tuple[StyleRule, ...], relative: set
+) -> Callable[[str], Hashable]:
+    """Compile rules into a function getting the key of a style string"""
+
+    # rule index and value parser of each property
+    parsers: Dict[str, Tuple[int, Callable[[str], Optional[float]]]] = {
+        rule.property.lower(): (i, _compile_value(rule)) for i, rule in enumerate(rules)
+    }
+    defaults = [rule.default for rule in rules]
+    relative_properties = {prop for prop, _ in relative}
+
+    def key(style: str) -> Hashable:
+        ranks = list(defaults)
+        for declaration in style.split(";"):
+            prop, colon, value = declaration.partition(":")
+            if not colon:
+                continue
+
+            prop = prop.strip().lower()
+            if (
+                prop in relative_properties
+                and (prop, value.strip().lower()) in relative
+            ):
+                return RELATIVE
+
+            parser = parsers.get(prop)
+            if parser is not None:
+                i, parse = parser
+                rank = parse(value.strip())
+                ranks[i] = defaults[i] if rank is None else rank
+
+        return tuple(ranks)
+
+    return key
+
+
+def _compile_value(rule: StyleRule) -> Callable[[str], Optional[float]]:
+    """Compile a rule into a function getting the rank of a property value"""
+
+    if not rule.keywords:
+        unit = rule.unit
+        # a zero ranks like a missing value (e.g. "margin-top:0pt" is as
+        # good as no margin at all)
+        return lambda value: parse_number(value, unit) or None
+
+    ranks = {keyword: rank for rank, keyword in enumerate(rule.keywords, 1)}
+
+    def parse(value: str) -> Optional[float]:
+        for word in value.split():
+            rank = ranks.get(word)
+            if rank is not None:
+                return rank
+
+        return None
+
+    return parse
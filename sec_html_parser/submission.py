@@ -0,0 +1,140 @@
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union
+
+from sec_html_parser.source import Buffer, open_source
+
+# size of the chunks a submission is scanned in
+CHUNK_SIZE = 1024 * 1024
+
+_DOCUMENT_START = b"<DOCUMENT>"
+_DOCUMENT_END = b"</DOCUMENT>"
+_TEXT_START = b"<TEXT>"
+_TEXT_END = b"</TEXT>"
+_XBRL_START = b"<XBRL>"
+_XBRL_END = b"</XBRL>"
+
+_header_re = re.compile(rb"<(TYPE|SEQUENCE|FILENAME|DESCRIPTION)>[ \t]*([^\r\n<]*)")
+
+
+@dataclass
+class SubmissionDocument:
+    """A single document of an EDGAR full submission"""
+
+    type: str
+    sequence: Optional[int]
+    filename: Optional[str]
+    description: Optional[str]
+
+    # content between the <TEXT> tags (without an <XBRL> wrapper)
+    text: bytes
+
+    @property
+    def is_html(self) -> bool:
+        """Check if the document is HTML (and not e.g. uuencoded or plain text)"""
+
+        if self.filename is not None:
+            return self.filename.lower().endswith((".htm", ".html"))
+
+        return b"<html" in self.text[:4096].lower()
+
+
+class _Scanner:
+    """Consume a binary stream up to markers, in fixed size chunks"""
+
+    def __init__(self, stream: BinaryIO, chunk_size: int = CHUNK_SIZE) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._buffer = b""
+
+    def read_until(self, marker: bytes, keep: bool = True) -> Tuple[bytes, bool]:
+        """
+        Consume the stream up to and including the next marker, returning the
+        bytes before it (only if `keep` is set) and whether it was found.
+        """
+
+        parts = []
+        while True:
+            index = self._buffer.find(marker)
+            if index != -1:
+                if keep:
+                    parts.append(self._buffer[:index])
+                self._buffer = self._buffer[index + len(marker) :]
+                return b"".join(parts), True
+
+            # only the end of the buffer may be the start of the marker
+            tail = max(0, len(self._buffer) - len(marker) + 1)
+            if keep:
+                parts.append(self._buffer[:tail])
+            self._buffer = self._buffer[tail:]
+
+            chunk = self._stream.read(self._chunk_size)
+            if not chunk:
+                if keep:
+                    parts.append(self._buffer)
+                self._buffer = b""
+                return b"".join(parts), False
+
+            self._buffer += chunk
+
+
+def iter_documents(
+    source: Union[Path, Buffer],
+    types: Optional[Iterable[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[SubmissionDocument]:
+    """
+    Iterate the documents of an EDGAR full submission (.txt) file, optionally
+    only those with one of `types` (e.g. ["10-K", "EX-21"]).
+
+    The submission is scanned in chunks: the content of documents that aren't
+    selected (e.g. uuencoded images) is skipped without being kept or decoded,
+    so only a single document is in memory at a time.
+
+    Example:
+        ```python
+        for document in iter_documents(Path("0000320193-20-000096.txt"), ["10-K"]):
+            hierarchy = Parser().get_hierarchy(document.text)
+        ```
+    """
+
+    if types is not None:
+        types = {document_type.upper() for document_type in types}
+
+    with open_source(source) as stream:
+        scanner = _Scanner(stream, chunk_size)
+        while True:
+            _, found = scanner.read_until(_DOCUMENT_START, keep=False)
+            if not found:
+                return
+
+            header, found = scanner.read_until(_TEXT_START)
+            if not found:
+                return
+
+            fields = {
+                name.decode(): value.strip().decode("latin-1")
+                for name, value in _header_re.findall(header)
+            }
+            document_type = fields.get("TYPE", "")
+            if types is not None and document_type.upper() not in types:
+                scanner.read_until(_DOCUMENT_END, keep=False)
+                continue
+
+            text, _ = scanner.read_until(_TEXT_END)
+            scanner.read_until(_DOCUMENT_END, keep=False)
+
+            # inline XBRL documents are wrapped in an <XBRL> tag
+            text = text.strip()
+            if text.startswith(_XBRL_START) and text.endswith(_XBRL_END):
+                text = text[len(_XBRL_START) : -len(_XBRL_END)].strip()
+
+            sequence = fields.get("SEQUENCE", "")
+            yield SubmissionDocument(
+                type=document_type,
+                sequence=int(sequence) if sequence.isdigit() else None,
+                filename=fields.get("FILENAME") or None,
+                description=fields.get("DESCRIPTION") or None,
+                text=text,
+            )
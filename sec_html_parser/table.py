@@ -0,0 +1,202 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+from bs4.element import Tag
+
+from sec_html_parser.serialize import node_text
+
+# cells that only hold the formatting of a number split over several cells,
+# e.g. <td>$</td><td>(1,234</td><td>)</td>
+_FORMATTING_CELLS = {"$", ")", "%", ")%"}
+
+# cells that stand for zero in financial statements
+_DASHES = {"-", "–", "—"}
+
+# the largest spans browsers honour, larger ones are clamped to them
+_MAX_SPANS = {"colspan": 1000, "rowspan": 65534}
+
+# a leading minus can be a hyphen or a Unicode minus sign, before or after "$"
+_number_re = re.compile(
+    r"^([-−]?)\(?\$?\s*([-−]?)\s*\(?([0-9][0-9,]*(?:\.[0-9]+)?|\.[0-9]+)"
+    r"\s*\)?\s*%?\)?$"
+)
+
+Value = Union[float, str, None]
+
+
+def has_text(tag: Tag) -> bool:
+    """Check if tag has any non-whitespace text, stopping at the first one"""
+
+    for string in tag.strings:
+        if string and not string.isspace():
+            return True
+
+    return False
+
+
+def parse_number(text: str) -> Optional[float]:
+    """
+    Parse a number as written in financial statements, or return None if
+    text isn't a number.
+
+    Parentheses make a number negative (an unclosed parenthesis too, since
+    the closing one is often in the next cell) as does a leading minus sign,
+    "$", "%" and thousands separators are ignored, and a lone dash stands
+    for zero.
+
+    Example:
+        ```python
+        assert parse_number("$ (1,234.5)") == -1234.5
+        assert parse_number("−1,234.5") == -1234.5
+        assert parse_number("12%") == 12
+        assert parse_number("—") == 0
+        ```
+    """
+
+    text = text.strip()
+    if text in _DASHES:
+        return 0.0
+
+    match = _number_re.match(text)
+    if match is None:
+        return None
+
+    minus, dollar_minus, digits = match.groups()
+    number = float(digits.replace(",", ""))
+    return -number if "(" in text or minus or dollar_minus else number
+
+
+@dataclass
+class Cell:
+    """A single td or th of a table"""
+
+    text: str
+    rowspan: int = 1
+    colspan: int = 1
+
+    @property
+    def value(self) -> Value:
+        """The cell's number if it is one, None if it is empty, else its text"""
+
+        if not self.text or self.text in _FORMATTING_CELLS:
+            return None
+
+        number = parse_number(self.text)
+        return self.text if number is None else number
+
+
+class Table:
+    """
+    Lazy view of a table in a hierarchy.
+
+    Nothing is extracted from the table's tag until it is accessed, and then
+    only once.
+
+    Example:
+        ```python
+        for table in Parser().iter_tables(Path("form.html")):
+            for column in table.columns():
+                ...
+        ```
+    """
+
+    __slots__ = ("tag", "_rows", "_grid")
+
+    def __init__(self, tag: Tag) -> None:
+        self.tag = tag
+        self._rows: Optional[List[List[Cell]]] = None
+        self._grid: Optional[List[List[Optional[Cell]]]] = None
+
+    @property
+    def rows(self) -> List[List[Cell]]:
+        """The cells of each row, as they are in the HTML"""
+
+        if self._rows is None:
+            self._rows = [
+                [
+                    Cell(
+                        node_text(cell),
+                        _span(cell, "rowspan"),
+                        _span(cell, "colspan"),
+                    )
+                    for cell in row.find_all(["td", "th"], recursive=False)
+                ]
+                for row in self.tag.find_all("tr")
+                if row.find_parent("table") is self.tag
+            ]
+
+        return self._rows
+
+    @property
+    def grid(self) -> List[List[Optional[Cell]]]:
+        """
+        The cells of each row, with a cell spanning several rows or columns
+        repeated in each of them, and None where a row has no cell.
+        All rows have the same length.
+        """
+
+        if self._grid is None:
+            grid: List[List[Optional[Cell]]] = []
+
+            # columns taken by cells from rows above: column -> (rows left, cell)
+            pending: Dict[int, Tuple[int, Cell]] = {}
+            for row in self.rows:
+                line: List[Optional[Cell]] = []
+                cells = iter(row)
+                cell = next(cells, None)
+                while cell is not None or (pending and len(line) <= max(pending)):
+                    column = len(line)
+                    if column in pending:
+                        left, above = pending.pop(column)
+                        if left > 1:
+                            pending[column] = (left - 1, above)
+                        line.append(above)
+                    elif cell is not None:
+                        for _ in range(cell.colspan):
+                            if cell.rowspan > 1:
+                                pending[len(line)] = (cell.rowspan - 1, cell)
+                            line.append(cell)
+                        cell = next(cells, None)
+                    else:
+                        line.append(None)
+
+                grid.append(line)
+
+            width = max((len(line) for line in grid), default=0)
+            self._grid = [line + [None] * (width - len(line)) for line in grid]
+
+        return self._grid
+
+    @property
+    def values(self) -> List[List[Value]]:
+        """The grid with the value (see `Cell.value`) of each cell"""
+
+        return [
+            [None if cell is None else cell.value for cell in line]
+            for line in self.grid
+        ]
+
+    def columns(self, drop_empty: bool = True) -> List[List[Value]]:
+        """
+        The values of the table by column. Columns without any value (e.g.
+        those only holding "$" signs) are dropped unless `drop_empty` is false.
+        """
+
+        columns = [list(column) for column in zip(*self.values)]
+        if drop_empty:
+            columns = [c for c in columns if any(v is not None for v in c)]
+
+        return columns
+
+    def __repr__(self) -> str:
+        return f"Table(rows={len(self.rows)})"
+
+
+def _span(cell: Tag, attribute: str) -> int:
+    try:
+        span = int(cell.get(attribute, 1))
+    except ValueError:
+        return 1
+
+    return min(max(1, span), _MAX_SPANS[attribute])
@@ -0,0 +1,54 @@
+"""
+Building blocks of the small 10-K like filings the tests parse.
+
+Every span is in 9pt, bold for headings, so that headings are ranked by
+their div's top margin: 18pt for parts, 12pt for items and 6pt for the
+paragraphs and tables under them.
+"""
+
+from typing import Optional
+
+
+def span(html: str, weight: int = 400, italic: bool = False) -> str:
+    style = "font-size:9pt;font-style:italic" if italic else "font-size:9pt"
+    return f'<span style="{style};font-weight:{weight}">{html}</span>'
+
+
+def div(*children: str, margin: Optional[int] = 6) -> str:
+    if margin is None:
+        return f"<div>{''.join(children)}</div>"
+
+    return f'<div style="margin-top:{margin}pt">{"".join(children)}</div>'
+
+
+def heading(text: str, margin: int = 18) -> str:
+    return div(span(text, weight=700), margin=margin)
+
+
+def paragraph(html: str) -> str:
+    return div(span(html))
+
+
+def table(*cells: str) -> str:
+    return div(f"<table><tr>{''.join(f'<td>{c}</td>' for c in cells)}</tr></table>")
+
+
+def divs(*lines: str) -> str:
+    return "\n".join(lines)
+
+
+def filing(*lines: str) -> str:
+    return f"<body>\n{divs(*lines)}\n</body>"
+
+
+# a part with a single paragraph, without a <body>
+SHORT_SOURCE = divs(heading("PART I"), paragraph("text"))
+
+# two parts, the first with an item holding a paragraph and a table
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1.", 12),
+    paragraph("text"),
+    table("cell"),
+    heading("PART II"),
+)
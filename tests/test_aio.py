@@ -0,0 +1,158 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from sec_html_parser import aio
+from sec_html_parser.aio import AsyncParser
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import hierarchy_to_data
+from tests.filings import filing, heading, paragraph
+
+FORM = "<html>" + filing(heading("Item {n}."), paragraph("text {n}")) + "</html>"
+
+
+class SlowParser(Parser):
+    """Parser that records how many targets it parses at once"""
+
+    def __init__(self, delay: float = 0.05) -> None:
+        super().__init__()
+        self.delay = delay
+        self.started = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def get_hierarchy(self, target):
+        with self._lock:
+            self.started += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        try:
+            time.sleep(self.delay)
+            if target == "fail":
+                raise ValueError("can't parse")
+            return super().get_hierarchy(target)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for n in range(6):
+        path = tmp_path / f"{n}.htm"
+        path.write_text(FORM.format(n=n))
+        paths.append(path)
+
+    return paths
+
+
+def test_aget_hierarchy(files):
+    expected = hierarchy_to_data(Parser().get_hierarchy(files[0]))
+
+    hierarchy = asyncio.run(AsyncParser().aget_hierarchy(files[0]))
+
+    assert hierarchy_to_data(hierarchy) == expected
+
+
+def test_aget_hierarchy_html_in_processes(files):
+    p = Parser()
+
+    async def run():
+        with ProcessPoolExecutor(2) as executor:
+            ap = AsyncParser(p, executor)
+            hierarchy = await ap.aget_hierarchy(files[0])
+            html = await ap.aget_hierarchy_html(files[0])
+            return hierarchy, html
+
+    hierarchy, html = asyncio.run(run())
+
+    assert html == p.get_hierarchy_html(files[0])
+    assert hierarchy_to_data(hierarchy) == hierarchy_to_data(p.get_hierarchy(files[0]))
+
+
+def test_hierarchy_from_processes_is_rebuilt_off_the_loop(files, monkeypatch):
+    threads = []
+    rebuild = aio.data_to_hierarchy
+
+    def data_to_hierarchy(data):
+        threads.append(threading.get_ident())
+        return rebuild(data)
+
+    async def run():
+        with ProcessPoolExecutor(1) as executor:
+            monkeypatch.setattr(aio, "data_to_hierarchy", data_to_hierarchy)
+            hierarchy = await AsyncParser(executor=executor).aget_hierarchy(files[0])
+            return hierarchy, threading.get_ident()
+
+    hierarchy, loop_thread = asyncio.run(run())
+
+    assert len(threads) == 1 and threads[0] != loop_thread
+    assert hierarchy_to_data(hierarchy) == hierarchy_to_data(
+        Parser().get_hierarchy(files[0])
+    )
+
+
+def test_amap_limits_concurrency(files):
+    parser = SlowParser()
+
+    async def run():
+        with ThreadPoolExecutor(8) as executor:
+            p = AsyncParser(parser, executor, limit=2)
+            return [target async for target, _ in p.amap(files)]
+
+    targets = asyncio.run(run())
+
+    assert sorted(targets) == sorted(files)
+    assert parser.max_running == 2
+
+
+def test_parser_on_several_event_loops(files):
+    p = AsyncParser(limit=1)
+
+    async def run():
+        # targets wait for each other on the limit
+        return await asyncio.gather(*(p.aget_hierarchy_html(f) for f in files))
+
+    assert asyncio.run(run()) == asyncio.run(run())
+
+
+def test_amap_errors():
+    parser = SlowParser(delay=0)
+
+    async def run(return_exceptions):
+        p = AsyncParser(parser, limit=1)
+        return [
+            result
+            async for _, result in p.amap(
+                ["fail", FORM.format(n=1)], return_exceptions=return_exceptions
+            )
+        ]
+
+    with pytest.raises(ValueError):
+        asyncio.run(run(False))
+
+    error, hierarchy = asyncio.run(run(True))
+    assert isinstance(error, ValueError)
+    assert list(hierarchy) == ["root"]
+
+
+def test_amap_closed_early_cancels_pending_targets(files):
+    parser = SlowParser()
+
+    async def run():
+        p = AsyncParser(parser, limit=2)
+        results = p.amap(files)
+        first = await results.__anext__()
+        await results.aclose()
+        return first
+
+    target, _ = asyncio.run(run())
+
+    assert target in files
+    assert parser.started < len(files)
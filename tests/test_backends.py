@@ -0,0 +1,45 @@
+import gzip
+
+import pytest
+from bs4.builder import builder_registry
+
+from benchmarks.backends import hierarchy_signature, read_markup
+from sec_html_parser import parser as parser_module
+from sec_html_parser.parser import BACKENDS, DEFAULT_BACKEND, Parser
+from tests.filings import filing, heading, paragraph, table
+
+SOURCE = filing(
+    heading("PART I"), heading("Item 1.", 12), paragraph("text"), table("cell")
+)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_are_equivalent(backend):
+    if builder_registry.lookup(backend) is None:
+        pytest.skip(f"backend '{backend}' is not installed")
+
+    p = Parser(backend=backend)
+    assert p.backend == backend
+
+    expected = hierarchy_signature(Parser(), Parser().get_hierarchy(SOURCE))
+    assert hierarchy_signature(p, p.get_hierarchy(SOURCE)) == expected
+
+
+def test_missing_backend_falls_back(monkeypatch):
+    monkeypatch.setattr(parser_module.builder_registry, "lookup", lambda _: None)
+
+    with pytest.warns(UserWarning):
+        p = Parser(backend="lxml")
+    assert p.backend == DEFAULT_BACKEND
+
+
+def test_unknown_backend_raises_value_error():
+    with pytest.raises(ValueError):
+        Parser(backend="unknown")
+
+
+def test_read_markup_decodes_like_the_parser(tmp_path):
+    target = tmp_path / "form.htm.gz"
+    target.write_bytes(gzip.compress("<span>caf\xe9 \u2014</span>".encode("cp1252")))
+
+    assert read_markup(target) == "<span>caf\xe9 \u2014</span>"
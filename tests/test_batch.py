@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from sec_html_parser.__main__ import main
+from sec_html_parser.batch import expand_targets, make_tasks, run_batch
+from tests.filings import SHORT_SOURCE
+
+GOOD = SHORT_SOURCE
+
+# a table before any span has no section to go in
+BAD = """<div><table><tr><td>orphan</td></tr></table></div>"""
+
+
+def _write_filings(root: Path) -> None:
+    (root / "2021").mkdir(parents=True)
+    (root / "2021" / "a.htm").write_text(GOOD)
+    (root / "2021" / "b.html").write_text(BAD)
+    (root / "2021" / "notes.txt").write_text("not a filing")
+    (root / "c.htm").write_text(GOOD)
+
+
+def test_expand_targets_directory(tmp_path):
+    _write_filings(tmp_path)
+    files = expand_targets([str(tmp_path)])
+    assert [relative for _, relative in files] == [
+        Path("2021/a.htm"),
+        Path("2021/b.html"),
+        Path("c.htm"),
+    ]
+
+
+def test_expand_targets_glob(tmp_path):
+    _write_filings(tmp_path)
+    files = expand_targets([str(tmp_path / "**" / "*.htm")])
+    assert sorted(relative for _, relative in files) == [
+        Path("2021/a.htm"),
+        Path("c.htm"),
+    ]
+
+
+def test_make_tasks_same_name_in_different_directories(tmp_path):
+    for year in ("2020", "2021"):
+        (tmp_path / "in" / year).mkdir(parents=True)
+        (tmp_path / "in" / year / "form.htm").write_text(GOOD)
+
+    tasks = make_tasks([str(tmp_path / "in" / "*" / "form.htm")], tmp_path / "out")
+    assert [task.output for task in tasks] == [
+        tmp_path / "out" / "2020" / "form.html",
+        tmp_path / "out" / "2021" / "form.html",
+    ]
+
+    with pytest.raises(ValueError):
+        make_tasks(
+            [str(tmp_path / "in" / year / "form.htm") for year in ("2020", "2021")],
+            tmp_path / "out",
+        )
+
+    result = CliRunner().invoke(
+        main,
+        [
+            str(tmp_path / "in" / "2020" / "form.htm"),
+            str(tmp_path / "in" / "2021" / "form.htm"),
+            "-o",
+            str(tmp_path / "out"),
+        ],
+    )
+    assert result.exit_code == 2
+
+
+def test_make_tasks_overlapping_targets(tmp_path):
+    _write_filings(tmp_path / "in")
+
+    tasks = make_tasks(
+        [
+            str(tmp_path / "in"),
+            str(tmp_path / "in" / "*.htm"),
+            str(tmp_path / "in" / "2021" / "a.htm"),
+            str(tmp_path / "in" / "c.htm"),
+        ],
+        tmp_path / "out",
+    )
+    assert [task.output for task in tasks] == [
+        tmp_path / "out" / "2021" / "a.html",
+        tmp_path / "out" / "2021" / "b.html",
+        tmp_path / "out" / "c.html",
+    ]
+
+
+def test_run_batch_isolates_errors(tmp_path):
+    _write_filings(tmp_path)
+    tasks = make_tasks([str(tmp_path)], tmp_path / "out")
+
+    results = list(run_batch(tasks))
+    assert [r.error is None for r in results] == [True, False, True]
+    assert (tmp_path / "out" / "2021" / "a.html").exists()
+    assert not (tmp_path / "out" / "2021" / "b.html").exists()
+
+
+def test_run_batch_process_pool(tmp_path):
+    _write_filings(tmp_path)
+    tasks = make_tasks([str(tmp_path)], tmp_path / "out")
+
+    pooled = list(run_batch(tasks, jobs=2, chunksize=2))
+    assert [r.target for r in pooled] == [str(t.target) for t in tasks]
+    assert [r.error is None for r in pooled] == [True, False, True]
+
+
+def test_cli_batch_writes_manifest(tmp_path):
+    _write_filings(tmp_path)
+    out = tmp_path / "out"
+
+    result = CliRunner().invoke(main, [str(tmp_path), "-o", str(out), "--jobs", "2"])
+    assert result.exit_code == 1
+
+    lines = [
+        json.loads(line) for line in (out / "manifest.jsonl").read_text().splitlines()
+    ]
+    assert len(lines) == 3
+    assert sum(line["error"] is not None for line in lines) == 1
+
+
+def test_cli_single_file(tmp_path):
+    target = tmp_path / "a.htm"
+    target.write_text(GOOD)
+
+    result = CliRunner().invoke(main, [str(target)])
+    assert result.exit_code == 0
+    assert "PART I" in result.output
+
+
+def test_cli_json_format(tmp_path):
+    target = tmp_path / "a.htm"
+    target.write_text(GOOD)
+
+    result = CliRunner().invoke(main, [str(target), "--format", "json"])
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {"root": [{"PART I": ["text"]}]}
@@ -0,0 +1,99 @@
+from click.testing import CliRunner
+
+from benchmarks.generator import FilingSpec, generate_filing
+from benchmarks.import_time import check_imports, measure_import
+from benchmarks.runner import (
+    Measurement,
+    find_regressions,
+    load_results,
+    load_spec,
+    main,
+    run_suite,
+    save_results,
+    scaling_exponent,
+)
+from sec_html_parser.parser import Parser
+
+
+def test_generate_filing_is_deterministic():
+    spec = FilingSpec(spans=200, seed=3)
+
+    assert generate_filing(spec) == generate_filing(spec)
+    assert generate_filing(spec) != generate_filing(FilingSpec(spans=200, seed=4))
+
+
+def test_generate_filing_shape():
+    p = Parser()
+    # two paragraph styles of the same size, so paragraphs are never nested
+    spec = FilingSpec(spans=300, heading_levels=3, style_variety=2, table_density=0.2)
+
+    hierarchy = p.get_hierarchy(generate_filing(spec))
+    nodes = list(p._walk_hierarchy_nodes(hierarchy))
+
+    spans = [(depth, node) for _, depth, node in nodes if node.name == "span"]
+    assert len(spans) == 300
+    assert max(depth for depth, _ in spans) == 4
+    assert any(node.name == "table" for _, _, node in nodes)
+
+
+def test_run_suite(tmp_path):
+    results = run_suite([20, 40], entries=["get_hierarchy"], repeat=1)
+
+    assert set(results) == {"get_hierarchy"}
+    assert set(results["get_hierarchy"]) == {20, 40}
+    assert all(m.peak_bytes > 0 for m in results["get_hierarchy"].values())
+
+    path = tmp_path / "baseline.json"
+    save_results(results, path, FilingSpec(table_density=0.5))
+    assert load_results(path) == results
+    assert load_spec(path) == FilingSpec(table_density=0.5)
+
+
+def test_baseline_of_another_spec_is_not_compared(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    args = ["--sizes", "20", "--entry", "get_hierarchy", "--repeat", "1"]
+    args += ["--baseline", str(baseline)]
+
+    result = CliRunner().invoke(main, [*args, "--save-baseline"])
+    assert result.exit_code == 0
+    assert load_spec(baseline) == FilingSpec()
+
+    result = CliRunner().invoke(main, [*args, "--table-density", "0.5"])
+    assert result.exit_code == 2
+    assert "another shape" in result.output
+
+
+def test_scaling_exponent():
+    assert scaling_exponent({100: Measurement(1.0, 0)}) is None
+
+    linear = {100: Measurement(1.0, 0), 400: Measurement(4.0, 0)}
+    quadratic = {100: Measurement(1.0, 0), 400: Measurement(16.0, 0)}
+    assert round(scaling_exponent(linear), 6) == 1
+    assert round(scaling_exponent(quadratic), 6) == 2
+
+
+def test_find_regressions():
+    baseline = {"get_hierarchy": {100: Measurement(1.0, 1000)}}
+
+    assert (
+        find_regressions({"get_hierarchy": {100: Measurement(1.2, 1000)}}, baseline)
+        == []
+    )
+    assert find_regressions({"other": {100: Measurement(9.0, 9000)}}, baseline) == []
+
+    regressions = find_regressions(
+        {"get_hierarchy": {100: Measurement(2.0, 2000)}}, baseline
+    )
+    assert len(regressions) == 2
+
+
+def test_forbidden_imports():
+    # import times depend on the machine, they are only checked by running
+    # `python -m benchmarks.import_time`
+    assert check_imports(repeat=1, timing=False) == []
+
+
+def test_measure_import_sees_nested_imports():
+    measured = measure_import("sec_html_parser.parser", repeat=1)
+    assert "bs4" in measured.modules
+    assert measured.seconds > 0
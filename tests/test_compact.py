@@ -0,0 +1,54 @@
+import pytest
+
+from sec_html_parser.compact import KIND_SPAN, KIND_TABLE, CompactHierarchy
+from sec_html_parser.parser import Parser
+from tests.filings import filing, heading, paragraph, table
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1.", 12),
+    paragraph("The   Company"),
+    table("cell"),
+    heading("PART II"),
+    paragraph("more"),
+)
+
+
+def test_compact_hierarchy_arrays():
+    compact = Parser().get_compact_hierarchy(SOURCE)
+
+    assert len(compact) == 6
+    assert list(compact.parents) == [-1, 0, 1, 2, -1, 4]
+    assert list(compact.depths) == [1, 2, 3, 4, 1, 2]
+    assert list(compact.ends) == [4, 4, 4, 4, 6, 6]
+    assert compact[3].kind == KIND_TABLE
+    assert compact[2].kind == KIND_SPAN
+
+
+def test_compact_node_views():
+    compact = Parser().get_compact_hierarchy(SOURCE)
+
+    assert [node.text for node in compact.roots()] == ["PART I", "PART II"]
+    assert compact[2].text == "The Company"
+    assert compact[2].html == (
+        '<span style="font-size:9pt;font-weight:400">The   Company</span>'
+    )
+    assert [node.text for node in compact[0].children] == ["Item 1."]
+    assert compact[1].parent == compact[0]
+    assert compact[0].parent is None
+    assert compact[-1].is_leaf
+    assert not compact[0].is_leaf
+
+    with pytest.raises(IndexError):
+        compact[6]
+
+
+def test_compact_hierarchy_round_trip():
+    hierarchy = Parser().get_hierarchy(SOURCE)
+    assert CompactHierarchy.from_hierarchy(hierarchy).to_dict() == hierarchy
+
+
+def test_compact_hierarchy_empty():
+    compact = CompactHierarchy.from_hierarchy({"root": []})
+    assert len(compact) == 0
+    assert compact.to_dict() == {"root": []}
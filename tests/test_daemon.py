@@ -0,0 +1,175 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from sec_html_parser import client
+from sec_html_parser.client import DaemonError, ParseClient, connect
+from sec_html_parser.daemon import ParseDaemon
+from tests.filings import filing, heading, paragraph
+
+SOURCE = filing(heading("PART I"), paragraph("text"))
+
+
+def _serve(**options):
+    # Unix socket paths are limited to about 100 characters
+    address = os.path.join(tempfile.mkdtemp(), "d.sock")
+    daemon = ParseDaemon(address, **options)
+    thread = threading.Thread(target=daemon.run)
+    thread.start()
+
+    deadline = time.monotonic() + 30
+    while True:
+        try:
+            connect(address).close()
+            break
+        except OSError:
+            if time.monotonic() > deadline or not thread.is_alive():
+                raise
+            time.sleep(0.05)
+
+    return daemon, thread
+
+
+@pytest.fixture(scope="module")
+def daemon():
+    daemon, thread = _serve(workers=2, queue_size=8)
+    yield daemon
+    daemon.stop()
+    thread.join()
+    assert not os.path.exists(daemon.address)
+
+
+def test_parse(daemon, tmp_path):
+    (tmp_path / "a.htm").write_text(SOURCE)
+    c = ParseClient(daemon.address)
+
+    html = c.parse(tmp_path / "a.htm")
+    assert "<h1>" in html and "PART I" in html
+
+    data = json.loads(c.parse(tmp_path / "a.htm", format="json"))
+    assert data == {"root": [{"PART I": ["text"]}]}
+
+    assert c.parse(tmp_path / "a.htm", tmp_path / "out" / "a.html") == ""
+    assert (tmp_path / "out" / "a.html").read_text().strip() == html.strip()
+
+
+def test_errors(daemon, tmp_path):
+    c = ParseClient(daemon.address)
+
+    with pytest.raises(DaemonError, match="FileNotFoundError"):
+        c.parse(tmp_path / "missing.htm")
+
+    with pytest.raises(DaemonError, match="Invalid request"):
+        c.parse(tmp_path / "missing.htm", format="xml")
+
+    with connect(daemon.address) as sock, sock.makefile("rwb") as f:
+        f.write(b"not json\n")
+        f.flush()
+        assert "error" in json.loads(f.readline())
+
+
+def test_many_requests(daemon, tmp_path):
+    for i in range(20):
+        (tmp_path / f"{i}.htm").write_text(SOURCE.replace("text", f"text {i}"))
+
+    responses = ParseClient(daemon.address).request(
+        [{"target": str(tmp_path / f"{i}.htm"), "format": "json"} for i in range(20)],
+        window=8,
+    )
+
+    assert [json.loads(r["output"])["root"][0]["PART I"] for r in responses] == [
+        [f"text {i}"] for i in range(20)
+    ]
+
+
+def test_queue_size(daemon, tmp_path):
+    (tmp_path / "a.htm").write_text(SOURCE)
+
+    responses = ParseClient(daemon.address).request(
+        [{"target": str(tmp_path / "a.htm")}] * 30, window=30
+    )
+
+    busy = [r for r in responses if "busy" in r.get("error", "")]
+    assert busy and len(busy) < 30
+
+
+def test_timeout(tmp_path):
+    # big enough to take longer than the timeout to parse
+    (tmp_path / "big.htm").write_text(
+        "<body>" + SOURCE.replace("<body>", "").replace("</body>", "") * 20000
+    )
+    daemon, thread = _serve(workers=1, timeout=0.01)
+    try:
+        with pytest.raises(DaemonError, match="TimeoutError"):
+            ParseClient(daemon.address).parse(tmp_path / "big.htm")
+
+        # the worker is still usable
+        (tmp_path / "a.htm").write_text(SOURCE)
+        assert "PART I" in ParseClient(daemon.address).parse(tmp_path / "a.htm")
+    finally:
+        daemon.stop()
+        thread.join()
+
+
+def test_client_main(daemon, tmp_path, capsys):
+    for name in ("a.htm", "b.htm"):
+        (tmp_path / name).write_text(SOURCE)
+
+    args = ["--address", daemon.address, "-f", "json"]
+    assert client.main([str(tmp_path / "a.htm"), *args]) == 0
+    assert json.loads(capsys.readouterr().out) == {"root": [{"PART I": ["text"]}]}
+
+    out = tmp_path / "out"
+    targets = [str(tmp_path / "a.htm"), str(tmp_path / "b.htm")]
+    assert client.main([*targets, "-o", str(out), *args]) == 0
+    assert sorted(p.name for p in out.iterdir()) == ["a.json", "b.json"]
+
+    # a file given twice is parsed once
+    assert client.main([*targets, targets[0], "-o", str(out), *args]) == 0
+
+    assert client.main([str(tmp_path / "missing.htm"), *args]) == 1
+    assert "missing.htm" in capsys.readouterr().err
+
+
+def test_client_usage_errors(tmp_path):
+    for year in ("2020", "2021"):
+        (tmp_path / year).mkdir()
+        (tmp_path / year / "form.htm").write_text(SOURCE)
+
+    target = str(tmp_path / "2020" / "form.htm")
+    with pytest.raises(SystemExit) as e:
+        client.main([target, "--html-layout", "prety"])
+    assert e.value.code == 2
+
+    # both would be written to out/form.html
+    targets = [target, str(tmp_path / "2021" / "form.htm")]
+    with pytest.raises(SystemExit) as e:
+        client.main([*targets, "-o", str(tmp_path / "out")])
+    assert e.value.code == 2
+    assert not (tmp_path / "out").exists()
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        ParseDaemon(workers=0)
+    with pytest.raises(ValueError):
+        ParseDaemon(timeout=0)
+
+
+@pytest.mark.parametrize(
+    "address", ["0.0.0.0:8000", "192.168.1.2:8000", "example.com:80"]
+)
+def test_remote_address_rejected(address):
+    with pytest.raises(ValueError):
+        ParseDaemon(address)
+
+    assert ParseDaemon(address, allow_remote=True).address == address
+
+
+@pytest.mark.parametrize("address", ["localhost:8000", "127.0.0.1:8000", "[::1]:8000"])
+def test_loopback_address_accepted(address):
+    assert ParseDaemon(address).address == address
@@ -0,0 +1,136 @@
+import pytest
+
+from sec_html_parser.diff import (
+    ADDED,
+    CHANGED,
+    REMOVED,
+    diff_hierarchies,
+    hash_hierarchy,
+)
+from sec_html_parser.parser import Parser
+
+HEADING = '<div style="margin-top:{margin}pt"><span style="font-size:9pt;font-weight:700">{text}</span></div>'
+TEXT = '<div style="margin-top:6pt"><span style="font-size:9pt;font-weight:400">{text}</span></div>'
+
+
+def _filing(sections):
+    """Make a filing from {part: {item: [paragraphs]}}"""
+
+    divs = []
+    for part, items in sections.items():
+        divs.append(HEADING.format(margin=18, text=part))
+        for item, paragraphs in items.items():
+            divs.append(HEADING.format(margin=12, text=item))
+            divs += [TEXT.format(text=text) for text in paragraphs]
+
+    return "<body>" + "\n".join(divs) + "</body>"
+
+
+SECTIONS = {
+    "PART I": {"Item 1.": ["business"], "Item 1A.": ["risk a", "risk b"]},
+    "PART II": {"Item 7.": ["results"], "Item 8.": ["statements"]},
+}
+
+
+def _diff(old, new):
+    p = Parser()
+    return [
+        (change.kind, change.path)
+        for change in p.get_hierarchy_diff(_filing(old), _filing(new))
+    ]
+
+
+def test_hash_hierarchy():
+    p = Parser()
+    a = hash_hierarchy(p.get_hierarchy(_filing(SECTIONS)))
+    b = hash_hierarchy(p.get_hierarchy(_filing(SECTIONS)))
+
+    assert a.digest == b.digest
+    assert [child.text for child in a.children] == ["PART I", "PART II"]
+    assert [child.digest for child in a.children] == [
+        child.digest for child in b.children
+    ]
+
+
+def test_diff_identical():
+    assert _diff(SECTIONS, SECTIONS) == []
+
+
+def test_diff_changed_paragraph():
+    new = {**SECTIONS, "PART I": {**SECTIONS["PART I"], "Item 1A.": ["risk a"]}}
+
+    assert _diff(SECTIONS, new) == [(CHANGED, ["PART I", "Item 1A."])]
+
+
+def test_diff_added_and_removed_sections():
+    new = {
+        "PART I": {"Item 1.": ["business"], "Item 1C.": ["cybersecurity"]},
+        "PART II": SECTIONS["PART II"],
+    }
+
+    assert _diff(SECTIONS, new) == [
+        (REMOVED, ["PART I", "Item 1A."]),
+        (ADDED, ["PART I", "Item 1C."]),
+    ]
+
+
+def test_diff_moved_section_is_not_changed():
+    new = {
+        "PART I": {"Item 1A.": ["risk a", "risk b"], "Item 1.": ["business"]},
+        "PART II": SECTIONS["PART II"],
+    }
+
+    assert _diff(SECTIONS, new) == []
+
+
+def test_diff_order():
+    new = {
+        "PART I": {"Item 1.": ["business", "more"], "Item 1A.": ["risk a"]},
+        "PART II": {"Item 7.": ["results"]},
+    }
+
+    assert _diff(SECTIONS, new) == [
+        (CHANGED, ["PART I", "Item 1."]),
+        (CHANGED, ["PART I", "Item 1A."]),
+        (REMOVED, ["PART II", "Item 8."]),
+    ]
+
+
+def test_diff_repeated_identical_children():
+    old = {"PART I": {"Item 1.": ["spacer"] * 2000 + ["risk a"]}}
+    new = {"PART I": {"Item 1.": ["spacer"] * 1999 + ["risk a", "spacer"]}}
+
+    assert _diff(old, old) == []
+    assert _diff(old, new) == []
+    assert _diff(old, {"PART I": {"Item 1.": ["spacer"] * 1000 + ["risk a"]}}) == [
+        (CHANGED, ["PART I", "Item 1."])
+    ]
+
+
+def test_diff_skips_identical_subtrees():
+    p = Parser()
+    changed = {**SECTIONS, "PART I": {**SECTIONS["PART I"], "Item 1A.": ["risk a"]}}
+    old = hash_hierarchy(p.get_hierarchy(_filing(SECTIONS)))
+    new = hash_hierarchy(p.get_hierarchy(_filing(changed)))
+
+    # identical subtrees are never compared child by child, so emptying them
+    # after hashing doesn't change the diff
+    old.children[1].children.clear()
+    new.children[1].children.clear()
+
+    changes = diff_hierarchies(old, new)
+    assert [(change.kind, change.path) for change in changes] == [
+        (CHANGED, ["PART I", "Item 1A."])
+    ]
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_diff_engines(engine):
+    new = {**SECTIONS, "PART III": {"Item 10.": ["directors"]}}
+    p = Parser(engine=engine)
+
+    changes = p.get_hierarchy_diff(_filing(SECTIONS), _filing(new))
+
+    assert [(change.kind, change.path) for change in changes] == [(ADDED, ["PART III"])]
+    assert changes[0].old is None
+    assert changes[0].new.node.name == "span"
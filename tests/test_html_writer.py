@@ -0,0 +1,65 @@
+import io
+
+import pytest
+from bs4 import BeautifulSoup
+
+from sec_html_parser.html_writer import write_hierarchy_html
+from sec_html_parser.parser import Parser
+from tests.filings import filing, heading, paragraph, table
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1. A &amp; B", 12),
+    paragraph("The <b>Company</b><br>designs&nbsp;products"),
+    table("cell", " "),
+    heading("PART II"),
+)
+
+
+def _write(layout: str) -> str:
+    p = Parser()
+    fp = io.StringIO()
+    hierarchy = p.get_hierarchy(SOURCE)
+    write_hierarchy_html(p._walk_hierarchy_nodes(hierarchy), fp, layout)
+    return fp.getvalue()
+
+
+def test_pretty_layout_matches_prettify():
+    p = Parser()
+    html = "<html>"
+    for leaf, depth, node in p._walk_hierarchy_nodes(p.get_hierarchy(SOURCE)):
+        html += f"<p>{node}</p>" if leaf else f"<h{depth}>{node}</h{depth}>"
+    html += "</html>"
+
+    assert _write("pretty") == BeautifulSoup(html, features="html.parser").prettify()
+
+
+def test_indent_layout():
+    lines = _write("indent").splitlines()
+    assert lines[0] == "<html>"
+    assert lines[1] == (
+        ' <h1><span style="font-size:9pt;font-weight:700">PART I</span></h1>'
+    )
+    assert lines[-1] == "</html>"
+    assert len(lines) == 7
+
+
+def test_compact_layout():
+    assert "\n" not in _write("compact")
+
+
+def test_empty_hierarchy():
+    fp = io.StringIO()
+    write_hierarchy_html([], fp)
+    assert fp.getvalue() == BeautifulSoup("<html></html>", "html.parser").prettify()
+
+
+def test_unknown_layout_raises_value_error():
+    with pytest.raises(ValueError):
+        write_hierarchy_html([], io.StringIO(), "unknown")
+
+
+def test_parser_write_hierarchy_html():
+    fp = io.StringIO()
+    Parser().write_hierarchy_html(SOURCE, fp)
+    assert fp.getvalue() == Parser().get_hierarchy_html(SOURCE)
@@ -0,0 +1,43 @@
+import io
+import json
+
+import pytest
+
+from sec_html_parser.json_writer import write_hierarchy_json
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import hierarchy_to_data
+from tests.filings import filing, heading, paragraph
+
+SOURCE = filing(
+    heading("PART I"),
+    heading('Item 1. "Business"', 12),
+    paragraph("The Company"),
+    paragraph("designs"),
+    heading("PART II"),
+)
+
+
+@pytest.mark.parametrize("text", [True, False])
+def test_write_hierarchy_json_matches_json_dump(text):
+    hierarchy = Parser().get_hierarchy(SOURCE)
+    fp = io.StringIO()
+    write_hierarchy_json(hierarchy, fp, text=text)
+
+    assert fp.getvalue() == json.dumps(hierarchy_to_data(hierarchy, text=text))
+
+
+def test_write_hierarchy_json_empty():
+    fp = io.StringIO()
+    write_hierarchy_json({"root": []}, fp)
+    assert json.loads(fp.getvalue()) == {"root": []}
+
+
+def test_parser_write_hierarchy_json():
+    fp = io.StringIO()
+    Parser().write_hierarchy_json(SOURCE, fp)
+    assert json.loads(fp.getvalue()) == {
+        "root": [
+            {"PART I": [{'Item 1. "Business"': ["The Company", "designs"]}]},
+            "PART II",
+        ]
+    }
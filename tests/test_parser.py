@@ -1,7 +1,10 @@
+from typing import Union
+
 import pytest
 from bs4 import BeautifulSoup, Tag
 
 from sec_html_parser.parser import Parser
+from sec_html_parser.style_rank import is_div_key_child, is_span_key_child
 
 
 def _node(text: str) -> Tag:
@@ -9,13 +12,30 @@ def _node(text: str) -> Tag:
     return list(BeautifulSoup(text, features="html.parser").children)[0]
 
 
+def _style(node: Union[str, Tag]) -> str:
+    """Get the style string of a node, or the string itself"""
+    return node if isinstance(node, str) else node.get("style")
+
+
+def _is_span_child(p: Parser, node: Tag, other: Tag) -> bool:
+    """Check if node is a child of other with respect to p's span rules"""
+    keys = p.style_rules.compile()
+    return is_span_key_child(keys.span_key(_style(node)), keys.span_key(_style(other)))
+
+
+def _is_div_child(p: Parser, node: Tag, other: Tag) -> bool:
+    """Check if node is a child of other with respect to p's div rules"""
+    keys = p.style_rules.compile()
+    return is_div_key_child(keys.div_key(_style(node)), keys.div_key(_style(other)))
+
+
 def test_is_child_size_larger():
     child = _node('<span style="font-size:9pt"/>')
     parent = _node('<span style="font-size:10pt"/>')
 
     p = Parser()
-    assert p._is_span_child(child, parent)
-    assert not p._is_span_child(parent, child)
+    assert _is_span_child(p, child, parent)
+    assert not _is_span_child(p, parent, child)
 
 
 def test_is_child_size_equal():
@@ -23,8 +43,8 @@ def test_is_child_size_equal():
     sibling2 = _node('<span style="font-size:10pt"/>')
 
     p = Parser()
-    assert not p._is_span_child(sibling1, sibling2)
-    assert not p._is_span_child(sibling2, sibling1)
+    assert not _is_span_child(p, sibling1, sibling2)
+    assert not _is_span_child(p, sibling2, sibling1)
 
 
 def test_is_child_size_equal_weight_larger():
@@ -32,8 +52,8 @@ def test_is_child_size_equal_weight_larger():
     parent = _node('<span style="font-size:10pt;font-weight:700"')
 
     p = Parser()
-    assert p._is_span_child(child, parent)
-    assert not p._is_span_child(parent, child)
+    assert _is_span_child(p, child, parent)
+    assert not _is_span_child(p, parent, child)
 
 
 def test_is_child_size_equal_weight_equal():
@@ -41,8 +61,8 @@ def test_is_child_size_equal_weight_equal():
     sibling2 = _node('<span style="font-size:10pt;font-weight:400"')
 
     p = Parser()
-    assert not p._is_span_child(sibling1, sibling2)
-    assert not p._is_span_child(sibling2, sibling1)
+    assert not _is_span_child(p, sibling1, sibling2)
+    assert not _is_span_child(p, sibling2, sibling1)
 
 
 def test_is_child_size_equal_weight_equal_style_italic():
@@ -54,8 +74,8 @@ def test_is_child_size_equal_weight_equal_style_italic():
     )
 
     p = Parser()
-    assert p._is_span_child(child, parent)
-    assert not p._is_span_child(parent, child)
+    assert _is_span_child(p, child, parent)
+    assert not _is_span_child(p, parent, child)
 
 
 def test_is_child_size_equal_weight_equal_style_equal():
@@ -67,8 +87,8 @@ def test_is_child_size_equal_weight_equal_style_equal():
     )
 
     p = Parser()
-    assert not p._is_span_child(sibling1, sibling2)
-    assert not p._is_span_child(sibling2, sibling1)
+    assert not _is_span_child(p, sibling1, sibling2)
+    assert not _is_span_child(p, sibling2, sibling1)
 
 
 def test_is_child_relative_text_is_not_child():
@@ -80,8 +100,8 @@ def test_is_child_relative_text_is_not_child():
     )
 
     p = Parser()
-    assert not p._is_span_child(sibling1, sibling2)
-    assert not p._is_span_child(sibling2, sibling1)
+    assert not _is_span_child(p, sibling1, sibling2)
+    assert not _is_span_child(p, sibling2, sibling1)
 
 
 def test_is_child_descending_priority_order():
@@ -92,8 +112,8 @@ def test_is_child_descending_priority_order():
         """<span style="color:#000000;font-family:'Helvetica',sans-serif;font-size:9pt;font-weight:700;line-height:120%">PART I</span>"""
     )
     p = Parser()
-    assert p._is_span_child(child, parent)
-    assert not p._is_span_child(parent, child)
+    assert _is_span_child(p, child, parent)
+    assert not _is_span_child(p, parent, child)
 
 
 def test_is_div_child():
@@ -105,8 +125,8 @@ def test_is_div_child():
     )
 
     p = Parser()
-    assert p._is_div_child(child, parent)
-    assert not p._is_div_child(parent, child)
+    assert _is_div_child(p, child, parent)
+    assert not _is_div_child(p, parent, child)
 
 
 def test_walk_soup():
@@ -413,3 +433,42 @@ def test_get_hierarchy_html():
     extracted_html = p.get_hierarchy_html(source)
 
     assert extracted_html == expected_html
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_get_hierarchy_deeply_nested(engine):
+    # deeper than the recursion limit, both in the document and the hierarchy
+    depth = 3000
+    sizes = [f"{depth - i / 10}" for i in range(depth)]
+    target = (
+        "<body>"
+        + "<div>" * depth
+        + "".join(
+            f'<div style="margin-top:6pt"><span style="font-size:{size}pt">{size}</span></div>'
+            for size in sizes
+        )
+        + "</div>" * depth
+        + "</body>"
+    )
+
+    p = Parser(engine=engine)
+    nodes = list(p._walk_hierarchy_nodes(p.get_hierarchy(target)))
+
+    assert [node.text for _, _, node in nodes] == sizes
+    assert [depth for _, depth, _ in nodes] == list(range(1, depth + 1))
+    assert [leaf for leaf, _, _ in nodes] == [False] * (depth - 1) + [True]
+
+
+def test_get_hierarchy_leaves_are_elements():
+    target = """<body>
+<div style="margin-top:18pt"><span style="font-size:9pt;font-weight:700">PART I</span></div>
+<div style="margin-top:6pt"><span style="font-size:9pt;font-weight:400">text</span></div>
+<div style="margin-top:18pt"><span style="font-size:9pt;font-weight:700">PART II</span></div>
+</body>"""
+
+    hierarchy = Parser().get_hierarchy(target)
+
+    (part_1, text), part_2 = hierarchy["root"][0].popitem(), hierarchy["root"][1]
+    assert part_1.text == "PART I"
+    assert [node.text for node in text] == ["text"]
+    assert isinstance(part_2, Tag) and part_2.text == "PART II"
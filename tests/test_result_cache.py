@@ -0,0 +1,60 @@
+import pytest
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.result_cache import ResultCache
+from tests.filings import SHORT_SOURCE
+
+SOURCE = SHORT_SOURCE
+
+
+def test_result_cache_get_put(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = cache.key(b"data", "html", {})
+    assert cache.get(key) is None
+
+    cache.put(key, "result")
+    assert cache.get(key) == "result"
+    assert ResultCache(tmp_path).get(key) == "result"
+
+
+def test_result_cache_key_covers_options():
+    cache = ResultCache("unused")
+    key = cache.key(b"data", "html", {"engine": "soup"})
+    assert key != cache.key(b"data", "html", {"engine": "stream"})
+    assert key != cache.key(b"data", "hierarchy", {"engine": "soup"})
+    assert key != cache.key(b"other", "html", {"engine": "soup"})
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=10)
+    keys = [cache.key(str(i).encode(), "html", {}) for i in range(3)]
+
+    cache.put(keys[0], "aaaa")
+    cache.put(keys[1], "bbbb")
+    cache.put(keys[2], "cccc")
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[1]) == "bbbb"
+    assert cache.get(keys[2]) == "cccc"
+
+
+def test_result_cache_invalid_max_bytes(tmp_path):
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path, max_bytes=0)
+
+
+def test_parser_serves_cached_results(tmp_path, monkeypatch):
+    path = tmp_path / "form.htm"
+    path.write_text(SOURCE)
+    p = Parser(cache=ResultCache(tmp_path / "cache"))
+
+    html = p.get_hierarchy_html(path)
+    hierarchy = p.get_hierarchy(path)
+
+    def fail(*_):
+        raise AssertionError("cached result was parsed again")
+
+    monkeypatch.setattr(Parser, "_get_uncached_hierarchy", fail)
+    assert p.get_hierarchy_html(path) == html
+    assert p.get_hierarchy(path) == hierarchy
+    assert p.get_hierarchy(SOURCE) == hierarchy
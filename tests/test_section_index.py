@@ -0,0 +1,137 @@
+import codecs
+import gzip
+
+import pytest
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.section_index import SectionIndex, sidecar_path
+from tests.filings import div, filing, heading, paragraph, span, table
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1. Business", 12),
+    paragraph("The Company – désigns"),
+    heading("Item 1A.   Risk Factors", 12),
+    div(span("risk one"), span("risk two", italic=True)),
+    paragraph("risk three"),
+    table("cell"),
+    heading("PART II"),
+    heading("Item 7.", 12),
+    paragraph("md&amp;a"),
+)
+
+
+@pytest.fixture
+def source(tmp_path):
+    path = tmp_path / "form.htm"
+    path.write_bytes(SOURCE.encode("utf-8"))
+    return path
+
+
+def test_build_section_index(source):
+    index = Parser().build_section_index(source, save=False)
+
+    paths = [entry.path for entry in index.entries]
+    assert paths == [
+        ["PART I"],
+        ["PART I", "Item 1. Business"],
+        ["PART I", "Item 1A. Risk Factors"],
+        ["PART I", "Item 1A. Risk Factors", "risk two"],
+        ["PART I", "Item 1A. Risk Factors", "risk two", "risk three"],
+        ["PART II"],
+        ["PART II", "Item 7."],
+    ]
+    assert index.find(["PART I", "Item 1A.  Risk Factors"]).size == 5
+
+    with pytest.raises(KeyError):
+        index.find(["PART III"])
+
+
+@pytest.mark.parametrize(
+    "heading_path",
+    [
+        ["PART I"],
+        ["PART I", "Item 1. Business"],
+        ["PART I", "Item 1A. Risk Factors"],
+        ["PART I", "Item 1A. Risk Factors", "risk two"],
+        ["PART I", "Item 1A. Risk Factors", "risk two", "risk three"],
+        ["PART II", "Item 7."],
+    ],
+)
+def test_get_section_hierarchy_matches_full_parse(source, heading_path):
+    p = Parser()
+
+    # find the section in the full hierarchy
+    children = p.get_hierarchy(source)["root"]
+    for heading in heading_path:
+        section = next(
+            child
+            for child in children
+            if isinstance(child, dict)
+            and " ".join(list(child)[0].text.split()) == heading
+        )
+        children = list(section.values())[0]
+
+    assert p.get_section_hierarchy(source, heading_path) == {"root": [section]}
+
+
+def test_sidecar_index_is_reused_and_refreshed(source):
+    p = Parser()
+    p.get_section_hierarchy(source, ["PART II"])
+    sidecar = sidecar_path(source)
+    assert sidecar.exists()
+
+    index = SectionIndex.load(sidecar)
+    assert index.is_fresh(source)
+
+    source.write_text(SOURCE.replace("PART II", "PART 2"), encoding="utf-8")
+    assert not index.is_fresh(source)
+    hierarchy = p.get_section_hierarchy(source, ["PART 2"])
+    assert list(hierarchy["root"][0])[0].text == "PART 2"
+
+
+def test_sidecar_index_is_optional(source, monkeypatch):
+    p = Parser()
+    sidecar = sidecar_path(source)
+
+    hierarchy = p.get_section_hierarchy(source, ["PART II"], save=False)
+    assert list(hierarchy["root"][0])[0].text == "PART II"
+    assert not sidecar.exists()
+
+    def save(self, path):
+        raise PermissionError(f"read-only: {path}")
+
+    monkeypatch.setattr(SectionIndex, "save", save)
+    hierarchy = p.get_section_hierarchy(source, ["PART II"])
+    assert list(hierarchy["root"][0])[0].text == "PART II"
+    assert not sidecar.exists()
+
+
+@pytest.mark.parametrize("content", ["{not json", '{"entries": []}', "[]"])
+def test_corrupt_sidecar_index_is_rebuilt(source, content):
+    sidecar = sidecar_path(source)
+    sidecar.write_text(content)
+
+    hierarchy = Parser().get_section_hierarchy(source, ["PART II"])
+    assert list(hierarchy["root"][0])[0].text == "PART II"
+    assert SectionIndex.load(sidecar).is_fresh(source)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        codecs.BOM_UTF8 + SOURCE.encode("utf-8"),
+        gzip.compress(SOURCE.replace("<body>", '<meta charset="utf-8">').encode()),
+    ],
+)
+def test_get_section_hierarchy_of_encoded_source(tmp_path, data):
+    source = tmp_path / "form.htm"
+    source.write_bytes(data)
+    p = Parser()
+
+    hierarchy = p.get_section_hierarchy(source, ["PART I", "Item 1. Business"])
+
+    (section,) = hierarchy["root"]
+    ((heading, children),) = section.items()
+    assert heading.text == "Item 1. Business"
+    assert [child.text for child in children] == ["The Company – désigns"]
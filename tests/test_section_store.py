@@ -0,0 +1,119 @@
+import os
+import time
+
+import pytest
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.section_store import SectionStore
+from sec_html_parser.serialize import hierarchy_to_data
+
+HEADING = '<div style="margin-top:{margin}pt"><span style="font-size:9pt;font-weight:700">{text}</span></div>'
+TEXT = '<div style="margin-top:6pt"><span style="font-size:9pt;font-weight:400">{text}</span></div>'
+
+BOILERPLATE = [
+    HEADING.format(margin=18, text="Forward-Looking Statements"),
+    *[TEXT.format(text=f"disclaimer {i}") for i in range(20)],
+]
+
+
+def _filing(company: str) -> str:
+    divs = [
+        HEADING.format(margin=18, text="PART I"),
+        HEADING.format(margin=12, text="Item 1."),
+        TEXT.format(text=f"{company} business"),
+        *BOILERPLATE,
+    ]
+    return "<body>" + "\n".join(divs) + "</body>"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SectionStore(tmp_path / "store")
+
+
+def test_round_trip(store):
+    hierarchy = Parser().get_hierarchy(_filing("a"))
+
+    store.put("a", hierarchy)
+
+    assert store.names() == ["a"]
+    assert "a" in store and "b" not in store
+    assert store.get_data("a") == hierarchy_to_data(hierarchy)
+    assert hierarchy_to_data(store.get("a")) == hierarchy_to_data(hierarchy)
+
+
+def test_dedup(store):
+    p = Parser()
+    keys = [store.put(name, p.get_hierarchy(_filing(name))) for name in "abcd"]
+
+    assert len(set(keys)) == 4
+
+    stats = store.stats()
+    assert stats.filings == 4
+    # each filing has its own root, PART I and Item 1, the boilerplate is shared
+    assert stats.objects == 3 * 4 + 1
+    assert stats.dedup_ratio > 2
+
+    # putting the same filing again stores nothing new
+    assert store.put("a2", p.get_hierarchy(_filing("a"))) == keys[0]
+    assert store.stats().objects == stats.objects
+
+
+def test_delete_and_gc(store):
+    p = Parser()
+    store.put("a", p.get_hierarchy(_filing("a")))
+    store.put("b", p.get_hierarchy(_filing("b")))
+
+    store.delete("a")
+    assert store.names() == ["b"]
+    assert store.gc(min_age=0) == 3
+    assert store.gc(min_age=0) == 0
+    assert store.stats().objects == 4
+    assert store.get_data("b") == hierarchy_to_data(p.get_hierarchy(_filing("b")))
+
+    store.delete("b")
+    assert store.gc(min_age=0) == 4
+    assert store.stats().dedup_ratio == 1.0
+
+
+def _age_objects(store, seconds):
+    mtime = time.time() - seconds
+    for path in (store.directory / "objects").glob("*/*.json"):
+        os.utime(path, (mtime, mtime))
+
+
+def test_gc_keeps_recent_objects(store):
+    store.put("a", Parser().get_hierarchy(_filing("a")))
+    store.delete("a")
+
+    # the objects may be used by a filing still being put
+    assert store.gc() == 0
+
+    _age_objects(store, 3600)
+    assert store.gc(min_age=60) == 3 + 1
+
+
+def test_put_marks_reused_objects_as_recent(store):
+    p = Parser()
+    store.put("a", p.get_hierarchy(_filing("a")))
+    store.put("b", p.get_hierarchy(_filing("b")))
+    _age_objects(store, 3600)
+
+    # reuses all of a's objects, including the boilerplate shared with b
+    store.put("a2", p.get_hierarchy(_filing("a")))
+    for name in ("a", "a2", "b"):
+        store.delete(name)
+
+    assert store.gc(min_age=60) == 3
+    assert store.gc(min_age=0) == 3 + 1
+
+
+def test_missing_and_invalid_names(store):
+    with pytest.raises(KeyError):
+        store.get("a")
+
+    with pytest.raises(KeyError):
+        store.delete("a")
+
+    with pytest.raises(ValueError):
+        store.put("../a", {"root": []})
@@ -0,0 +1,51 @@
+import pytest
+
+from sec_html_parser.parser import Parser
+from tests.filings import divs, heading, paragraph, table
+
+SECTION = (
+    divs(heading("PART {}"), heading("Item {}.", 12), paragraph("text"), table("cell"))
+    + "\n"
+)
+
+SOURCE = "".join(SECTION.format(i, i) for i in range(3))
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_iter_sections_matches_hierarchy(engine):
+    p = Parser(engine=engine)
+    assert list(p.iter_sections(SOURCE)) == p.get_hierarchy(SOURCE)["root"]
+
+
+def test_iter_sections_file(tmp_path):
+    path = tmp_path / "form.htm"
+    path.write_text(SOURCE)
+
+    p = Parser(engine="stream")
+    assert list(p.iter_sections(path)) == Parser().get_hierarchy(path)["root"]
+
+
+def test_stream_sections_are_yielded_before_the_document_ends():
+    fed = []
+
+    def chunks():
+        for i in range(3):
+            fed.append(i)
+            yield SECTION.format(i, i)
+
+    sections = Parser(engine="stream")._iter_stream_sections(chunks())
+    first = next(sections)
+
+    assert fed == [0, 1]
+    assert list(first)[0].text == "PART 0"
+    assert len(list(sections)) == 2
+
+
+def test_iter_sections_empty_document():
+    assert list(Parser().iter_sections("<div></div>")) == []
+    assert Parser().get_hierarchy("<div></div>") == {"root": []}
+
+
+def test_iter_sections_unsupported_type_raises_type_error():
+    with pytest.raises(TypeError):
+        Parser().iter_sections(["unsupported type"])
@@ -0,0 +1,26 @@
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import data_to_hierarchy, hierarchy_to_data
+from tests.filings import filing, heading, paragraph, table
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1.", 12),
+    paragraph("The   Company"),
+    table("cell &amp; value"),
+    heading("PART II"),
+)
+
+
+def test_hierarchy_to_data_text():
+    hierarchy = Parser().get_hierarchy(SOURCE)
+    assert hierarchy_to_data(hierarchy, text=True) == {
+        "root": [
+            {"PART I": [{"Item 1.": [{"The Company": ["cell & value"]}]}]},
+            "PART II",
+        ]
+    }
+
+
+def test_hierarchy_data_round_trip():
+    hierarchy = Parser().get_hierarchy(SOURCE)
+    assert data_to_hierarchy(hierarchy_to_data(hierarchy)) == hierarchy
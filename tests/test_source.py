@@ -0,0 +1,142 @@
+import codecs
+import gc
+import gzip
+import io
+import mmap
+import warnings
+
+import pytest
+
+from sec_html_parser.batch import make_tasks
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import hierarchy_to_data
+from sec_html_parser.source import detect_encoding, iter_decoded_chunks, open_source
+from tests.filings import filing, heading, paragraph
+
+SOURCE = (
+    "<html><head>{meta}</head>"
+    + filing(heading("Item 1. Business"), paragraph("Café – “quoted”"))
+    + "</html>"
+)
+
+EXPECTED = {"root": [{"Item 1. Business": ["Café – “quoted”"]}]}
+
+
+def test_detect_encoding():
+    assert detect_encoding(b"<html>") == "cp1252"
+    assert detect_encoding(b"<html>", default="utf-8") == "utf-8"
+    assert detect_encoding(codecs.BOM_UTF8 + b"<html>") == "utf-8-sig"
+    assert detect_encoding(codecs.BOM_UTF16_LE + b"<") == "utf-16-le"
+    assert detect_encoding(b'<meta charset="UTF-8">') == "utf-8"
+    assert (
+        detect_encoding(
+            b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'
+        )
+        == "iso8859-1"
+    )
+    assert detect_encoding(b'<meta charset="no-such-charset">') == "cp1252"
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+@pytest.mark.parametrize(
+    "meta, encoding",
+    [
+        ("", "cp1252"),
+        ('<meta charset="utf-8">', "utf-8"),
+        ('<meta content="text/html; charset=windows-1252">', "cp1252"),
+    ],
+)
+def test_file_encoding_is_detected(tmp_path, engine, meta, encoding):
+    path = tmp_path / "form.htm"
+    path.write_bytes(SOURCE.format(meta=meta).encode(encoding))
+
+    hierarchy = Parser(engine=engine).get_hierarchy(path)
+
+    assert hierarchy_to_data(hierarchy, text=True) == EXPECTED
+
+
+def test_encoding_option_overrides_detection(tmp_path):
+    path = tmp_path / "form.htm"
+    path.write_bytes(SOURCE.format(meta="").encode("utf-8"))
+
+    hierarchy = Parser(encoding="utf-8").get_hierarchy(path)
+
+    assert hierarchy_to_data(hierarchy, text=True) == EXPECTED
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_gzip_file(tmp_path, engine):
+    path = tmp_path / "form.htm.gz"
+    path.write_bytes(gzip.compress(SOURCE.format(meta="").encode("cp1252")))
+
+    hierarchy = Parser(engine=engine).get_hierarchy(path)
+
+    assert hierarchy_to_data(hierarchy, text=True) == EXPECTED
+
+
+@pytest.mark.filterwarnings("error::ResourceWarning")
+def test_gzip_file_is_closed(tmp_path):
+    target = tmp_path / "form.htm.gz"
+    target.write_bytes(gzip.compress(b"<span>text</span>"))
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always", ResourceWarning)
+        with open_source(target) as stream:
+            assert stream.read() == b"<span>text</span>"
+        del stream
+        gc.collect()
+
+    assert [w.message for w in caught] == []
+
+
+def test_zstd_file(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+
+    path = tmp_path / "form.htm.zst"
+    data = SOURCE.format(meta="").encode("cp1252")
+    path.write_bytes(zstandard.ZstdCompressor().compress(data))
+
+    hierarchy = Parser().get_hierarchy(path)
+
+    assert hierarchy_to_data(hierarchy, text=True) == EXPECTED
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_bytes_and_mmap(tmp_path, engine):
+    data = SOURCE.format(meta="").encode("cp1252")
+    path = tmp_path / "form.htm"
+    path.write_bytes(data)
+
+    p = Parser(engine=engine)
+    assert hierarchy_to_data(p.get_hierarchy(data), text=True) == EXPECTED
+    assert hierarchy_to_data(p.get_hierarchy(bytearray(data)), text=True) == EXPECTED
+
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        assert hierarchy_to_data(p.get_hierarchy(m), text=True) == EXPECTED
+        assert p.get_hierarchy_html(m) == p.get_hierarchy_html(path)
+
+
+def test_decoded_chunks_translate_newlines_across_chunks():
+    data = "a\r\nb\rc\r\n\r\nd\xe9".encode("cp1252")
+
+    # a "\r\n" split between chunks must still become a single "\n"
+    for chunk_size in range(1, len(data) + 1):
+        chunks = iter_decoded_chunks(io.BytesIO(data), "cp1252", chunk_size)
+        assert "".join(chunks) == "a\nb\nc\n\nd\xe9"
+
+
+def test_decoded_chunks_dont_split_multibyte_characters():
+    data = ("–" * 10).encode("utf-8")
+
+    chunks = list(iter_decoded_chunks(io.BytesIO(data), "utf-8", 1))
+
+    assert "".join(chunks) == "–" * 10
+
+
+def test_compressed_files_are_batched(tmp_path):
+    (tmp_path / "a.htm.gz").write_bytes(gzip.compress(b"<html></html>"))
+    (tmp_path / "b.txt.gz").write_bytes(gzip.compress(b"text"))
+
+    tasks = make_tasks([str(tmp_path)], tmp_path / "out")
+
+    assert [(t.target.name, t.output.name) for t in tasks] == [("a.htm.gz", "a.html")]
@@ -0,0 +1,135 @@
+import json
+import sqlite3
+
+import pytest
+from click.testing import CliRunner
+
+from sec_html_parser.__main__ import main
+from sec_html_parser.parser import Parser
+from sec_html_parser.sqlite_loader import SectionDatabase, load_files, section_rows
+from tests.filings import filing, heading, paragraph
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1A. Risk Factors", 12),
+    paragraph("{risk}"),
+    heading("PART II"),
+)
+
+
+def _write_filings(root, risks):
+    root.mkdir(parents=True)
+    for name, risk in risks.items():
+        (root / f"{name}.htm").write_text(SOURCE.format(risk=risk))
+
+
+def test_section_rows():
+    rows = section_rows(Parser().get_hierarchy(SOURCE.format(risk="supply")))
+
+    assert rows == [
+        (None, 1, "[]", "span", "PART I"),
+        (0, 2, '["PART I"]', "span", "Item 1A. Risk Factors"),
+        (1, 3, '["PART I", "Item 1A. Risk Factors"]', "span", "supply"),
+        (None, 1, "[]", "span", "PART II"),
+    ]
+
+
+def test_database(tmp_path):
+    p = Parser()
+    database = tmp_path / "sections.db"
+
+    with SectionDatabase(database, batch_size=2) as db:
+        assert db.add("a", p.get_hierarchy(SOURCE.format(risk="supply chain"))) == 4
+        db.add("b", p.get_hierarchy(SOURCE.format(risk="interest rates")))
+
+        hits = db.search("supply")
+        assert [(hit.filing, hit.path, hit.text) for hit in hits] == [
+            ("a", ["PART I", "Item 1A. Risk Factors"], "supply chain")
+        ]
+
+        # loading a filing again replaces it
+        db.add("a", p.get_hierarchy(SOURCE.format(risk="competition")))
+        assert db.search("supply") == []
+        assert [hit.filing for hit in db.search("competition")] == ["a"]
+
+        db.delete("b")
+        assert db.search("interest") == []
+
+    connection = sqlite3.connect(database)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    parents = connection.execute("""
+        SELECT child.text, parent.text FROM sections child
+        JOIN sections parent ON parent.id = child.parent_id
+        """).fetchall()
+    assert parents == [
+        ("Item 1A. Risk Factors", "PART I"),
+        ("competition", "Item 1A. Risk Factors"),
+    ]
+
+
+def test_database_flushes_on_close(tmp_path):
+    database = tmp_path / "sections.db"
+    with SectionDatabase(database) as db:
+        db.add("a", Parser().get_hierarchy(SOURCE.format(risk="supply")))
+
+    assert sqlite3.connect(database).execute(
+        "SELECT count(*) FROM sections"
+    ).fetchone() == (4,)
+
+    with pytest.raises(ValueError):
+        SectionDatabase(database, batch_size=0)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_load_files(tmp_path, jobs):
+    _write_filings(tmp_path / "filings", {"a": "supply", "b": "rates"})
+    (tmp_path / "filings" / "c.htm").write_text(
+        "<div><table><tr><td>orphan</td></tr></table></div>"
+    )
+    database = tmp_path / "sections.db"
+
+    results = list(load_files(database, [str(tmp_path / "filings")], jobs=jobs))
+
+    assert [(r.name, r.sections, r.error is None) for r in results] == [
+        ("a.htm", 4, True),
+        ("b.htm", 4, True),
+        ("c.htm", 0, False),
+    ]
+    with SectionDatabase(database) as db:
+        assert [hit.filing for hit in db.search("rates")] == ["b.htm"]
+
+
+def test_load_files_same_name_in_different_directories(tmp_path):
+    _write_filings(tmp_path / "in" / "2020", {"form": "supply"})
+    _write_filings(tmp_path / "in" / "2021", {"form": "rates"})
+    database = tmp_path / "sections.db"
+
+    results = list(load_files(database, [str(tmp_path / "in" / "*" / "form.htm")]))
+    assert [r.name for r in results] == ["2020/form.htm", "2021/form.htm"]
+
+    with pytest.raises(ValueError):
+        list(
+            load_files(
+                database,
+                [str(tmp_path / "in" / year / "form.htm") for year in ("2020", "2021")],
+            )
+        )
+
+    with SectionDatabase(database) as db:
+        assert [hit.filing for hit in db.search("supply")] == ["2020/form.htm"]
+        assert [hit.filing for hit in db.search("rates")] == ["2021/form.htm"]
+
+
+def test_cli_load(tmp_path):
+    _write_filings(tmp_path / "filings", {"a": "supply", "b": "rates"})
+    database = tmp_path / "sections.db"
+
+    result = CliRunner().invoke(
+        main, ["load", str(database), str(tmp_path / "filings"), "--batch-size", "1"]
+    )
+
+    assert result.exit_code == 0
+    assert "loaded 2/2 files" in result.output
+    with SectionDatabase(database) as db:
+        hit = db.search("supply")[0]
+        assert (hit.filing, hit.path) == ("a.htm", ["PART I", "Item 1A. Risk Factors"])
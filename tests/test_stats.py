@@ -0,0 +1,73 @@
+import io
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from sec_html_parser.__main__ import main
+from sec_html_parser.parser import Parser
+from sec_html_parser.stats import ParseStats
+from tests.filings import SOURCE
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_stats_counts(engine):
+    stats = ParseStats()
+    p = Parser(engine=engine, stats=stats)
+
+    p.write_hierarchy_html(SOURCE, io.StringIO())
+
+    assert stats.counts == {
+        "spans": 4,
+        "divs": 5,
+        "tables": 1,
+        "stack_pops": 3,
+        "max_stack_depth": 3,
+    }
+    assert stats.seconds["stack"] > 0
+    assert stats.seconds["render"] > 0
+    if engine == "soup":
+        assert stats.seconds["soup"] > 0
+        assert stats.seconds["stream"] == 0
+    else:
+        assert stats.seconds["soup"] == 0
+        assert stats.seconds["stream"] > 0
+
+
+def test_stats_update():
+    stats = ParseStats()
+    Parser(stats=stats).get_hierarchy(SOURCE)
+    data = stats.to_dict()
+
+    total = ParseStats()
+    total.update(data)
+    total.update(data)
+
+    assert total.counts["spans"] == 2 * stats.counts["spans"]
+    assert total.counts["max_stack_depth"] == stats.counts["max_stack_depth"]
+    assert total.seconds["soup"] == pytest.approx(2 * stats.seconds["soup"])
+
+    total.reset()
+    assert total.to_dict() == ParseStats().to_dict()
+
+
+def test_stats_flag(tmp_path):
+    for name in ("a.htm", "b.htm"):
+        (tmp_path / name).write_text(SOURCE)
+
+    runner = CliRunner()
+    output = tmp_path / "a.html"
+    result = runner.invoke(
+        main, [str(tmp_path / "a.htm"), "-o", str(output), "--stats"]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output)["counts"]["spans"] == 4
+
+    out = tmp_path / "out"
+    result = runner.invoke(main, [str(tmp_path / "*.htm"), "-o", str(out), "--stats"])
+    assert result.exit_code == 0
+    stats = json.loads(result.output[result.output.index("{") :])
+    assert stats["counts"]["spans"] == 8
+
+    manifest = (out / "manifest.jsonl").read_text().splitlines()
+    assert json.loads(manifest[0])["stats"]["counts"]["spans"] == 4
@@ -0,0 +1,43 @@
+import pytest
+
+from sec_html_parser.parser import Parser
+
+SOURCES = [
+    """<body>
+<div style="margin-top:18pt;text-align:justify"><span style="color:#000000;font-size:9pt;font-weight:700">PART I</span></div>
+<div id="ief781ab58e4f4fcaa872ddbd30da40e1_13"></div>
+<div style="margin-top:12pt;text-align:justify"><span style="color:#000000;font-size:9pt;font-weight:700">Item 1. Business</span></div>
+<div style="margin-top:9pt;text-align:justify"><span style="color:#000000;font-size:9pt;font-weight:700">Company Background</span></div>
+<div style="margin-top:6pt;text-align:justify"><span style="color:#000000;font-size:9pt;font-weight:400">The Company is a California corporation.</span></div>
+<div style="margin-top:9pt;text-align:justify"><span style="font-size:9pt;font-style:italic;font-weight:400">iPhone</span><span style="font-size:6.5pt;position:relative;top:-3.5pt">Â®</span></div>
+<div style="margin-top:6pt;text-align:justify"><table style="width:100.000%"><tbody><tr><td colspan="3"><div><span style="font-size:9pt">Item 1.</span></div></td></tr></tbody></table></div>
+<div style="margin-top:6pt"><table><tr><td> </td></tr></table></div>
+</body>""",
+    # void elements, comments, entities and whitespace inside spans
+    """<div style="margin-top:18pt"><span style="font-size:10pt;font-weight:700">A&amp;B <br>line<!-- note --> &nbsp;</span></div>
+<div><span style="font-size:9pt" class="a b">child<img src="x.png"></span></div>""",
+    # self closing and unstyled spans, tags left open
+    """<div style="margin-top:6pt"><span style="font-size:10pt"/><span>no style</span>
+<div><span style="font-size:9pt"><b>bold <i>text</span> after</div>""",
+    # end tag closing an outer element implicitly closes the open span
+    """<div style="margin-top:6pt"><span style="font-size:10pt">heading</div><span style="font-size:9pt">child</span>""",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_stream_engine_matches_soup_engine(source):
+    expected = Parser().get_string_hierarchy(source)
+    assert Parser(engine="stream").get_string_hierarchy(source) == expected
+
+
+def test_stream_engine_file(tmp_path):
+    path = tmp_path / "form.html"
+    path.write_text(SOURCES[0] * 100)
+
+    expected = Parser().get_file_hierarchy(path)
+    assert Parser(engine="stream").get_file_hierarchy(path) == expected
+
+
+def test_unknown_engine_raises_value_error():
+    with pytest.raises(ValueError):
+        Parser(engine="unknown")
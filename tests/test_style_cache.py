@@ -0,0 +1,74 @@
+import pytest
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.style_cache import StyleCache
+from sec_html_parser.style_rules import DEFAULT_STYLE_RULES
+from tests.filings import SOURCE
+
+
+def test_style_cache_parses_once():
+    parsed = []
+
+    def factory(style: str) -> str:
+        parsed.append(style)
+        return style.upper()
+
+    cache = StyleCache(factory)
+    assert cache.get("font-size:9pt") == "FONT-SIZE:9PT"
+    assert cache.get("font-size:9pt") == "FONT-SIZE:9PT"
+    assert parsed == ["font-size:9pt"]
+
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size == 1
+
+
+def test_style_cache_evicts_least_recently_used():
+    cache = StyleCache(str.upper, maxsize=2)
+    cache.get("a")
+    cache.get("b")
+    cache.get("a")
+    cache.get("c")
+
+    assert len(cache) == 2
+    cache.get("a")
+    assert cache.stats().misses == 3
+    cache.get("b")
+    assert cache.stats().misses == 4
+
+
+def test_style_cache_clear():
+    cache = StyleCache(str.upper)
+    cache.get("a")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats().misses == 0
+
+
+def test_style_cache_invalid_maxsize():
+    with pytest.raises(ValueError):
+        StyleCache(str.upper, maxsize=0)
+
+
+def test_compiled_span_keys_are_interned():
+    compiled = DEFAULT_STYLE_RULES.compile()
+    style = "font-size:9pt;font-weight:700"
+    assert compiled.span_key(style) is compiled.span_key(style)
+    assert compiled.span_key(style) == (9, 700, -1)
+
+
+def test_compiled_cache_stats():
+    p = Parser()
+    compiled = p.style_rules.compile()
+    compiled.clear_caches()
+
+    # a bold and a regular span style, and three div margins
+    p.get_hierarchy(SOURCE)
+    p.get_hierarchy(SOURCE)
+    stats = compiled.cache_stats()
+    assert (stats["span"].misses, stats["span"].hits) == (2, 2)
+    assert (stats["div"].misses, stats["div"].hits) == (3, 3)
+
+    compiled.clear_caches()
+    assert compiled.cache_stats()["span"].size == 0
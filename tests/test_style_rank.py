@@ -0,0 +1,128 @@
+import random
+from itertools import product
+
+import pytest
+from bs4 import BeautifulSoup
+
+from sec_html_parser.parser import Parser
+from sec_html_parser import style_rank
+from sec_html_parser.style_rank import (
+    NO_STYLE,
+    RELATIVE,
+    dense_ranks,
+    is_div_key_child,
+    is_span_key_child,
+    level_histogram,
+    rank_styles,
+)
+from sec_html_parser.style_rules import DEFAULT_STYLE_RULES
+from tests.filings import div, filing, heading, paragraph, span
+
+SOURCE = filing(
+    heading("PART I"),
+    heading("Item 1.", 12),
+    div(span("iPhone", italic=True), margin=None),
+    paragraph("text"),
+    '<div style="text-align:center"><span>unstyled</span></div>',
+    '<div style="margin-top:6pt"><span style="font-size:6.5pt;position:relative;top:-3.5pt">Â®</span></div>',
+)
+
+
+def _elements():
+    soup = BeautifulSoup(SOURCE, features="html.parser")
+    return list(Parser()._walk_soup(soup, not_into=["span", "table"]))
+
+
+def test_rank_styles_special_keys():
+    elements = _elements()
+    keys = {
+        e.text: k for e, k in zip(elements, rank_styles(elements)) if e.name == "span"
+    }
+    assert keys["unstyled"] == NO_STYLE
+    assert keys["Â®"] == RELATIVE
+    assert keys["PART I"] == keys["Item 1."]
+    assert keys["PART I"] > keys["iPhone"] > keys["text"] > NO_STYLE
+
+
+def test_rank_styles_non_styled_elements():
+    elements = _elements()
+    keys = rank_styles(elements)
+    assert keys[0] is None  # body
+    assert keys[elements.index(elements[0].find("div", style=None))] == NO_STYLE
+
+
+def test_span_ranks_agree_with_span_keys():
+    compiled = DEFAULT_STYLE_RULES.compile()
+    elements = _elements()
+    spans = [
+        (e, k) for e, k in zip(elements, rank_styles(elements)) if e.name == "span"
+    ]
+    for (node, node_key), (other, other_key) in product(spans, repeat=2):
+        assert is_span_key_child(node_key, other_key) == is_span_key_child(
+            compiled.span_key(node.get("style")), compiled.span_key(other.get("style"))
+        )
+
+
+def test_div_ranks_agree_with_div_keys():
+    compiled = DEFAULT_STYLE_RULES.compile()
+    elements = _elements()
+    divs = [(e, k) for e, k in zip(elements, rank_styles(elements)) if e.name == "div"]
+    for (node, node_key), (other, other_key) in product(divs, repeat=2):
+        assert is_div_key_child(node_key, other_key) == is_div_key_child(
+            compiled.div_key(node.get("style")), compiled.div_key(other.get("style"))
+        )
+
+
+def test_missing_div_key_is_child():
+    assert is_div_key_child(None, 1)
+    assert not is_div_key_child(None, NO_STYLE)
+
+
+def _random_tuples(n):
+    rng = random.Random(0)
+    return [
+        (rng.choice([-1, 8, 9, 10.5]), rng.choice([-1, 400, 700]), rng.choice([-1, 1]))
+        for _ in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", [0, 1, 50, 3000])
+def test_dense_ranks(n):
+    tuples = _random_tuples(n)
+    ranks = dense_ranks(tuples)
+
+    assert sorted(set(ranks)) == list(range(1, len(set(tuples)) + 1))
+    for (a, rank_a), (b, rank_b) in product(list(zip(tuples, ranks))[:50], repeat=2):
+        assert (a < b) == (rank_a < rank_b)
+        assert (a == b) == (rank_a == rank_b)
+
+
+def test_level_histogram():
+    keys = [3, 1, 3, NO_STYLE, RELATIVE, None, 2, 3]
+    assert level_histogram(keys) == {1: 3, 2: 1, 3: 1}
+    assert level_histogram([]) == {}
+
+
+@pytest.mark.parametrize("n", [0, 1, 5000])
+def test_level_histogram_python_and_numpy_agree(monkeypatch, n):
+    pytest.importorskip("numpy")
+
+    keys = [k % 7 - 1 for k in range(n)] + [None]
+
+    monkeypatch.setattr(style_rank, "NUMPY_MIN_SIZE", 10**9)
+    expected = level_histogram(keys)
+    assert sum(expected.values()) == sum(1 for k in keys if k and k > NO_STYLE)
+
+    monkeypatch.setattr(style_rank, "NUMPY_MIN_SIZE", 0)
+    assert level_histogram(keys) == expected
+
+
+def test_heading_histogram():
+    histogram = Parser().get_heading_histogram(SOURCE)
+
+    # PART I and Item 1. share a style, then the italic and the plain text
+    assert histogram == {1: 2, 2: 1, 3: 1}
+    assert Parser().get_heading_histogram(SOURCE.encode()) == histogram
+
+    with pytest.raises(TypeError):
+        Parser().get_heading_histogram(1)
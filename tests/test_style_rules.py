@@ -0,0 +1,189 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from sec_html_parser.__main__ import main
+from sec_html_parser.parser import Parser
+from sec_html_parser.result_cache import ResultCache
+from sec_html_parser.style_rules import (
+    DEFAULT_SPAN_RULES,
+    DEFAULT_STYLE_RULES,
+    NO_STYLE,
+    RELATIVE,
+    StyleRule,
+    StyleRules,
+    parse_declarations,
+)
+
+# style string, and its span and div keys under the default rules: spans by
+# (font size, weight, 1 if italic else -1) and divs by (top margin,), with -1
+# for unset or zero values
+STYLES = [
+    ("font-size:9pt;font-weight:700", (9, 700, -1), (-1,)),
+    ("font-size:9pt;font-style:italic;font-weight:400", (9, 400, 1), (-1,)),
+    (
+        "color:#000000;font-family:'Helvetica',sans-serif;font-size:9pt;font-style:italic;font-weight:400;line-height:120%",
+        (9, 400, 1),
+        (-1,),
+    ),
+    (
+        "font-size:6.5pt;font-weight:400;line-height:120%;position:relative;top:-3.5pt",
+        RELATIVE,
+        (-1,),
+    ),
+    ("font-weight:bold", (-1, -1, -1), (-1,)),
+    ("text-align:center", (-1, -1, -1), (-1,)),
+    ("margin-top:12pt", (-1, -1, -1), (12,)),
+    ("margin-top:0pt", (-1, -1, -1), (-1,)),
+    ("font-size:0pt;font-weight:0", (-1, -1, -1), (-1,)),
+    ("font-size:9pt;font-style:Italic", (9, -1, -1), (-1,)),
+    ("", (-1, -1, -1), (-1,)),
+]
+
+UPPERCASE_RULES = StyleRules(
+    span=DEFAULT_SPAN_RULES + (StyleRule("text-transform", keywords=("uppercase",)),)
+)
+
+SOURCE = """<body>
+<div><span style="font-size:10pt;text-transform:uppercase">Risk Factors</span></div>
+<div><span style="font-size:10pt">Our business is subject to risks.</span></div>
+</body>"""
+
+
+def _texts(children):
+    return [
+        (
+            {node.text: _texts(grandchildren) for node, grandchildren in child.items()}
+            if isinstance(child, dict)
+            else child.text
+        )
+        for child in children
+    ]
+
+
+def test_parse_declarations():
+    assert parse_declarations(" Font-Size : 10pt ;color:red;font-size:12pt;junk") == {
+        "font-size": "12pt",
+        "color": "red",
+    }
+
+
+@pytest.mark.parametrize("style,span_key,div_key", STYLES)
+def test_default_keys(style, span_key, div_key):
+    compiled = DEFAULT_STYLE_RULES.compile()
+    assert compiled.span_key(style) == span_key
+    assert compiled.div_key(style) == div_key
+
+
+def test_missing_style_keys():
+    compiled = DEFAULT_STYLE_RULES.compile()
+    assert compiled.span_key(None) == NO_STYLE
+    assert compiled.div_key(None) == NO_STYLE
+
+
+def test_compile_is_shared_by_equal_rules():
+    assert StyleRules().compile() is DEFAULT_STYLE_RULES.compile()
+
+
+def test_keyword_rules_rank_in_listed_order():
+    rules = StyleRules(
+        span=(
+            StyleRule("text-decoration", keywords=("underline", "overline"), default=0),
+        )
+    )
+    compiled = rules.compile()
+
+    assert compiled.span_key("text-decoration:none") == (0,)
+    assert compiled.span_key("text-decoration:underline solid") == (1,)
+    assert compiled.span_key("text-decoration:overline") == (2,)
+    assert compiled.span_key("text-decoration:Underline") == (0,)
+
+
+def test_unit_rules():
+    compiled = DEFAULT_STYLE_RULES.compile()
+
+    assert compiled.div_key("margin-top:12pt") == (12,)
+    assert compiled.div_key("margin-top:1em") == (-1,)
+
+
+def test_relative_rules():
+    rules = StyleRules(relative=("vertical-align:super",))
+    compiled = rules.compile()
+
+    assert compiled.span_key("font-size:6pt;vertical-align:super") == RELATIVE
+    assert compiled.span_key("font-size:6pt;position:relative") != RELATIVE
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_zero_and_case_rank_as_unset(engine):
+    source = """<body>
+<div style="margin-top:0pt"><span style="font-size:10pt">A</span></div>
+<div style="text-align:left"><span style="font-size:10pt">B</span></div>
+<div><span style="font-size:0pt;font-weight:700">C</span></div>
+<div><span style="font-weight:700">D</span></div>
+<div><span style="font-size:9pt;font-style:Italic">E</span></div>
+<div><span style="font-size:9pt">F</span></div>
+</body>"""
+
+    # zero and differently cased values rank like unset ones
+    hierarchy = Parser(engine).get_hierarchy(source)
+    assert _texts(hierarchy["root"]) == ["A", {"B": ["C", "D", "E", "F"]}]
+
+
+def test_from_dict_round_trip():
+    assert StyleRules.from_dict(UPPERCASE_RULES.to_dict()) == UPPERCASE_RULES
+    assert StyleRules.from_dict({}) == DEFAULT_STYLE_RULES
+
+
+def test_from_dict_unknown_fields():
+    with pytest.raises(ValueError):
+        StyleRules.from_dict({"spans": []})
+
+    with pytest.raises(TypeError):
+        StyleRules.from_dict({"span": [{"property": "font-size", "weight": 2}]})
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_parser_style_rules(engine):
+    hierarchy = Parser(engine).get_hierarchy(SOURCE)
+    assert [node.text for node in hierarchy["root"]] == [
+        "Risk Factors",
+        "Our business is subject to risks.",
+    ]
+
+    hierarchy = Parser(engine, style_rules=UPPERCASE_RULES).get_hierarchy(SOURCE)
+    ((heading, children),) = (
+        (node, children)
+        for element in hierarchy["root"]
+        for node, children in element.items()
+    )
+    assert heading.text == "Risk Factors"
+    assert [child.text for child in children] == ["Our business is subject to risks."]
+
+
+def test_cache_key_covers_style_rules(tmp_path):
+    cache = ResultCache(tmp_path)
+    Parser(cache=cache).get_hierarchy(SOURCE)
+
+    hierarchy = Parser(cache=cache, style_rules=UPPERCASE_RULES).get_hierarchy(SOURCE)
+    assert len(hierarchy["root"]) == 1
+
+
+def test_cli_style_rules(tmp_path):
+    target = tmp_path / "form.html"
+    target.write_text(SOURCE)
+    rules = tmp_path / "rules.json"
+    rules.write_text(json.dumps(UPPERCASE_RULES.to_dict()))
+
+    result = CliRunner().invoke(
+        main, [str(target), "--format", "json", "--style-rules", str(rules)]
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.output) == {
+        "root": [{"Risk Factors": ["Our business is subject to risks."]}]
+    }
+
+    rules.write_text(json.dumps({"spans": []}))
+    result = CliRunner().invoke(main, [str(target), "--style-rules", str(rules)])
+    assert result.exit_code == 2
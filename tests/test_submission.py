@@ -0,0 +1,98 @@
+import gzip
+
+import pytest
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.serialize import hierarchy_to_data
+from sec_html_parser.submission import iter_documents
+from tests.filings import filing, heading, paragraph
+
+FORM = (
+    "<html>" + filing(heading("Item 1. Business"), paragraph("The Company")) + "</html>"
+)
+
+EXHIBIT = """<html><body>
+<div><span style="font-size:9pt">Subsidiaries</span></div>
+</body></html>"""
+
+UUENCODED = (
+    "begin 644 logo.jpg\n"
+    + 'M_]C_X``02D9)1@`!`0$`8`!@``#_VP!#``(!`0(!`0("`@("`@("`P4#`P,#\n' * 1000
+    + "`\nend"
+)
+
+SUBMISSION = f"""<SEC-DOCUMENT>0000000000-21-000001.txt : 20210101
+<SEC-HEADER>0000000000-21-000001.hdr.sgml : 20210101
+CONFORMED SUBMISSION TYPE:	10-K
+</SEC-HEADER>
+<DOCUMENT>
+<TYPE>GRAPHIC
+<SEQUENCE>3
+<FILENAME>logo.jpg
+<TEXT>
+{UUENCODED}
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>10-K
+<SEQUENCE>1
+<FILENAME>form10k.htm
+<DESCRIPTION>ANNUAL REPORT
+<TEXT>
+<XBRL>
+{FORM}
+</XBRL>
+</TEXT>
+</DOCUMENT>
+<DOCUMENT>
+<TYPE>EX-21
+<SEQUENCE>2
+<FILENAME>ex21.htm
+<TEXT>
+{EXHIBIT}
+</TEXT>
+</DOCUMENT>
+</SEC-DOCUMENT>
+"""
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 1024 * 1024])
+def test_iter_documents(chunk_size):
+    data = SUBMISSION.encode()
+
+    documents = list(iter_documents(data, chunk_size=chunk_size))
+
+    assert [(d.type, d.sequence, d.filename) for d in documents] == [
+        ("GRAPHIC", 3, "logo.jpg"),
+        ("10-K", 1, "form10k.htm"),
+        ("EX-21", 2, "ex21.htm"),
+    ]
+    assert [d.is_html for d in documents] == [False, True, True]
+    assert documents[0].text == UUENCODED.encode()
+    assert documents[1].text == FORM.encode()
+    assert documents[1].description == "ANNUAL REPORT"
+    assert documents[2].text == EXHIBIT.encode()
+
+
+def test_iter_documents_by_type(tmp_path):
+    path = tmp_path / "submission.txt.gz"
+    path.write_bytes(gzip.compress(SUBMISSION.encode()))
+
+    documents = list(iter_documents(path, ["ex-21", "GRAPHIC"]))
+
+    assert [d.type for d in documents] == ["GRAPHIC", "EX-21"]
+
+
+def test_get_submission_hierarchy(tmp_path):
+    path = tmp_path / "submission.txt"
+    path.write_bytes(SUBMISSION.encode())
+    p = Parser()
+
+    expected = hierarchy_to_data(p.get_string_hierarchy(FORM), text=True)
+    assert hierarchy_to_data(p.get_submission_hierarchy(path), text=True) == expected
+
+    exhibit = p.get_submission_hierarchy(path, ["EX-21"])
+    assert hierarchy_to_data(exhibit, text=True) == {"root": ["Subsidiaries"]}
+
+    with pytest.raises(ValueError):
+        p.get_submission_hierarchy(path, ["GRAPHIC"])
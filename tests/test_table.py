@@ -0,0 +1,133 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from sec_html_parser.parser import Parser
+from sec_html_parser.table import Table, has_text, parse_number
+
+STATEMENT = """<table>
+<tr><td rowspan="2">Item</td><td colspan="3">Year</td></tr>
+<tr><td>2021</td><td></td><td>2020</td></tr>
+<tr><td>Net sales</td><td>$</td><td>365,817</td><td>$ 274,515</td></tr>
+<tr><td>Other expense</td><td>$</td><td>(258</td><td>)</td></tr>
+<tr><td>Margin</td><td>41.8%</td><td>—</td></tr>
+</table>"""
+
+
+def _table(html: str) -> Table:
+    return Table(BeautifulSoup(html, features="html.parser").table)
+
+
+@pytest.mark.parametrize(
+    "text, number",
+    [
+        ("1,234", 1234),
+        ("$1,234.50", 1234.5),
+        ("$ (1,234)", -1234),
+        ("(258", -258),
+        ("12.5%", 12.5),
+        ("(3.2)%", -3.2),
+        (".5", 0.5),
+        ("-1,234", -1234),
+        ("−5", -5),
+        ("$-12.5", -12.5),
+        ("-$ 3", -3),
+        ("−4.5%", -4.5),
+        ("—", 0),
+        ("–", 0),
+        ("-", 0),
+        ("", None),
+        ("$", None),
+        ("Net sales", None),
+        ("2021 and 2020", None),
+        ("2021-2020", None),
+    ],
+)
+def test_parse_number(text, number):
+    assert parse_number(text) == number
+
+
+def test_has_text():
+    soup = BeautifulSoup(
+        "<table><tr><td> </td><td>\n</td></tr></table><table><tr><td>x</td></tr></table>",
+        features="html.parser",
+    )
+    empty, full = soup.find_all("table")
+
+    assert not has_text(empty)
+    assert has_text(full)
+
+
+def test_table_grid():
+    table = _table(STATEMENT)
+
+    assert [[cell.text for cell in row] for row in table.rows][:2] == [
+        ["Item", "Year"],
+        ["2021", "", "2020"],
+    ]
+    assert [[cell and cell.text for cell in row] for row in table.grid] == [
+        ["Item", "Year", "Year", "Year"],
+        ["Item", "2021", "", "2020"],
+        ["Net sales", "$", "365,817", "$ 274,515"],
+        ["Other expense", "$", "(258", ")"],
+        ["Margin", "41.8%", "—", None],
+    ]
+
+
+def test_table_spans_are_clamped():
+    table = _table(
+        '<table><tr><td colspan="100000000" rowspan="100000000">x</td></tr>'
+        '<tr><td colspan="-1">y</td></tr></table>'
+    )
+
+    assert [(cell.rowspan, cell.colspan) for row in table.rows for cell in row] == [
+        (65534, 1000),
+        (1, 1),
+    ]
+    # the second row has x in all 1000 columns, then y
+    assert [len(line) for line in table.grid] == [1001, 1001]
+    assert table.grid[1][999].text == "x" and table.grid[1][1000].text == "y"
+
+
+def test_table_columns():
+    table = _table(STATEMENT)
+
+    assert table.columns() == [
+        ["Item", "Item", "Net sales", "Other expense", "Margin"],
+        ["Year", 2021, None, None, 41.8],
+        ["Year", None, 365817, -258, 0],
+        ["Year", 2020, 274515, None, None],
+    ]
+
+    cells = _table("<table><tr><td>a</td><td>$</td></tr></table>")
+    assert cells.columns() == [["a"]]
+    assert cells.columns(drop_empty=False) == [["a"], [None]]
+
+
+def test_table_is_lazy():
+    table = _table(STATEMENT)
+    assert table._rows is None and table._grid is None
+
+    rows = table.rows
+    assert table.rows is rows
+
+
+def test_nested_table_rows_are_not_mixed():
+    table = _table(
+        "<table><tr><td><table><tr><td>inner</td></tr></table></td></tr></table>"
+    )
+
+    assert len(table.rows) == 1
+
+
+@pytest.mark.parametrize("engine", ["soup", "stream"])
+def test_iter_tables(engine):
+    target = f"""<body>
+<div style="margin-top:18pt"><span style="font-size:9pt;font-weight:700">Item 8.</span></div>
+<div style="margin-top:6pt">{STATEMENT}</div>
+<div style="margin-top:6pt"><table><tr><td> </td></tr></table></div>
+</body>"""
+
+    tables = list(Parser(engine=engine).iter_tables(target))
+
+    assert len(tables) == 1
+    assert tables[0].columns()[2] == ["Year", None, 365817, -258, 0]